@@ -0,0 +1,132 @@
+# benchmarks/allocations.py
+#
+# Allocation check for the steady-state tick: a TimerController over the fake
+# game, IGT ticking over every 10 ticks and nothing else moving, every polled
+# field due each tick. After a warm-up it reports, per tick:
+#   - net blocks / bytes still alive (tracemalloc snapshot diff; ~0 = no growth),
+#   - peak transient bytes (tracemalloc peak during the tick; median and max),
+#   - gen-0 garbage collections per 10k ticks (container churn).
+# for update_timer_state alone (the part that should allocate nothing) and for
+# the whole tick (memory reads still return fresh bytes from the backend).
+#
+#   python -m benchmarks.allocations
+
+import argparse
+import gc
+import tracemalloc
+
+WARMUP = 500
+
+from controller import TimerController
+from memory_reader import MemoryReader
+import model
+from model import TimerState, update_timer_state
+from benchmarks.fake_memory import FakeGame
+
+
+def _steady_game():
+    game = FakeGame()
+    game.set_chapter(3)
+    game.set_subA("CH03_Village_Gate")
+    game.set_subB("CH03_Village_Church")
+    return game
+
+
+def _due_all(reader: MemoryReader) -> None:
+    # Ticks run back-to-back here: make every periodic field due, as on a busy real tick.
+    for f, p in reader.scheduler.periods.items():
+        if p:
+            reader.scheduler.next_at[f] = 0.0
+
+
+def measure(step, ticks: int) -> dict:
+    # Trace from before the warm-up, so blocks evicted from the caches later
+    # are seen being freed.
+    tracemalloc.start()
+    # Fill the formatters' bounded caches first, so a miss evicts instead of
+    # growing the cache: that is the steady state of a long session.
+    for t in range(model.FORMAT_CACHE_SIZE):
+        model.format_hhmmss(10**6 + t)
+        model._format_tenths(10**7 + t)
+    for i in range(WARMUP):  # warm the string fields, IGT clock, ...
+        step(i)
+
+    collections = [0]
+
+    def on_gc(phase, info):
+        if phase == "start" and info["generation"] == 0:
+            collections[0] += 1
+
+    gc.callbacks.append(on_gc)
+    try:
+        before = tracemalloc.take_snapshot()
+        peaks = []
+        for i in range(WARMUP, WARMUP + ticks):
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            step(i)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+        after = tracemalloc.take_snapshot()
+    finally:
+        gc.callbacks.remove(on_gc)
+        tracemalloc.stop()
+
+    diff = [d for d in after.compare_to(before, "filename")
+            if "tracemalloc" not in d.traceback[0].filename and __file__ not in d.traceback[0].filename]
+    peaks.sort()
+    return {
+        "net_blocks_per_tick": sum(d.count_diff for d in diff) / ticks,
+        "net_bytes_per_tick": sum(d.size_diff for d in diff) / ticks,
+        "peak_bytes_p50": peaks[len(peaks) // 2],
+        "peak_bytes_max": peaks[-1],
+        "gen0_gcs_per_10k_ticks": collections[0] * 10_000 / ticks,
+    }
+
+
+def update_only(ticks: int) -> dict:
+    game = _steady_game()
+    reader = MemoryReader(game.mem)
+    state = TimerState()
+    snaps = []
+    for i in range(10):  # ten snapshots, one IGT second apart, replayed in a loop
+        game.set_igt(600 + i)
+        _due_all(reader)
+        snap = reader.read_snapshot()
+        snaps.append(type(snap)(**{f: getattr(snap, f) for f in snap.__slots__}))
+    info = None
+
+    def step(i):
+        nonlocal state, info
+        snap = snaps[(i // 10) % 10]
+        snap.changed = 1 if i % 10 == 0 else 0
+        state, info = update_timer_state(state, snap, info)
+
+    return measure(step, ticks)
+
+
+def full_tick(ticks: int) -> dict:
+    game = _steady_game()
+    ctl = TimerController(MemoryReader(game.mem))
+
+    def step(i):
+        if i % 10 == 0:
+            game.set_igt(600 + i // 10)
+        _due_all(ctl.reader)
+        ctl.tick()
+
+    return measure(step, ticks)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Allocations per steady-state tick.")
+    ap.add_argument("--ticks", type=int, default=20000)
+    args = ap.parse_args()
+    for name, fn in (("update_timer_state", update_only), ("controller.tick", full_tick)):
+        r = fn(args.ticks)
+        print(f"{name:<20} net {r['net_blocks_per_tick']:.3f} blocks / {r['net_bytes_per_tick']:.1f} B per tick, "
+              f"peak p50 {r['peak_bytes_p50']} B / max {r['peak_bytes_max']} B, "
+              f"{r['gen0_gcs_per_10k_ticks']:.1f} gen-0 GCs per 10k ticks")
+
+
+if __name__ == "__main__":
+    main()
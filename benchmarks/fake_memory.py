@@ -0,0 +1,132 @@
+# benchmarks/fake_memory.py
+
+import time
+
+from memory_backend import MemoryReadError
+
+PAGE_SIZE = 0x1000
+
+
+class FakeProcess:
+    """
+    Sparse, page-granular, writable memory backend.
+    Reads touching an unmapped page raise MemoryReadError, like a real backend.
+    Every read() is counted in `reads`; `read_cost_us` busy-waits per read to
+    model the cost of a real cross-process read.
+    """
+    def __init__(self, read_cost_us: float = 0.0) -> None:
+        self.pages: dict[int, bytearray] = {}
+        self.modules: dict[str, int] = {}
+        self.alive = True
+        self.reads = 0
+        self.read_cost_ns = int(read_cost_us * 1000)
+
+    def map(self, addr: int, size: int) -> None:
+        first = addr - addr % PAGE_SIZE
+        for page in range(first, addr + size, PAGE_SIZE):
+            self.pages.setdefault(page, bytearray(PAGE_SIZE))
+
+    def write(self, addr: int, data: bytes) -> None:
+        self.map(addr, len(data))
+        for i, b in enumerate(data):
+            a = addr + i
+            self.pages[a - a % PAGE_SIZE][a % PAGE_SIZE] = b
+
+    def read(self, addr: int, n: int) -> bytes:
+        self.reads += 1
+        if self.read_cost_ns:
+            until = time.perf_counter_ns() + self.read_cost_ns
+            while time.perf_counter_ns() < until:
+                pass
+        out = bytearray()
+        while len(out) < n:
+            a = addr + len(out)
+            page = self.pages.get(a - a % PAGE_SIZE)
+            if page is None:
+                raise MemoryReadError(f"Could not read memory at 0x{a:X}")
+            off = a % PAGE_SIZE
+            out += page[off:off + n - len(out)]
+        return bytes(out)
+
+    def regions(self) -> list[tuple[int, int]]:
+        spans = []
+        for page in sorted(self.pages):
+            if spans and spans[-1][1] == page:
+                spans[-1] = (spans[-1][0], page + PAGE_SIZE)
+            else:
+                spans.append((page, page + PAGE_SIZE))
+        return spans
+
+    def module_base(self, name: str) -> int:
+        try:
+            return self.modules[name.lower()]
+        except KeyError:
+            raise LookupError(f"Module {name} not found") from None
+
+    def is_alive(self) -> bool:
+        return self.alive
+
+    def close(self) -> None:
+        pass
+
+
+class FakeGame:
+    """
+    Lays out the fields the tracker reads (see OFFSETS and config) inside a
+    FakeProcess: IGT behind the 4-level pointer chain, chapter int, struct
+    pointer with an inline subA, and subB as a pointer to a C string.
+    """
+    BASE = 0x140000000
+    HEAP = 0x20000000
+    SUBB_STR = 0x7FF600010000
+
+    def __init__(self, mem=None) -> None:
+        from config import BASE_OFFSET, POINTER_OFFSETS, PROC_NAME
+        from evil_within_subsection_logger_v2 import OFFSETS
+
+        self.mem = mem if mem is not None else FakeProcess()
+        self.base = self.BASE
+        self.offsets = OFFSETS
+        self.mem.modules[PROC_NAME.lower()] = self.base
+
+        # IGT chain: [base+BASE_OFFSET] -> p1, [p1+o0] -> p2, [p2+o1] -> p3, int at p3+o2
+        ptrs = [self.HEAP + i * 0x100000 for i in range(len(POINTER_OFFSETS))]
+        self.mem.write(self.base + BASE_OFFSET, ptrs[0].to_bytes(8, "little"))
+        for i, off in enumerate(POINTER_OFFSETS[:-1]):
+            self.mem.write(ptrs[i] + off, ptrs[i + 1].to_bytes(8, "little"))
+        self.igt_owner = ptrs[-2] + POINTER_OFFSETS[-2]  # where the pointer to IGT's object lives
+        self.igt_addr = ptrs[-1] + POINTER_OFFSETS[-1]
+
+        self.struct_addr = self.HEAP + 0x800000
+        self.mem.write(self.base + OFFSETS["struct_ptr_rel"], self.struct_addr.to_bytes(8, "little"))
+        self.mem.write(self.base + OFFSETS["subB_abs"], self.SUBB_STR.to_bytes(8, "little"))
+
+        self.set_igt(0)
+        self.set_chapter(1)
+        self.set_map("")
+        self.set_subA("")
+        self.set_subB("")
+
+    def set_igt(self, seconds: int) -> None:
+        self.igt = seconds
+        self.mem.write(self.igt_addr, seconds.to_bytes(4, "little", signed=True))
+
+    def move_igt(self, obj: int) -> None:
+        """Rebuild the object IGT lives in at `obj` (as a reload can), keeping its value."""
+        from config import POINTER_OFFSETS
+
+        self.mem.write(self.igt_owner, obj.to_bytes(8, "little"))
+        self.igt_addr = obj + POINTER_OFFSETS[-1]
+        self.set_igt(self.igt)
+
+    def set_chapter(self, chapter: int) -> None:
+        self.mem.write(self.base + self.offsets["chapter_rel"], chapter.to_bytes(8, "little", signed=True))
+
+    def set_map(self, name: str) -> None:
+        self.mem.write(self.struct_addr + self.offsets["map_name_off"], name.encode()[:255] + b"\x00")
+
+    def set_subA(self, name: str) -> None:
+        self.mem.write(self.struct_addr + self.offsets["subA_off"], name.encode()[:255] + b"\x00")
+
+    def set_subB(self, name: str) -> None:
+        self.mem.write(self.SUBB_STR, name.encode()[:255] + b"\x00")
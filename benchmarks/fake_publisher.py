@@ -0,0 +1,106 @@
+# benchmarks/fake_publisher.py
+#
+# A sampler daemon over the fake game, for trying subscribers without the
+# game: IGT runs in real time and every few seconds the game moves on to the
+# next subsection (a new chapter every few of those). Point the timer
+# (SAMPLER_ADDRESS in config.py) or the logger (--sampler ADDRESS) at it.
+# On exit it prints how many reads the fake game served, however many
+# subscribers were connected, and any name read that the game never set.
+#
+#   python -m benchmarks.fake_publisher --address /tmp/ew-fake.sock
+
+import argparse
+import signal
+import threading
+import time
+
+from controller import TimerController
+from memory_reader import MemoryReader
+from sampler_daemon import SnapshotServer
+from benchmarks.fake_memory import FakeGame
+
+
+class CheckedSource:
+    """The controller as the server's source, noting every name it reads that the walker never set."""
+    def __init__(self, controller: TimerController, played: set) -> None:
+        self.controller = controller
+        self.played = played
+        self.unexpected: set = set()
+
+    def sample(self):
+        snap = self.controller.sample()
+        for name in (snap.subA_name, snap.subB_name, snap.map_name):
+            if name and name not in self.played:
+                self.unexpected.add(name)
+        return snap
+
+    def next_poll_delay(self) -> float:
+        return self.controller.next_poll_delay()
+
+
+def play(game: FakeGame, stop: threading.Event, room_s: float, rooms_per_chapter: int, played: set) -> None:
+    start = time.monotonic()
+    room = -1
+    while not stop.wait(0.05):
+        elapsed = time.monotonic() - start
+        game.set_igt(int(elapsed))
+        r = int(elapsed // room_s)
+        if r == room:
+            continue
+        room = r
+        chapter, i = divmod(r, rooms_per_chapter)
+        chapter += 1
+        names = ([f"ch{chapter:02d}_map", f"CH{chapter:02d}_Start"] if i == 0
+                 else [f"CH{chapter:02d}_Room{i}"])
+        played.update(names)  # before the writes, so a read never sees a name not in it yet
+        if i == 0:
+            game.set_chapter(chapter)
+            game.set_map(names[0])
+            game.set_subA(names[1])
+            game.set_subB("")
+        else:
+            game.set_subB(names[0])
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Publish snapshots of a fake game walking through its rooms.")
+    ap.add_argument("--address", default=None, help="Unix socket path or host:port (default: the daemon's).")
+    ap.add_argument("--room-seconds", type=float, default=3.0)
+    ap.add_argument("--rooms-per-chapter", type=int, default=4)
+    args = ap.parse_args()
+
+    game = FakeGame()
+    controller = TimerController(MemoryReader(game.mem))
+    played: set = set()
+    source = CheckedSource(controller, played)
+    server = SnapshotServer(source, args.address)
+    stop = threading.Event()
+    walker = threading.Thread(target=play, args=(game, stop, args.room_seconds, args.rooms_per_chapter, played),
+                              daemon=True)
+    walker.start()
+    print(f"[+] Publishing the fake game at {server.sockaddr}")
+
+    def cleanup(*_):
+        server.stop()
+
+    signal.signal(signal.SIGINT, cleanup)
+    signal.signal(signal.SIGTERM, cleanup)
+    started = time.monotonic()
+    try:
+        server.serve_forever()
+    finally:
+        stop.set()
+        server.close()
+        controller.close()
+        took = time.monotonic() - started
+        print(f"[i] {server.samples} samples, {game.mem.reads} fake reads in {took:.1f} s "
+              f"({game.mem.reads / took:.0f} reads/s)")
+        if source.unexpected:
+            print(f"[!] {len(source.unexpected)} names read that the game never set: "
+                  f"{sorted(source.unexpected)}")
+        else:
+            print(f"[+] Every name read was one of the {len(played)} the game set")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/field_schedule.py
+# Split-detection delay and reads/s: every field at 100 ms vs the per-field schedule.
+# Runs the real Sampler in real time against the fake backend (a few seconds per case).
+
+import random
+import threading
+import time
+
+from config import FIELD_COALESCE_MS, FIELD_PERIODS_MS
+from controller import TimerController
+from memory_reader import FieldScheduler, MemoryReader
+from sampler import Sampler
+from benchmarks.fake_memory import FakeGame
+
+UNIFORM_MS = {"igt": 100, "subB": 100, "chapter": 100, "subA": 100, "map": None}
+ROOMS = ["CH03_Village_Gate", "CH03_Village_Church", "CH03_Village_Barn", "CH03_Village_Mill"]
+
+
+def measure(periods: dict, seconds: float, changes: int = 20) -> dict:
+    game = FakeGame()
+    game.set_chapter(3)
+    game.set_subA(ROOMS[0])
+    game.set_subB(ROOMS[0])
+    reader = MemoryReader(game.mem)
+    reader.scheduler = FieldScheduler(periods, FIELD_COALESCE_MS)
+
+    changed_at = {}
+    delays = []
+    read_snapshot = reader.read_snapshot
+
+    def timed_read(*a, **kw):
+        snap = read_snapshot(*a, **kw)
+        t = changed_at.pop(snap.subB_name, None)
+        if t is not None:
+            delays.append(time.monotonic() - t)
+        return snap
+
+    reader.read_snapshot = timed_read
+    sampler = Sampler(TimerController(reader))
+    stop = threading.Event()
+
+    def play():
+        rng = random.Random(1)
+        igt = 600
+        t_igt = time.monotonic()
+        for i in range(changes):
+            end = time.monotonic() + seconds / changes * rng.uniform(0.5, 1.5)
+            while time.monotonic() < end and not stop.is_set():
+                if time.monotonic() - t_igt >= 1.0:
+                    igt += 1
+                    t_igt += 1.0
+                    game.set_igt(igt)
+                time.sleep(0.005)
+            name = f"{ROOMS[i % len(ROOMS)]}_{i}"
+            changed_at[name] = time.monotonic()
+            game.set_subB(name)
+
+    game.set_igt(600)
+    sampler.start()
+    time.sleep(0.2)
+    reads0, t0 = game.mem.reads, time.monotonic()
+    player = threading.Thread(target=play)
+    player.start()
+    player.join()
+    time.sleep(0.3)
+    elapsed = time.monotonic() - t0
+    reads = game.mem.reads - reads0
+    stop.set()
+    sampler.stop()
+
+    delays.sort()
+    return {
+        "reads_per_s": reads / elapsed,
+        "ticks_per_s": sampler.ticks / (elapsed + 0.2),
+        "delay_ms_p50": delays[len(delays) // 2] * 1000 if delays else float("nan"),
+        "delay_ms_max": delays[-1] * 1000 if delays else float("nan"),
+        "detected": f"{len(delays)}/{changes}",
+    }
+
+
+def main(seconds: float = 6.0) -> None:
+    print(f"{'schedule':<12}{'reads/s':>9}{'ticks/s':>9}{'delay p50':>11}{'delay max':>11}  detected")
+    for label, periods in (("uniform 100", UNIFORM_MS), ("per-field", FIELD_PERIODS_MS)):
+        r = measure(periods, seconds)
+        print(f"{label:<12}{r['reads_per_s']:>9.0f}{r['ticks_per_s']:>9.1f}"
+              f"{r['delay_ms_p50']:>9.0f}ms{r['delay_ms_max']:>9.0f}ms  {r['detected']}")
+
+
+if __name__ == "__main__":
+    main()
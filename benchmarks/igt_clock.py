@@ -0,0 +1,94 @@
+# benchmarks/igt_clock.py
+#
+# Accuracy and cost of IgtClock on a simulated timeline (no sleeping): the game
+# clock runs from a random phase, pauses now and then, and IGT (whole seconds)
+# is read every FIELD_PERIODS_MS["igt"] with some jitter. Error is measured at
+# every read against the true game time; reads during a pause are reported
+# separately (the clock holds at the last value it showed once the next second
+# is overdue; the true fraction is unknowable).
+#
+#   python -m benchmarks.igt_clock
+
+import argparse
+import random
+import time
+
+from config import FIELD_PERIODS_MS
+from igt_clock import IgtClock
+
+MS = 1_000_000
+
+
+def simulate(seconds: int, period_ms: int, jitter_ms: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    clock = IgtClock()
+    game_ns = rng.randrange(1000) * MS  # game time at t=0 (random phase)
+    t = 0
+    paused_until = -1
+    errors = []
+    paused = []
+    whole = []
+
+    while t < seconds * 1000 * MS:
+        step = (period_ms + rng.uniform(-jitter_ms, jitter_ms)) * MS
+        step = int(max(step, MS))
+        if t >= paused_until and rng.random() < 0.002:  # pause menu for 0.5-3 s
+            paused_until = t + rng.randrange(500, 3000) * MS
+        if t >= paused_until:
+            game_ns += step
+        t += step
+
+        igt = game_ns // (1000 * MS)
+        clock.observe(igt, t)
+        est = clock.ms_at(t)
+        if not clock.synced:
+            continue
+        if t < paused_until:  # the true fraction is unknowable while stopped
+            paused.append(abs(est - game_ns // MS))
+            continue
+        errors.append(abs(est - game_ns // MS))
+        whole.append(game_ns // MS - igt * 1000)
+
+    errors.sort()
+    whole.sort()
+    paused.sort()
+    n = len(errors)
+    return {
+        "reads": n,
+        "paused_reads": len(paused),
+        "paused_p50_ms": paused[len(paused) // 2] if paused else 0,
+        "p50_ms": errors[n // 2],
+        "p99_ms": errors[n * 99 // 100],
+        "whole_seconds_p50_ms": whole[n // 2],
+        "whole_seconds_p99_ms": whole[n * 99 // 100],
+    }
+
+
+def cost(n: int = 200_000) -> float:
+    clock = IgtClock()
+    t = time.perf_counter_ns()
+    for i in range(n):
+        now = i * 100 * MS
+        clock.observe(i // 10, now)
+        clock.ms_at(now)
+    return (time.perf_counter_ns() - t) / n
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Measure IgtClock interpolation error on a simulated game clock.")
+    ap.add_argument("--seconds", type=int, default=3600)
+    ap.add_argument("--jitter", type=int, default=15, help="Poll jitter in ms (+/-).")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    period = FIELD_PERIODS_MS["igt"]
+    r = simulate(args.seconds, period, args.jitter, args.seed)
+    print(f"[i] IGT read every {period}±{args.jitter} ms, {r['reads']} reads while running")
+    print(f"    interpolated error:  p50 {r['p50_ms']} ms, p99 {r['p99_ms']} ms")
+    print(f"    whole seconds error: p50 {r['whole_seconds_p50_ms']} ms, p99 {r['whole_seconds_p99_ms']} ms")
+    print(f"    while paused ({r['paused_reads']} reads): p50 {r['paused_p50_ms']} ms (held)")
+    print(f"[i] observe + ms_at: {cost():.0f} ns per tick")
+
+
+if __name__ == "__main__":
+    main()
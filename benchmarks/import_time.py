@@ -0,0 +1,69 @@
+# benchmarks/import_time.py
+#
+# Startup cost per entry point: each scenario imports in a fresh interpreter
+# what that mode of main.py imports, under -X importtime. Reports the median
+# over --runs of
+#   - import time: sum of the top-level cumulative times, minus the
+#     interpreter's own startup imports (a bare `python -c pass`),
+#   - wall time of the whole process,
+# and which of the heavy optional modules got loaded.
+#
+#   python -m benchmarks.import_time --runs 15
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "bare interpreter": "pass",
+    "main.py (argparse only)": "import main",
+    "headless": "import main, controller, sampler, headless",
+    "headless + history/stats": "import main, controller, sampler, headless, history, split_stats",
+    "gui + history/stats": "import main, controller, sampler, history, split_stats, ui_tk",
+}
+HEAVY = ("tkinter", "sqlite3", "psutil", "pymem", "socket", "hashlib", "concurrent.futures", "csv")
+
+
+def run(code: str) -> tuple[int, float, list]:
+    probe = f"{code}\nimport sys\nprint('LOADED', *[m for m in {HEAVY!r} if m in sys.modules])"
+    t = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", probe], cwd=ROOT,
+                          capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - t
+    total = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit() and not name.startswith("  "):  # top level: one leading space
+            total += int(cumulative)
+    loaded = proc.stdout.split("LOADED", 1)[1].split()
+    return total, wall, loaded
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Import / startup time of each entry point.")
+    ap.add_argument("--runs", type=int, default=11)
+    args = ap.parse_args()
+
+    base_us = None
+    for name, code in SCENARIOS.items():
+        totals, walls, loaded = [], [], []
+        for _ in range(args.runs):
+            total, wall, loaded = run(code)
+            totals.append(total)
+            walls.append(wall)
+        us = statistics.median(totals)
+        if base_us is None:
+            base_us = us
+        print(f"{name:<26} imports {(us - base_us) / 1000:6.1f} ms   process {statistics.median(walls) * 1000:6.1f} ms"
+              f"   loaded: {', '.join(loaded) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# benchmarks/overlay_client.py
+#
+# Minimal Server-Sent Events client for overlay_server.py: prints every delta
+# it receives and, on exit, how many events / bytes arrived versus what
+# pushing the full set of texts on every change would have cost.
+#
+#   python -m benchmarks.overlay_client                    # main.py --overlay
+#   python -m benchmarks.overlay_client --fake --clients 3 --seconds 20
+#
+# --fake serves the fake game (walking through rooms in real time, as in
+# benchmarks.fake_publisher) from this process and subscribes N clients.
+
+import argparse
+import json
+import threading
+import time
+import urllib.request
+
+from config import OVERLAY_HOST, OVERLAY_PORT
+from model import TEXT_FIELDS
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.events = 0
+        self.fields = 0
+        self.bytes = 0
+        self.full_bytes = 0
+        self.texts: dict[str, str] = {}
+
+
+def listen(url: str, stats: Stats, quiet: bool, stop: threading.Event) -> None:
+    with urllib.request.urlopen(url + "events", timeout=30) as resp:
+        for line in resp:
+            if stop.is_set():
+                return
+            stats.bytes += len(line)
+            if not line.startswith(b"data: "):
+                continue
+            delta = json.loads(line[6:])
+            stats.events += 1
+            stats.fields += len(delta)
+            stats.texts.update(delta)
+            stats.full_bytes += len(b"data: \n\n") + len(json.dumps(stats.texts, ensure_ascii=False).encode())
+            if not quiet:
+                print(f"[•] {delta}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Subscribe to the overlay server and count what it pushes.")
+    ap.add_argument("--url", default=f"http://{OVERLAY_HOST}:{OVERLAY_PORT}/")
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--clients", type=int, default=1)
+    ap.add_argument("--fake", action="store_true", help="Serve the fake game from this process.")
+    ap.add_argument("--quiet", action="store_true", help="Don't print each delta.")
+    args = ap.parse_args()
+
+    server = sampler = game_stop = None
+    url = args.url
+    if args.fake:
+        from controller import TimerController
+        from memory_reader import MemoryReader
+        from overlay_server import OverlayServer
+        from sampler import Sampler
+        from benchmarks.fake_memory import FakeGame
+        from benchmarks.fake_publisher import play
+
+        game = FakeGame()
+        sampler = Sampler(TimerController(MemoryReader(game.mem)))
+        server = OverlayServer(sampler, "127.0.0.1", 0)
+        game_stop = threading.Event()
+        threading.Thread(target=play, args=(game, game_stop, 1.5, 4), daemon=True).start()
+        sampler.start()
+        server.start()
+        url = server.url
+
+    stop = threading.Event()
+    stats = [Stats() for _ in range(args.clients)]
+    for i, s in enumerate(stats):
+        threading.Thread(target=listen, args=(url, s, args.quiet or i > 0, stop), daemon=True).start()
+    try:
+        time.sleep(args.seconds)
+    except KeyboardInterrupt:
+        pass
+    stop.set()
+
+    if server is not None:
+        game_stop.set()
+        server.stop()
+        sampler.stop()
+        print(f"[i] server: {server.pushes} pushes, {sampler.ticks} sampler ticks")
+    for i, s in enumerate(stats):
+        per = s.fields / s.events if s.events else 0
+        print(f"[i] client {i}: {s.events} events, {per:.1f} of {len(TEXT_FIELDS)} fields each, "
+              f"{s.bytes} bytes ({s.full_bytes} if every event carried every field)")
+        if s.texts != stats[0].texts:
+            print(f"[!] client {i} ended on different texts than client 0")
+
+
+if __name__ == "__main__":
+    main()
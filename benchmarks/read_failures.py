@@ -0,0 +1,114 @@
+# benchmarks/read_failures.py
+#
+# A loading screen against the fake backend: the pages holding IGT and subB's
+# string are unmapped for --load seconds (IGT's chain also points nowhere),
+# then come back. The reader runs on its own schedule (sleeping until
+# next_due()), first as it used to (every field read whenever due, every
+# error printed), then with the region index range-checking pointers, then
+# with the circuit breakers and rate-limited reporter on top. Reports, for
+# the load window, backend reads and how many of them raised, console
+# lines, reader time, and how long after the load IGT and subB were read
+# again.
+#
+#   python -m benchmarks.read_failures --load 4
+
+import argparse
+import contextlib
+import io
+import time
+
+from memory_reader import MemoryReader
+from benchmarks.fake_memory import FakeGame, FakeProcess, PAGE_SIZE
+
+BAD_PTR = 0x7FFF00000000  # unmapped
+
+
+class CountingProcess(FakeProcess):
+    def __init__(self, read_cost_us: float) -> None:
+        super().__init__(read_cost_us)
+        self.failed = 0
+
+    def read(self, addr: int, n: int) -> bytes:
+        try:
+            return super().read(addr, n)
+        except Exception:
+            self.failed += 1
+            raise
+
+
+def run(load_s: float, read_cost_us: float, index: bool, breakers: bool) -> dict:
+    from config import BASE_OFFSET
+
+    mem = CountingProcess(read_cost_us)
+    game = FakeGame(mem)
+    game.set_chapter(5)
+    game.set_subA("CH05_Hospital")
+    game.set_subB("CH05_Hospital_Hall")
+    game.set_igt(900)
+    reader = MemoryReader(mem)
+    if not index:
+        reader.region_index = None
+    if not breakers:
+        for b in reader.breakers.values():
+            b.threshold = 1 << 30
+        reader.errors.interval = 0.0
+
+    igt_ptr = mem.read(game.base + BASE_OFFSET, 8)
+    pages = [a - a % PAGE_SIZE for a in (game.igt_addr, game.SUBB_STR)]
+    out = io.StringIO()
+    res = {}
+
+    def phase(seconds: float) -> None:
+        until = time.monotonic() + seconds
+        while time.monotonic() < until:
+            time.sleep(max(0.0, reader.next_due() - time.monotonic()))
+            with contextlib.redirect_stdout(out):
+                reader.read_snapshot()
+
+    phase(0.5)
+    # --- loading screen ---
+    mem.write(game.base + BASE_OFFSET, BAD_PTR.to_bytes(8, "little"))
+    saved = {p: mem.pages.pop(p) for p in pages}
+    reads, failed, lines = mem.reads, mem.failed, out.getvalue().count("\n")
+    cpu = time.thread_time()
+    phase(load_s)
+    res["reads"] = mem.reads - reads
+    res["failed"] = mem.failed - failed
+    res["lines"] = out.getvalue().count("\n") - lines
+    res["cpu_ms"] = (time.thread_time() - cpu) * 1000
+    # --- loaded ---
+    mem.write(game.base + BASE_OFFSET, igt_ptr)
+    mem.pages.update(saved)
+    t = time.monotonic()
+    while True:
+        time.sleep(max(0.0, reader.next_due() - time.monotonic()))
+        with contextlib.redirect_stdout(out):
+            snap = reader.read_snapshot()
+        if snap.igt_seconds == 900 and snap.subB_name:
+            break
+    res["recover_ms"] = (time.monotonic() - t) * 1000
+    with contextlib.redirect_stdout(out):
+        reader.close()
+    res["log"] = out.getvalue()
+    return res
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Reader cost and console output during a loading screen.")
+    ap.add_argument("--load", type=float, default=4.0, help="Seconds the pointers stay invalid.")
+    ap.add_argument("--read-cost-us", type=float, default=20.0, help="Modelled cost of one cross-process read.")
+    ap.add_argument("--show-log", action="store_true", help="Print what the breaker run logged.")
+    args = ap.parse_args()
+
+    runs = (("every read, every error", False, False), ("+ region index", True, False),
+            ("+ breakers + reporter", True, True))
+    for label, index, on in runs:
+        r = run(args.load, args.read_cost_us, index, on)
+        print(f"{label:<24} during load: {r['reads']:5d} reads ({r['failed']:4d} failed), "
+              f"{r['lines']:4d} lines, {r['cpu_ms']:6.1f} ms CPU; back to IGT + subB {r['recover_ms']:5.0f} ms later")
+        if on and args.show_log:
+            print(r["log"], end="")
+
+
+if __name__ == "__main__":
+    main()
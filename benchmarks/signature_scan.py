@@ -0,0 +1,101 @@
+# benchmarks/signature_scan.py
+#
+# Signature scan over a synthetic module: random bytes with an instruction
+# planted for every offset the tracker uses (one of them straddling a chunk
+# edge), served from a dump image (ImageBackend). Checks every signature
+# resolves to the hard-coded value, then times:
+#   - the scan at 1 and N workers and a few chunk sizes,
+#   - resolve_offsets() cold (scan + cache write) and warm (cache hit).
+#
+#   python -m benchmarks.signature_scan --mb 64
+
+import argparse
+import os
+import random
+import struct
+import tempfile
+import time
+
+from config import PROC_NAME
+from memory_backend import ImageBackend, write_image
+from memory_reader import default_offsets
+from signatures import Signature, resolve_offsets, scan_module
+
+BASE = 0x140000000
+
+
+def build(mb: int, chunk: int, seed: int):
+    """(image path, {name: (pattern, kind, at, end)}) with every offset planted once."""
+    rng = random.Random(seed)
+    size = mb * 1024 * 1024
+    data = bytearray(rng.randbytes(size))
+    specs = {}
+    defaults = default_offsets()
+    slots = rng.sample(range(1, size // 4096 - 1), len(defaults))
+    for i, (name, value) in enumerate(sorted(defaults.items())):
+        pos = slots[i] * 4096 + 123
+        if i == 0:
+            pos = chunk - 5  # straddles the first chunk edge
+        tag = bytes((0x90 + i, 0xC3, 0x5A + i))
+        if name.endswith("_off") and value < 0x80:
+            # mov rax, [rax+disp8]; <tag>
+            code = b"\x48\x8B\x40" + bytes((value,)) + tag
+            specs[name] = ("48 8B 40 ?? " + tag.hex(" ").upper(), "imm8", 3, 0)
+        elif name.endswith("_off"):
+            # lea rcx, [rbx+imm32]; <tag>
+            code = b"\x48\x8D\x8B" + struct.pack("<I", value) + tag
+            specs[name] = ("48 8D 8B ?? ?? ?? ?? " + tag.hex(" ").upper(), "imm32", 3, 0)
+        else:
+            # mov rax, [rip+disp32]; <tag>
+            disp = value - (pos + 7)
+            code = b"\x48\x8B\x05" + struct.pack("<i", disp) + tag
+            specs[name] = ("48 8B 05 ?? ?? ?? ?? " + tag.hex(" ").upper(), "rip", 3, 7)
+        data[pos:pos + len(code)] = code
+
+    fd, path = tempfile.mkstemp(suffix=".ewimg")
+    os.close(fd)
+    write_image(path, [(BASE, bytes(data))], {PROC_NAME: BASE})
+    return path, specs
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Signature scan speed over a synthetic module.")
+    ap.add_argument("--mb", type=int, default=64, help="Module size in MB.")
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    chunk = 4 * 1024 * 1024
+    path, specs = build(args.mb, chunk, args.seed)
+    cache = path + ".cache.json"
+    mem = ImageBackend(path)
+    try:
+        defaults = default_offsets()
+        sigs = {n: Signature(*s) for n, s in specs.items()}
+
+        for workers in (1, args.workers):
+            for chunk_size in (1 << 20, chunk, 16 << 20):
+                t = time.perf_counter()
+                found = scan_module(mem, PROC_NAME, BASE, sigs, chunk_size, workers)
+                dt = time.perf_counter() - t
+                ok = found == defaults
+                print(f"workers {workers} chunk {chunk_size >> 20:>2} MB: {dt:.3f}s "
+                      f"({args.mb / dt:.0f} MB/s) {'all found' if ok else f'MISMATCH {found}'}")
+
+        for label in ("cold", "warm"):
+            t = time.perf_counter()
+            offsets = resolve_offsets(mem, BASE, defaults, specs=specs, cache_path=cache)
+            dt = time.perf_counter() - t
+            print(f"[i] resolve_offsets {label}: {dt * 1000:.1f} ms, "
+                  f"{'matches built-in offsets' if offsets == defaults else 'MISMATCH'}")
+    finally:
+        mem.close()
+        for p in (path, cache):
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/split_stats.py
+#
+# Accuracy, size and cost of the per-subsection stats (split_stats.py) on
+# synthetic split durations (log-normal around a 7 s segment):
+#   - worst rank error of p10 / median / p90 against the exact sorted
+#     data over --trials data sets, for one sketch fed everything and for
+#     per-session sketches merged (one run's error is luck of the draw),
+#   - items retained (memory stays flat as n grows),
+#   - cost of one add() including re-rendering the summary line, and the
+#     size of the saved JSON.
+#
+#   python -m benchmarks.split_stats
+
+import argparse
+import bisect
+import json
+import random
+import time
+
+from split_stats import KllSketch, SubsectionStats
+
+QS = (0.1, 0.5, 0.9)
+
+
+def rank_errors(sketch: KllSketch, exact: list) -> list:
+    n = len(exact)
+    out = []
+    for q, v in zip(QS, sketch.quantiles(QS)):
+        rank = (bisect.bisect_left(exact, v) + bisect.bisect_right(exact, v)) / 2 / n
+        out.append(abs(rank - q))
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Quantile sketch accuracy / size / cost.")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--trials", type=int, default=10, help="Data sets per n; the worst error is reported.")
+    ap.add_argument("--sessions", type=int, default=20, help="Sessions to split the data into for the merge test.")
+    args = ap.parse_args()
+    rng = random.Random(args.seed)
+
+    for n in (100, 2000, 100_000):
+        worst1 = worst2 = [0.0] * len(QS)
+        items = 0
+        for _ in range(args.trials):
+            data = [int(rng.lognormvariate(8.85, 0.12)) for _ in range(n)]
+            exact = sorted(data)
+
+            one = KllSketch()
+            for x in data:
+                one.add(x)
+
+            merged = KllSketch()
+            per = max(1, n // args.sessions)
+            for i in range(0, n, per):
+                part = KllSketch()
+                for x in data[i:i + per]:
+                    part.add(x)
+                merged.merge(KllSketch.from_json(json.loads(json.dumps(part.to_json()))))  # via disk format
+
+            worst1 = list(map(max, worst1, rank_errors(one, exact)))
+            worst2 = list(map(max, worst2, rank_errors(merged, exact)))
+            items = max(items, sum(len(level) for level in one.levels))
+
+        e1 = " ".join(f"{e * 100:.2f}" for e in worst1)
+        e2 = " ".join(f"{e * 100:.2f}" for e in worst2)
+        print(f"n={n:<7} worst rank error % of {args.trials} (p10 p50 p90): single {e1} | "
+              f"{args.sessions} merged {e2} | up to {items} items kept")
+
+    st = SubsectionStats()
+    samples = [int(rng.lognormvariate(8.85, 0.12)) for _ in range(20000)]
+    t = time.perf_counter()
+    for x in samples:
+        st.add(x)
+        st.summary_text()
+    dt = (time.perf_counter() - t) / len(samples)
+    size = len(json.dumps(st.to_json(), separators=(",", ":")))
+    print(f"[i] add + summary: {dt * 1e6:.0f} us per closed split; saved size {size} bytes per subsection")
+    print(f"[i] {st.summary_text()}")
+
+
+if __name__ == "__main__":
+    main()
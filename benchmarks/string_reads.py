@@ -0,0 +1,103 @@
+# benchmarks/string_reads.py
+# Counts cross-process reads per StringField.read(), old per-byte readers vs chunked.
+
+import time
+from contextlib import contextmanager
+
+import evil_within_subsection_logger_v2 as logger
+from benchmarks.fake_memory import FakeProcess, PAGE_SIZE
+
+
+# --------------------- the old per-byte reader, for comparison ---------------------
+def legacy_read_terminated(pm, addr, max_bytes, term):
+    """Drop-in for _read_terminated as strings used to be read: one read per character."""
+    step = len(term)
+    raw = bytearray()
+    for i in range(0, max_bytes, step):
+        try:
+            unit = pm.read(addr + i, step)
+        except Exception:
+            return None if not raw else b""
+        if not unit or unit == term:
+            break
+        raw += unit
+    return bytes(raw)
+
+
+@contextmanager
+def legacy_readers():
+    """Per-byte reads under StringField (and read_c_string / read_w_string), which all go through _read_terminated."""
+    saved = logger._read_terminated
+    logger._read_terminated = legacy_read_terminated
+    try:
+        yield
+    finally:
+        logger._read_terminated = saved
+
+
+# --------------------- scenarios ---------------------
+FIELD_ADDR = 0x140000000
+STR_ADDR = 0x7FF600001000
+NAME = "CH03_Sub_Village_Church"
+LONG_NAME = "/".join([NAME] * 12)
+
+
+def make_case(kind: str) -> FakeProcess:
+    pm = FakeProcess()
+    if kind == "ptr_c":
+        pm.write(FIELD_ADDR, STR_ADDR.to_bytes(8, "little"))
+        pm.write(STR_ADDR, NAME.encode() + b"\x00")
+    elif kind == "long_ptr_c":
+        pm.write(FIELD_ADDR, STR_ADDR.to_bytes(8, "little"))
+        pm.write(STR_ADDR, LONG_NAME.encode() + b"\x00")
+    elif kind == "inline_c":
+        pm.write(FIELD_ADDR, NAME.encode() + b"\x00")
+    elif kind == "page_cross_c":
+        # Inline string starting 8 bytes before a page boundary.
+        pm.write(FIELD_ADDR + PAGE_SIZE - 8, NAME.encode() + b"\x00")
+    return pm
+
+
+def field_addr(kind: str) -> int:
+    return FIELD_ADDR + PAGE_SIZE - 8 if kind == "page_cross_c" else FIELD_ADDR
+
+
+def measure(kind: str, iters: int = 200, legacy: bool = False) -> dict:
+    pm = make_case(kind)
+    addr = field_addr(kind)
+    field = logger.StringField(pm, lambda: addr, kind)
+
+    pm.reads = 0
+    cold_value = field.read()
+    cold_reads = pm.reads
+
+    pm.reads = 0
+    t0 = time.perf_counter()
+    for _ in range(iters):
+        if legacy:
+            field.last_raw = b""  # the old StringField had no unchanged-bytes check
+        field.read()
+    dt = time.perf_counter() - t0
+
+    return {
+        "value_ok": cold_value == (LONG_NAME if kind == "long_ptr_c" else NAME),
+        "cold_reads": cold_reads,
+        "warm_reads": pm.reads / iters,
+        "warm_us": dt / iters * 1e6,
+    }
+
+
+def main() -> None:
+    kinds = ("ptr_c", "inline_c", "page_cross_c", "long_ptr_c")
+    print(f"{'case':<14}{'path':<9}{'cold reads':>11}{'warm reads':>11}{'warm us':>10}  ok")
+    for kind in kinds:
+        with legacy_readers():
+            old = measure(kind, legacy=True)
+        new = measure(kind)
+        for label, r in (("per-byte", old), ("chunked", new)):
+            print(f"{kind:<14}{label:<9}{r['cold_reads']:>11}{r['warm_reads']:>11.1f}"
+                  f"{r['warm_us']:>10.1f}  {r['value_ok']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+# benchmarks/tick.py
+#
+# Cost of each stage of a tick (read -> update_timer_state -> render), headless,
+# against the fake memory backend. Output is stable JSON (sorted keys, integer ns)
+# so runs can be diffed between commits:
+#
+#   python -m benchmarks.tick --out before.json
+#   python -m benchmarks.tick --out after.json
+#   python -m benchmarks.tick --compare before.json after.json
+#
+# --recording FILE adds a scenario that drives the fake game from a .ewrec recording.
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+
+from config import BASE_OFFSET, POINTER_OFFSETS
+from model import TEXT_FIELDS, TimerState, format_hhmmss, update_timer_state
+from memory_reader import MemoryReader, resolve_pointer_chain
+from evil_within_subsection_logger_v2 import read_int_auto
+from recording import SnapshotReader
+from benchmarks.fake_memory import FakeGame
+
+SCHEMA = 1
+ROOMS = ["CH03_Village_Gate", "CH03_Village_Church", "CH03_Village_Barn", "CH03_Village_Mill"]
+
+
+# --------------------- scenarios: one callable per tick that mutates the fake game ---------------------
+def steady(game: FakeGame, ticks: int):
+    game.set_chapter(3)
+    game.set_subA(ROOMS[0])
+    game.set_subB(ROOMS[1])
+    for i in range(ticks):
+        game.set_igt(600 + i // 10)
+        yield
+
+
+def quickload_storm(game: FakeGame, ticks: int):
+    game.set_chapter(3)
+    game.set_subA(ROOMS[0])
+    igt = 900
+    for i in range(ticks):
+        if i % 20 == 19:
+            # Reload a checkpoint: back 30 s, but never before the chapter's
+            # first one, so IGT stays valid however long the run.
+            igt = max(igt - 30, 600)
+            game.set_subB(ROOMS[0])
+        elif i % 20 == 5:
+            game.set_subB(ROOMS[1])
+        if i % 10 == 0:
+            igt += 1
+        game.set_igt(igt)
+        yield
+
+
+def rapid_subB(game: FakeGame, ticks: int):
+    game.set_chapter(3)
+    game.set_subA(ROOMS[0])
+    for i in range(ticks):
+        game.set_igt(600 + i // 10)
+        game.set_subB(ROOMS[(i // 2) % len(ROOMS)])
+        yield
+
+
+def detached(game: FakeGame, ticks: int):
+    # The game exited under us: every page is gone.
+    game.mem.pages.clear()
+    game.mem.alive = False
+    for _ in range(ticks):
+        yield
+
+
+def recorded(path: str):
+    def scenario(game: FakeGame, ticks: int):
+        n = 0
+        while n < ticks:
+            any_snap = False
+            for _, snap in SnapshotReader.open(path):
+                any_snap = True
+                game.set_igt(snap.igt_seconds or 0)
+                game.set_chapter(snap.chapter_val or 0)
+                game.set_subA(snap.subA_name)
+                game.set_subB(snap.subB_name)
+                yield
+                n += 1
+                if n >= ticks:
+                    return
+            if not any_snap:
+                return
+    return scenario
+
+
+# --------------------- render (TimerWindow's LabelRenderer, without a display) ---------------------
+class _Label:
+    def config(self, **kw) -> None:
+        self.kw = kw
+
+
+def make_renderer():
+    """TimerWindow's renderer over stand-in labels. None if tkinter is missing."""
+    try:
+        from ui_tk import LabelRenderer
+    except ImportError:
+        return None
+    return LabelRenderer({field: _Label() for field in TEXT_FIELDS})
+
+
+# --------------------- measurement ---------------------
+def summarize(samples: list) -> dict:
+    samples.sort()
+    n = len(samples)
+    return {
+        "n": n,
+        "p50_ns": samples[n // 2],
+        "p99_ns": samples[min(n - 1, n * 99 // 100)],
+        "max_ns": samples[-1],
+    }
+
+
+def run_scenario(scenario, ticks: int) -> dict:
+    game = FakeGame()
+    reader = MemoryReader(game.mem)
+    state = TimerState()
+    info = None
+    renderer = make_renderer()
+    chapter_addr = game.base + game.offsets["chapter_rel"]
+
+    stages = {k: [] for k in (
+        "string_field_read", "resolve_pointer_chain", "read_int_auto",
+        "read_snapshot", "update_timer_state", "format_hhmmss", "poll_render",
+    )}
+    if renderer is None:
+        del stages["poll_render"]
+    clock = time.perf_counter_ns
+    reads = 0
+    last_info = None
+
+    with contextlib.redirect_stdout(io.StringIO()):  # read errors print; keep output clean
+        for _ in scenario(game, ticks):
+            t = clock()
+            if reader.subB_reader is not None:
+                reader.subB_reader.read()
+            stages["string_field_read"].append(clock() - t)
+
+            t = clock()
+            try:
+                resolve_pointer_chain(game.mem, game.base, BASE_OFFSET, POINTER_OFFSETS)
+            except Exception:
+                pass
+            stages["resolve_pointer_chain"].append(clock() - t)
+
+            t = clock()
+            read_int_auto(game.mem, chapter_addr)
+            stages["read_int_auto"].append(clock() - t)
+
+            reader.scheduler.reset()  # ticks run back-to-back here: read every field each time
+            before = game.mem.reads
+            t = clock()
+            snap = reader.read_snapshot()
+            stages["read_snapshot"].append(clock() - t)
+            reads += game.mem.reads - before
+
+            t = clock()
+            state, info = update_timer_state(state, snap, info)
+            stages["update_timer_state"].append(clock() - t)
+
+            t = clock()
+            format_hhmmss(snap.igt_seconds)
+            stages["format_hhmmss"].append(clock() - t)
+
+            if renderer is not None:
+                t = clock()
+                if info is not last_info:  # TimerWindow.poll renders only a new DisplayInfo
+                    last_info = info
+                    renderer.render(info)
+                stages["poll_render"].append(clock() - t)
+
+    n = len(stages["read_snapshot"])
+    out = {name: summarize(v) for name, v in stages.items()}
+    out["reads_per_tick"] = round(reads / n, 2) if n else 0
+    out["splits"] = state.splits_closed
+    if renderer is not None:
+        out["widget_updates_per_tick"] = round(renderer.widget_updates / n, 2) if n else 0
+    return out
+
+
+def run(ticks: int, recording=None) -> dict:
+    scenarios = {
+        "steady": steady,
+        "quickload_storm": quickload_storm,
+        "rapid_subB": rapid_subB,
+        "detached": detached,
+    }
+    if recording:
+        scenarios["recorded"] = recorded(recording)
+    return {
+        "schema": SCHEMA,
+        "python": platform.python_version(),
+        "ticks": ticks,
+        "scenarios": {name: run_scenario(fn, ticks) for name, fn in scenarios.items()},
+    }
+
+
+def compare(old_path: str, new_path: str) -> None:
+    with open(old_path) as f:
+        old = json.load(f)["scenarios"]
+    with open(new_path) as f:
+        new = json.load(f)["scenarios"]
+    for scen in sorted(set(old) & set(new)):
+        for stage in sorted(set(old[scen]) & set(new[scen])):
+            a, b = old[scen][stage], new[scen][stage]
+            if isinstance(a, dict):
+                a, b = a["p50_ns"], b["p50_ns"]
+                unit = "ns p50"
+            else:
+                unit = ""
+            change = f"{(b - a) / a * 100:+.0f}%" if a else "n/a"
+            print(f"{scen:<16}{stage:<24}{a:>10} -> {b:<10} {change:>6} {unit}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark the tick pipeline against a fake memory backend.")
+    ap.add_argument("--ticks", type=int, default=2000)
+    ap.add_argument("--recording", help="Also run a scenario driven by this .ewrec recording.")
+    ap.add_argument("--out", help="Write JSON here instead of stdout.")
+    ap.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two result files.")
+    args = ap.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    text = json.dumps(run(args.ticks, args.recording), indent=1, sort_keys=True)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
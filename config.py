@@ -2,11 +2,95 @@
 
 PROC_NAME = "EvilWithin.exe"
 
+# Memory backend: "auto" (pymem on Windows, /proc/<pid>/mem on Linux), "pymem" or "proc"
+MEMORY_BACKEND = "auto"
+
 # IGT pointer (same as in your original script)
 BASE_OFFSET = 0x02258E00
 POINTER_OFFSETS = (0x68, 0x28, 0x8D8C)
 
-READ_INTERVAL_MS = 100  # ms
+# Signature (AOB) scan for the offsets above and OFFSETS in the logger, so a
+# game patch doesn't break them (signatures.py). name -> (pattern, kind, at, end):
+#   "rip":   RIP-relative disp32 at `at`, next instruction at `end` -> module-relative offset
+#   "imm32": u32 at `at` -> the value itself (struct field offsets)
+#   "imm8":  u8 at `at` -> the value itself (a disp8 field offset, e.g. [rax+68h])
+# Names: "igt_base" (BASE_OFFSET), "igt_ptr0_off".."igt_ptr2_off" (POINTER_OFFSETS,
+# in order) and the OFFSETS keys. Anything missing or not found keeps the
+# hard-coded value. e.g.
+#   "chapter_rel":  ("8B 05 ?? ?? ?? ?? 83 F8 FF 74", "rip", 2, 6),
+#   "subA_off":     ("48 8D 8B ?? ?? ?? ?? E8", "imm32", 3, 0),
+#   "igt_ptr0_off": ("48 8B 40 ?? 48 85 C0 74", "imm8", 3, 0),
+SIGNATURES = {}
+SIGNATURE_CACHE = "signature_cache.json"  # scan results per executable build; None = always scan
+SCAN_CHUNK_BYTES = 4 * 1024 * 1024
+SCAN_WORKERS = 1  # >1 overlaps slow cross-process reads; the pattern matching itself holds the GIL
+
+# Resolved IGT address is cached; re-walk the chain every IGT_CHAIN_REWALK_MS
+# anyway, and whenever the value read looks implausible or goes backwards.
+IGT_CHAIN_REWALK_MS = 5000
+IGT_MAX_SECONDS = 100 * 3600
+
+# A field whose reads fail BREAKER_THRESHOLD times in a row (e.g. a pointer
+# that is invalid while loading) is skipped, and probed again after
+# BREAKER_PROBE_MIN_MS, doubling up to BREAKER_PROBE_MAX_MS, until it reads
+BREAKER_THRESHOLD = 3
+BREAKER_PROBE_MIN_MS = 100
+BREAKER_PROBE_MAX_MS = 250  # also the most a field can lag once it is readable again
+# Range-check pointers against an index of the game's readable memory before
+# reading through them (no read, no exception for a bad one). Without a
+# per-address query (/proc maps) the index is re-read at most this often.
+REGION_INDEX = True
+REGION_REFRESH_MS = 250
+# Read errors are counted per field and printed at most once per interval
+ERROR_REPORT_INTERVAL_S = 10.0
+
+READ_INTERVAL_MS = 100    # ms, tick budget; fields are polled per FIELD_PERIODS_MS below
+RENDER_INTERVAL_MS = 100  # ms, UI refresh period (Tk thread)
+
+# Per-field polling periods (ms). None = only on demand (map name: on chapter change).
+# subB drives splits, so it is polled fastest; IGT only has whole seconds.
+# subA is also re-read on every chapter change and quickload.
+FIELD_PERIODS_MS = {
+    "igt": 100,
+    "subB": 50,
+    "chapter": 250,
+    "subA": 1000,
+    "map": None,
+}
+FIELD_COALESCE_MS = 10  # fields due this close together share one wakeup / read batch
+
+# Power save: once IGT has not moved for IDLE_AFTER_MS, poll only IGT, chapter
+# and subB every IDLE_INTERVAL_MS until one of them moves
+IDLE_AFTER_MS = 2000
+IDLE_INTERVAL_MS = 1000
+
+# Attach lifecycle: background process scan backoff, and how often an attached
+# process is checked for having exited
+ATTACH_RETRY_MIN_S = 0.25
+ATTACH_RETRY_MAX_S = 5.0
+LIVENESS_CHECK_MS = 1000
+
+# Let a sampler_daemon.py own the game reads and subscribe to it instead of
+# reading the game from every tool: None = read directly, "auto" = the
+# default address, or a Unix socket path / "host:port"
+SAMPLER_ADDRESS = None
+
+# Record every snapshot to <RECORD_DIR>/session-*.ewrec (replay with replay.py); None = off
+RECORD_DIR = None
+
+# Split history (history.py): every closed segment, with best / sum of best /
+# PB per chapter, and "vs best" in the UI; None = off
+HISTORY_DB = "split_history.db"
+
+# Per-subsection stats (split_stats.py): median, p10/p90, rolling average and
+# consistency, shown under the splits and merged into this file on exit; None = off
+STATS_PATH = "split_stats.json"
+
+# Browser-source overlay (overlay_server.py, started with main.py --overlay):
+# serves overlay.html and pushes changed texts over Server-Sent Events
+OVERLAY_ENABLED = False
+OVERLAY_HOST = "127.0.0.1"
+OVERLAY_PORT = 47612
 
 # UI settings
 BG_COLOR = "#1E1E1E"
@@ -14,3 +98,17 @@ FG_COLOR = "#E0E0E0"
 FONT_TIME = ("Consolas", 16)
 FONT_TITLE = ("Consolas", 12)
 FONT_MONO = ("Consolas", 10)
+
+# Append "N widget updates/min" to the status line
+SHOW_RENDER_STATS = False
+
+# Tick instrumentation (tick_stats.py), always on: per-stage latency histograms
+# of the sampler ticks and the window's renders. SHOW_TICK_STATS adds tick
+# p50 / p99 / max and the count of ticks over READ_INTERVAL_MS to the status
+# line; F8 in the window (or exit, with main.py --tick-stats) writes them all
+# to TICK_STATS_PATH. F9 (or EW_PROFILE=<seconds> at startup) captures a
+# cProfile of PROFILE_SECONDS of ticks to <PROFILE_DIR>/tick-*.pstats
+SHOW_TICK_STATS = False
+TICK_STATS_PATH = "tick_stats.json"
+PROFILE_SECONDS = 10
+PROFILE_DIR = "."
@@ -1,15 +1,194 @@
 # controller.py
 
-from model import TimerState, DisplayInfo, update_timer_state
+import os
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
+
+from config import (
+    RECORD_DIR,
+    IDLE_AFTER_MS,
+    IDLE_INTERVAL_MS,
+    SAMPLER_ADDRESS,
+    READ_INTERVAL_MS,
+    PROFILE_DIR,
+)
+from model import TimerState, DisplayInfo, closed_segment, update_timer_state
 from memory_reader import MemoryReader
+from recording import SnapshotRecorder
+from tick_stats import TickProfiler, TickStats, profile_seconds_from_env
+
+if TYPE_CHECKING:  # passed in by the caller; importing them is the caller's business
+    from history import SplitHistory
+    from split_stats import SplitStats
+
+
+def open_session_recorder(directory: str) -> SnapshotRecorder:
+    os.makedirs(directory, exist_ok=True)
+    name = time.strftime("session-%Y%m%d-%H%M%S.ewrec")
+    return SnapshotRecorder.open(os.path.join(directory, name))
+
+
+MODE_ACTIVE = "active"
+MODE_IDLE = "power save"
+MODE_REMOTE = "remote"
+
+
+@lru_cache(maxsize=16)
+def status_text(mode: str, interval_ms: int) -> str:
+    return f"{mode.capitalize()} ({1000 / interval_ms:g} Hz)"
 
 
 class TimerController:
-    def __init__(self) -> None:
-        self.reader = MemoryReader()
+    """
+    One tick = read a snapshot, (record it,) update TimerState.
+
+    While active, ticks follow the reader's per-field schedule (the sampler
+    sleeps until next_poll_delay()).
+
+    Power save: once IGT has not moved for IDLE_AFTER_MS (menus, pause,
+    loading screens) the controller drops to IDLE_INTERVAL_MS and reads only
+    IGT, chapter and subB. The first tick on which any of them moves
+    switches back to the field schedule, re-reading everything that tick, so
+    a split made while IGT is frozen (a door, a load) is seen at most
+    IDLE_INTERVAL_MS late and still timed at the frozen IGT.
+
+    With SAMPLER_ADDRESS set, the reader is a RemoteMemoryReader: a
+    sampler_daemon.py does the reads (and the power saving), and every
+    snapshot it pushes is taken in full, as it arrives.
+
+    With a SplitHistory, every segment closed is stored, and the display
+    shows the current split against the best for its subsection; with
+    SplitStats, it also shows a stats line for the subsection.
+
+    Every tick is timed into `tick_stats`, per stage (the reader's own
+    stages too, when it is a MemoryReader), with ticks slower than
+    READ_INTERVAL_MS counted as overruns. `profiler` captures a cProfile of
+    the ticks on request (EW_PROFILE=<seconds> requests one at startup).
+    """
+    def __init__(self, reader: Optional[MemoryReader] = None,
+                 recorder: Optional[SnapshotRecorder] = None,
+                 history: Optional["SplitHistory"] = None,
+                 stats: Optional["SplitStats"] = None) -> None:
+        if reader is None:
+            if SAMPLER_ADDRESS:
+                from sampler_daemon import RemoteMemoryReader
+
+                reader = RemoteMemoryReader(SAMPLER_ADDRESS)
+            else:
+                reader = MemoryReader()
+        self.reader = reader
         self.state = TimerState()
+        self.info: Optional[DisplayInfo] = None
+        if recorder is None and RECORD_DIR:
+            recorder = open_session_recorder(RECORD_DIR)
+        self.recorder = recorder
+        self.history = history
+        self.stats = stats
+        self.tick_stats = TickStats(READ_INTERVAL_MS)
+        if isinstance(reader, MemoryReader):
+            reader.timings = self.tick_stats
+        self.profiler = TickProfiler("tick", PROFILE_DIR)
+        self.profiler.request(profile_seconds_from_env())
+
+        self.mode = MODE_ACTIVE if reader.power_save else MODE_REMOTE
+        self.igt_moved_at = time.monotonic()
+        self.last_tick_at = 0.0
+        self.last_igt: Optional[int] = None
+        self.last_chapter: Optional[int] = None
+        self.last_subB = ""
+
+    @property
+    def poll_interval_ms(self) -> int:
+        """Effective poll period: the fastest field's period, or the power-save heartbeat."""
+        return IDLE_INTERVAL_MS if self.mode == MODE_IDLE else self.reader.min_period_ms
+
+    def next_poll_delay(self) -> float:
+        """Seconds until the next tick should run."""
+        if self.mode == MODE_IDLE:
+            return self.last_tick_at + IDLE_INTERVAL_MS / 1000 - time.monotonic()
+        return self.reader.next_due() - time.monotonic()
+
+    def sample(self):
+        """Read the next snapshot, switching between active and power save as needed."""
+        now = self.last_tick_at = time.monotonic()
+        if self.mode == MODE_REMOTE:
+            return self.reader.read_snapshot()
+        if self.mode != MODE_IDLE:
+            snap = self.reader.read_snapshot()
+        else:
+            snap = self.reader.read_snapshot(light=True)
+            if (snap.igt_seconds != self.last_igt or snap.chapter_val != self.last_chapter
+                    or snap.subB_name != self.last_subB):
+                self.mode = MODE_ACTIVE
+                seen = snap.changed
+                snap = self.reader.read_snapshot()
+                snap.changed |= seen  # keep what the light read already saw change
+
+        if not snap.attached:
+            # Nothing to sample; the process watcher does the waiting.
+            self.mode = MODE_IDLE
+            self.igt_moved_at = now
+        elif snap.igt_seconds is not None and snap.igt_seconds == self.last_igt \
+                and snap.chapter_val == self.last_chapter and snap.subB_name == self.last_subB:
+            if now - self.igt_moved_at >= IDLE_AFTER_MS / 1000:
+                self.mode = MODE_IDLE
+        else:
+            self.igt_moved_at = now
+            self.mode = MODE_ACTIVE
+        self.last_igt = snap.igt_seconds
+        self.last_chapter = snap.chapter_val
+        self.last_subB = snap.subB_name
+        return snap
 
     def tick(self) -> DisplayInfo:
-        snap = self.reader.read_snapshot()
-        self.state, info = update_timer_state(self.state, snap)
-        return info
+        self.profiler.step()
+        t0 = time.perf_counter_ns()
+        snap = self.sample()
+        t = self._lap("sample", t0)
+        if self.recorder is not None:
+            self.recorder.write(snap)
+            t = self._lap("record", t)
+        s = self.state
+        closed, restarts, name, chapter = s.splits_closed, s.restarts, s.current_sub_name, s.current_chapter
+        history, stats = self.history, self.stats
+        self.state, self.info = update_timer_state(
+            s, snap, self.info, status_text(self.mode, self.poll_interval_ms),
+            history.best if history is not None else None,
+            stats.text if stats is not None else None,
+        )
+        t = self._lap("update", t)
+        segment = closed_segment(s, closed, restarts)
+        if stats is not None and segment:
+            stats.add(chapter, name, s.last_sub_duration_ms)
+        if history is not None:
+            # The segment closed belongs to the chapter it ran in, which is
+            # also the attempt it ends (if the chapter changed on this tick).
+            if segment:
+                history.add_segment(chapter, name, s.last_sub_index, s.last_sub_duration_ms)
+            if s.restarts != restarts:
+                history.end_attempt()  # quickload back to an earlier segment: abandoned
+            elif s.current_chapter != chapter:
+                history.chapter_changed(s.current_chapter)
+        if history is not None or stats is not None:
+            t = self._lap("history", t)
+        self.tick_stats.tick_done(t - t0)
+        return self.info
+
+    def _lap(self, stage: str, t: int) -> int:
+        now = time.perf_counter_ns()
+        self.tick_stats.add(stage, now - t)
+        return now
+
+    def close(self) -> None:
+        self.profiler.stop()  # write out a capture still running
+        self.reader.close()
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        if self.history is not None:
+            self.history.close()
+            self.history = None
+        if self.stats is not None:
+            self.stats.close()
+            self.stats = None
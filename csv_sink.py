@@ -0,0 +1,151 @@
+# csv_sink.py
+
+import csv
+import os
+import queue
+import threading
+import time
+from typing import Optional
+
+ROTATE_MODES = ("none", "session", "size")
+
+_STOP = object()
+
+
+class CsvSink:
+    """
+    Appends CSV rows from a background thread, so a slow or stalled disk
+    never holds up the caller: write() only enqueues.
+
+    Rows are written in batches and flushed once `flush_rows` are pending or
+    `flush_interval` seconds have passed since the first unflushed row,
+    optionally followed by an fsync. close() drains everything queued before
+    returning, so it is safe to call from a signal handler on shutdown.
+
+    Rotation:
+      none     append to `path` forever (the old behaviour)
+      session  a new file per run: <stem>-YYYYmmdd-HHMMSS<ext>
+      size     append to `path`; once it reaches max_bytes continue in
+               <stem>.1<ext>, <stem>.2<ext>, ...
+    Every new file starts with the header row.
+    """
+    def __init__(self, path: str, header: list, rotate: str = "none", max_bytes: int = 0,
+                 flush_interval: float = 1.0, flush_rows: int = 64, fsync: bool = False) -> None:
+        if rotate not in ROTATE_MODES:
+            raise ValueError(f"rotate must be one of {ROTATE_MODES}, not {rotate!r}")
+        if rotate == "size" and max_bytes <= 0:
+            raise ValueError("rotate='size' needs max_bytes > 0")
+        self.header = header
+        self.rotate = rotate
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.flush_rows = max(1, flush_rows)
+        self.fsync = fsync
+        self.rows_written = 0
+        self.errors = 0
+
+        stem, ext = os.path.splitext(path)
+        self._stem, self._ext = stem, ext or ".csv"
+        if rotate == "session":
+            path = f"{stem}-{time.strftime('%Y%m%d-%H%M%S')}{self._ext}"
+        self._part = 0
+        if rotate == "size" and os.path.exists(path) and os.path.getsize(path) >= max_bytes:
+            path = self._next_size_part()  # resume in the first part that isn't full yet
+        self.path = path
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._file = None
+        self._writer = None
+        self._open(path)  # on the caller's thread, so a bad path fails loudly up front
+        self._thread = threading.Thread(target=self._run, name="csv-sink", daemon=True)
+        self._thread.start()
+
+    def write(self, row: list) -> None:
+        """Queue one row; never blocks on the disk."""
+        self._queue.put(row)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Write out everything queued, flush (and fsync) and close the file."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    # --------------------- writer thread ---------------------
+    def _open(self, path: str) -> None:
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        self._file = open(path, "a", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self.path = path
+        if not size:
+            size = self._writer.writerow(self.header)
+        self._size = size  # characters written so far (bytes, for ASCII rows)
+
+    def _next_size_part(self) -> str:
+        while True:
+            self._part += 1
+            path = f"{self._stem}.{self._part}{self._ext}"
+            if not os.path.exists(path) or os.path.getsize(path) < self.max_bytes:
+                return path
+
+    def _flush(self) -> None:
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def _write_rows(self, rows: list) -> None:
+        if self.rotate != "size":
+            self._writer.writerows(rows)
+            return
+        for row in rows:
+            self._size += self._writer.writerow(row)
+            if self._size >= self.max_bytes:
+                self._flush()
+                self._file.close()
+                self._open(self._next_size_part())
+
+    def _run(self) -> None:
+        pending = 0
+        deadline = None
+        stopping = False
+        while not stopping:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            # Take whatever else is already queued as part of the same batch.
+            batch = []
+            while item is not None:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            try:
+                if batch:
+                    self._write_rows(batch)
+                    self.rows_written += len(batch)
+                    pending += len(batch)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+                if pending and (stopping or pending >= self.flush_rows or time.monotonic() >= deadline):
+                    self._flush()
+                    pending = 0
+                    deadline = None
+            except OSError as e:
+                self.errors += 1
+                print(f"[!] CSV write failed ({self.path}): {e}")
+                pending = 0
+                deadline = None
+
+        try:
+            self._file.close()
+        except OSError:
+            pass
@@ -1,18 +1,21 @@
 # evil_within_subsections_logger_simple.py
-# Requires: pip install pymem psutil
+# Requires: pip install psutil (+ pymem on Windows)
 
-import argparse
-import csv
 import os
-import signal
+import struct
 import sys
 import time
 from datetime import datetime
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Optional, Tuple
 from datetime import datetime, UTC
 
-import psutil
-import pymem
+from memory_backend import BACKENDS, MemoryBackend, MemoryReadError, RegionIndex, open_backend
+
+# The reading helpers below are shared with the timer (memory_reader.py);
+# what only the logger's CLI needs is imported in main().
+if TYPE_CHECKING:
+    from csv_sink import CsvSink
+    from sampler_daemon import RemoteMemoryReader
 
 
 PROCESS_NAME = "EVILWithin.exe"
@@ -26,87 +29,112 @@ OFFSETS = {
 }
 
 MAX_STR_LEN = 512
+CHAPTER_MAX = 64  # anything above is not a chapter number (e.g. the low half of a pointer)
+PAGE_SIZE = 0x1000  # reads never straddle a page unless a string does
 
 
 # --------------------- low-level utils ---------------------
-def find_process(name: str):
-    for proc in psutil.process_iter(["pid", "name"]):
-        try:
-            if proc.info["name"] and proc.info["name"].lower() == name.lower():
-                return proc.info["pid"]
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
-    return None
+_I32 = struct.Struct("<i")
+_I64 = struct.Struct("<q")
+
+
+def read_i32(mem: MemoryBackend, addr: int) -> int:
+    return _I32.unpack_from(mem.read(addr, 4))[0]
 
 
-def get_module_base(pm: pymem.Pymem, module_name: str) -> int:
-    mod = pymem.process.module_from_name(pm.process_handle, module_name)
-    return mod.lpBaseOfDll
+def read_i64(mem: MemoryBackend, addr: int) -> int:
+    return _I64.unpack_from(mem.read(addr, 8))[0]
 
 
-def read_ptr(pm: pymem.Pymem, addr: int) -> int:
+def try_read(mem: MemoryBackend, addr: int, n: int):
+    """mem.read(addr, n), or None if it can't be read. Never raises."""
     try:
-        return pm.read_longlong(addr)
+        return mem.read(addr, n)
     except Exception:
-        try:
-            return pm.read_int(addr)
-        except Exception:
-            return 0
+        return None
+
 
+def read_ptr(mem: MemoryBackend, addr: int) -> int:
+    data = try_read(mem, addr, 8)
+    if data is not None:
+        return _I64.unpack_from(data)[0]
+    data = try_read(mem, addr, 4)
+    return _I32.unpack_from(data)[0] if data is not None else 0
 
-def read_int_auto(pm: pymem.Pymem, addr_candidate: int) -> int:
+
+def read_int_auto(mem: MemoryBackend, addr_candidate: int) -> int:
     # direct
-    try:
-        v = pm.read_int(addr_candidate)
+    data = try_read(mem, addr_candidate, 4)
+    if data is not None:
+        v = _I32.unpack_from(data)[0]
         if v not in (0, -1):
             return v
-    except Exception:
-        pass
     # pointer-to-int
-    try:
-        p = read_ptr(pm, addr_candidate)
-        if p:
-            return pm.read_int(p)
-    except Exception:
-        pass
+    p = read_ptr(mem, addr_candidate)
+    if p:
+        data = try_read(mem, p, 4)
+        if data is not None:
+            return _I32.unpack_from(data)[0]
     return -1
 
 
-def read_c_string(pm: pymem.Pymem, addr: int, max_len: int = MAX_STR_LEN) -> str:
-    if not addr:
-        return ""
+def _read_terminated(mem: MemoryBackend, addr: int, max_bytes: int, term: bytes) -> Optional[bytes]:
+    """
+    Read raw bytes at addr up to (not including) the terminator `term`, which
+    must start at a multiple of len(term). Each read stops at the end of the
+    current page, so a string costs one read, two if it crosses a page, and a
+    failed read only ever means that page is unreadable.
+    Returns b"" if memory runs out before a terminator (like a per-byte read
+    would), or the first max_bytes bytes if no terminator is found; None if
+    not even the first page is readable.
+    """
+    step = len(term)
+    raw = bytearray()
+    while len(raw) < max_bytes:
+        cur = addr + len(raw)
+        want = min(max_bytes - len(raw), PAGE_SIZE - (cur % PAGE_SIZE))
+        if want < step:
+            # Wide char split by a page boundary: read across it.
+            want = step
+        chunk = try_read(mem, cur, want)
+        if chunk is None:
+            return None if not raw else b""
+        chunk = bytes(chunk)
+        if not chunk:
+            return b""
+        pos = chunk.find(term)
+        while pos != -1 and pos % step:
+            pos = chunk.find(term, pos + 1)
+        if pos != -1:
+            raw += chunk[:pos]
+            return bytes(raw)
+        raw += chunk[: len(chunk) - len(chunk) % step]
+    return bytes(raw)
+
+
+def _decode_c(raw: bytes) -> str:
     try:
-        raw = bytearray()
-        for i in range(max_len):
-            b = pm.read_bytes(addr + i, 1)
-            if not b or b == b"\x00":
-                break
-            raw += b
-        if not raw:
-            return ""
-        try:
-            return raw.decode("utf-8")
-        except UnicodeDecodeError:
-            return raw.decode("latin-1", errors="replace")
-    except Exception:
-        return ""
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return raw.decode("latin-1", errors="replace")
+
 
+def _decode_w(raw: bytes) -> str:
+    return raw.decode("utf-16-le", errors="replace")
 
-def read_w_string(pm: pymem.Pymem, addr: int, max_len: int = MAX_STR_LEN) -> str:
+
+def read_c_string(mem: MemoryBackend, addr: int, max_len: int = MAX_STR_LEN) -> str:
     if not addr:
         return ""
-    try:
-        raw = bytearray()
-        for i in range(max_len):
-            two = pm.read_bytes(addr + i * 2, 2)
-            if not two or two == b"\x00\x00":
-                break
-            raw += two
-        if not raw:
-            return ""
-        return raw.decode("utf-16-le", errors="replace")
-    except Exception:
+    raw = _read_terminated(mem, addr, max_len, b"\x00")
+    return _decode_c(raw) if raw else ""
+
+
+def read_w_string(mem: MemoryBackend, addr: int, max_len: int = MAX_STR_LEN) -> str:
+    if not addr:
         return ""
+    raw = _read_terminated(mem, addr, max_len * 2, b"\x00\x00")
+    return _decode_w(raw) if raw else ""
 
 
 # --------------------- fast string field (caches layout) ---------------------
@@ -116,110 +144,293 @@ class StringField:
       - pointer to char*/wchar*
       - inline char[]/wchar[]
     Once a working mode is discovered, it’s cached.
+
+    The last raw bytes and their decoded str are kept too: while the bytes in
+    memory still match (compared in place, terminator included) read()
+    returns the same str object without copying or decoding anything.
+
+    read() never raises. When it finds nothing and some layout pointed at
+    unreadable memory (a dangling pointer, e.g. while loading), it sets
+    `error`, which tells an unreadable field from an empty one.
     """
-    def __init__(self, pm: pymem.Pymem, addr_provider, name: str):
-        self.pm = pm
+    def __init__(self, mem: MemoryBackend, addr_provider, name: str):
+        self.mem = mem
         self.addr_provider = addr_provider
         self.name = name
         self.mode: Optional[Tuple[str, str]] = None  # ("ptr"|"inline", "c"|"w")
-
-    def _try_mode(self, base_addr: int, mode: Tuple[str, str]) -> str:
+        self.last_raw = b""
+        self.last_value = ""
+        self.error: Optional[Exception] = None
+
+    def _try_mode(self, mem: MemoryBackend, base_addr: int, mode: Tuple[str, str],
+                  target: Optional[int] = None) -> Optional[str]:
+        """
+        The string in this layout, "" if there is none, None if its memory is
+        unreadable. `target`: the pointer at base_addr, if already read.
+        """
         kind, enc = mode
         addr = base_addr
         if kind == "ptr":
-            addr = read_ptr(self.pm, base_addr)
+            addr = target if target is not None else read_ptr(mem, base_addr)
         if not addr:
             return ""
-        return read_c_string(self.pm, addr) if enc == "c" else read_w_string(self.pm, addr)
 
-    def read(self) -> str:
+        term = b"\x00" if enc == "c" else b"\x00\x00"
+        last = self.last_raw
+        if last and mode == self.mode:
+            # Same bytes + terminator as last time? Then it's the same string.
+            # (None: e.g. the longer read crosses into an unreadable page.)
+            view = try_read(mem, addr, len(last) + len(term))
+            if view is not None and view[:len(last)] == last and view[len(last):] == term:
+                return self.last_value
+
+        if enc == "c":
+            raw = _read_terminated(mem, addr, MAX_STR_LEN, term)
+            value = _decode_c(raw) if raw else ""
+        else:
+            raw = _read_terminated(mem, addr, MAX_STR_LEN * 2, term)
+            # A zero low byte is where a C string ended (the game writes one
+            # NUL over a longer name): what follows is that name's leftovers,
+            # not UTF-16 text. (It costs the U+xx00 characters, which names
+            # don't use.)
+            value = _decode_w(raw) if raw and 0 not in raw[::2] else ""
+        if raw is None:
+            return None
+        if value:
+            self.last_raw = raw
+            self.last_value = value
+        return value
+
+    def read(self, mem: Optional[MemoryBackend] = None) -> str:
+        """Read via `mem` (e.g. a TickBuffer) if given, else from the field's own backend."""
+        if mem is None:
+            mem = self.mem
+        self.error = None
         base = self.addr_provider()
         if not base:
             return ""
+        unreadable = False
+        target = None  # both pointer layouts follow the same pointer: read it once
         if self.mode:
-            s = self._try_mode(base, self.mode)
+            if self.mode[0] == "ptr":
+                target = read_ptr(mem, base)
+            s = self._try_mode(mem, base, self.mode, target)
             if s:
                 return s
+            unreadable = s is None
             self.mode = None  # fall back to discovery
 
         for mode in (("ptr", "c"), ("ptr", "w"), ("inline", "c"), ("inline", "w")):
-            s = self._try_mode(base, mode)
+            if mode[0] == "ptr" and target is None:
+                target = read_ptr(mem, base)
+            s = self._try_mode(mem, base, mode, target)
             if s:
                 self.mode = mode
                 return s
+            unreadable = unreadable or s is None
+        if unreadable:
+            self.error = MemoryReadError(f"no readable {self.name} string at or behind 0x{base:X}")
         return ""
 
 
-# --------------------- CSV ---------------------
-def open_csv(path: str):
-    new = not os.path.exists(path)
-    f = open(path, "a", newline="", encoding="utf-8")
-    w = csv.writer(f)
-    if new:
-        w.writerow(["timestamp_iso", "chapter", "map_name", "subsection", "source"])
-    return f, w
+# --------------------- fast scalar field (caches layout) ---------------------
+def chapter_plausible(v: int) -> bool:
+    return -1 <= v <= CHAPTER_MAX
 
 
-# --------------------- main ---------------------
-def main():
-    ap = argparse.ArgumentParser(description="Log Evil Within subsections (simple A-on-chapter, B-on-change).")
-    ap.add_argument("--interval", type=float, default=0.5, help="Polling interval in seconds (default 0.5).")
-    ap.add_argument("--csv", type=str, default="evil_within_chapter_log.csv", help="Output CSV path.")
-    ap.add_argument("--debug", action="store_true", help="Print debug info each tick.")
-    args = ap.parse_args()
+class ScalarField:
+    """
+    Read an int that may be:
+      - stored at the address (direct), or
+      - behind a pointer stored there (ptr),
+    as 32 or 64 bits. Like StringField, the layout that works is discovered
+    once and cached (read_int_auto decides again on every call), so the
+    steady state is one read for a direct layout and two for a pointer one:
+    the pointer is read again every time, as the object it points to may
+    move. Discovery runs again when the cached layout can't be read or reads
+    a value that fails `plausible`. With more than one layout to choose
+    from, 0 and -1 are not taken as proof of a layout: if no layout reads
+    anything else, read() returns -1 (uncached), as read_int_auto does.
+
+    read() never raises: it returns None if no layout gives a plausible
+    value, and sets `error` if the address itself was unreadable.
+    """
+    MODES = (("direct", 4), ("ptr", 4), ("direct", 8), ("ptr", 8))  # discovery order
 
-    pid = find_process(PROCESS_NAME)
-    if pid is None:
-        print(f"[!] Could not find process '{PROCESS_NAME}'. Make sure the game is running.")
-        sys.exit(1)
+    def __init__(self, mem: MemoryBackend, addr_provider, name: str,
+                 plausible=lambda v: True, modes=MODES):
+        self.mem = mem
+        self.addr_provider = addr_provider
+        self.name = name
+        self.plausible = plausible
+        self.modes = modes
+        self.mode: Optional[Tuple[str, int]] = None  # ("direct"|"ptr", 4|8)
+        self.error: Optional[Exception] = None
 
-    print(f"[+] Found {PROCESS_NAME} (PID {pid})")
-    pm = pymem.Pymem()
-    pm.open_process_from_id(pid)
+    def _try_mode(self, mem: MemoryBackend, base_addr: int, mode: Tuple[str, int]) -> Optional[int]:
+        kind, width = mode
+        addr = base_addr
+        if kind == "ptr":
+            addr = read_ptr(mem, base_addr)
+            if addr <= 0:
+                return None
+        data = try_read(mem, addr, width)
+        if data is None:
+            return None
+        return (_I32 if width == 4 else _I64).unpack_from(data)[0]
+
+    def read(self, mem: Optional[MemoryBackend] = None) -> Optional[int]:
+        """Read via `mem` (e.g. a TickBuffer) if given, else from the field's own backend."""
+        if mem is None:
+            mem = self.mem
+        self.error = None
+        base = self.addr_provider()
+        if not base:
+            return None
+        if self.mode:
+            v = self._try_mode(mem, base, self.mode)
+            if v is not None and self.plausible(v):
+                return v
+            self.mode = None  # fall back to discovery
 
-    try:
-        base = get_module_base(pm, PROCESS_NAME)
-    except Exception as e:
-        print(f"[!] Failed to get module base for {PROCESS_NAME}: {e}")
-        sys.exit(1)
+        fallback = None
+        for mode in self.modes:
+            v = self._try_mode(mem, base, mode)
+            if v is None or not self.plausible(v):
+                continue
+            if v not in (0, -1) or len(self.modes) == 1:
+                self.mode = mode
+                return v
+            fallback = -1
+        if fallback is None and try_read(mem, base, 4) is None:
+            self.error = MemoryReadError(f"{self.name} unreadable at 0x{base:X}")
+        return fallback
 
-    print(f"[+] Module base: 0x{base:016X}")
-    print(f"[+] Logging to: {os.path.abspath(args.csv)}")
-    print("[i] Press Ctrl+C to stop.\n")
 
-    # Precompute addresses
-    chapter_addr = base + OFFSETS["chapter_rel"]
-    struct_ptr_rel = base + OFFSETS["struct_ptr_rel"]
-    subB_addr = base + OFFSETS["subB_abs"]
+# --------------------- per-tick reads ---------------------
+class TickBuffer:
+    """
+    Backend-like read surface for one tick.
+
+    With a RegionIndex, nothing outside the target's readable memory is
+    read at all: read() raises MemoryReadError without a backend call, as
+    a failed backend read would. With `probe` set (a breaker is probing a
+    field that kept failing) reads the index turns down are tried anyway,
+    so memory that came back is seen before the index catches up; one that
+    works tells the index (learn()).
+    """
+    def __init__(self, mem: MemoryBackend, index: Optional[RegionIndex] = None, probe: bool = False):
+        self.mem = mem
+        self.index = index
+        self.probe = probe
+
+    def read(self, addr: int, n: int):
+        index = self.index
+        if index is None:
+            return self.mem.read(addr, n)
+        known = index.contains(addr, n)
+        if not known and not self.probe:
+            raise MemoryReadError(f"Could not read {n} bytes at 0x{addr:X}")
+        try:
+            data = self.mem.read(addr, n)
+        except Exception:
+            if known:
+                index.discard(addr)  # the index had it as readable: it's out of date
+            raise
+        if not known:
+            index.learn(addr)
+        return data
 
-    # struct ptr provider (single-indirect is enough in practice; if needed, you can add double-indirect here)
-    def struct_ptr() -> int:
-        return read_ptr(pm, struct_ptr_rel)
 
-    # Fields
-    map_reader  = StringField(pm, lambda: (struct_ptr() + OFFSETS["map_name_off"]) if struct_ptr() else 0, "map")
-    subA_reader = StringField(pm, lambda: (struct_ptr() + OFFSETS["subA_off"])   if struct_ptr() else 0, "subA")
-    subB_reader = StringField(pm, lambda: subB_addr, "subB")
+# --------------------- CSV ---------------------
+CSV_HEADER = ["timestamp_iso", "chapter", "map_name", "subsection", "source"]
 
-    csv_file, writer = open_csv(args.csv)
 
-    # State
-    last_chapter = None
-    last_map = ""
-    last_logged_sub = None
-    seen_this_chapter = set()
+def open_csv(path: str, rotate: str = "none", max_bytes: int = 0,
+             flush_interval: float = 1.0, flush_rows: int = 64, fsync: bool = False) -> "CsvSink":
+    from csv_sink import CsvSink
 
-    def cleanup(*_):
-        try: csv_file.close()
-        except Exception: pass
-        print("\n[+] Stopped. CSV saved.")
-        sys.exit(0)
+    return CsvSink(path, CSV_HEADER, rotate=rotate, max_bytes=max_bytes,
+                   flush_interval=flush_interval, flush_rows=flush_rows, fsync=fsync)
 
-    signal.signal(signal.SIGINT, cleanup)
-    if hasattr(signal, "SIGTERM"):
-        signal.signal(signal.SIGTERM, cleanup)
 
-    interval = max(0.05, float(args.interval))
+# --------------------- what gets logged ---------------------
+class SubsectionLog:
+    """
+    subA once at the start of each chapter, then every new subB (deduped
+    within the chapter), to the CSV sink and the console. Shared by the
+    direct-read loop and the sampler-daemon loop.
+    """
+    def __init__(self, sink: "CsvSink", debug: bool = False) -> None:
+        self.sink = sink
+        self.debug = debug
+        self.last_chapter = None
+        self.last_map = ""
+        self.last_logged_sub = None
+        self.seen_this_chapter = set()
+
+    def new_chapter(self, chapter) -> bool:
+        """True (with the per-chapter state reset) if `chapter` starts a new chapter."""
+        if chapter in (-1, 0, None) or chapter == self.last_chapter:
+            return False
+        print(f"[•] Chapter changed -> {chapter}")
+        self.last_chapter = chapter
+        self.seen_this_chapter.clear()
+        self.last_logged_sub = None
+        return True
+
+    def map_name(self, name: str) -> None:
+        if name and name != self.last_map:
+            self.last_map = name
+            print(f"[•] Map: {name}")
+
+    def subA(self, chapter, subA: str) -> None:
+        if subA:
+            self._log(chapter, subA, "A")
+        elif self.debug:
+            print("[dbg] subA empty at chapter start")
+
+    def subB(self, chapter, subB: str) -> None:
+        if self.debug:
+            print(f"[dbg] chap={chapter} subB='{subB}' map='{self.last_map}'")
+        # First B seen or any subsequent change → log (dedupe within chapter)
+        if subB and ((not self.seen_this_chapter)
+                     or (subB != self.last_logged_sub and subB not in self.seen_this_chapter)):
+            self._log(chapter, subB, "B")
+
+    def _log(self, chapter, sub: str, source: str) -> None:
+        ts = datetime.now(UTC).isoformat(timespec="seconds")
+        self.sink.write([ts, chapter, self.last_map, sub, source])
+        self.seen_this_chapter.add(sub)
+        self.last_logged_sub = sub
+        print(f"[+] {ts} | Chapter {chapter} | {sub} ({source})")
+
+
+def run_direct(mem: MemoryBackend, base: int, log: SubsectionLog, interval: float,
+               offsets: dict = OFFSETS) -> None:
+    """Poll the game ourselves every `interval` seconds."""
+    # Precompute addresses
+    chapter_addr = base + offsets["chapter_rel"]
+    struct_ptr_rel = base + offsets["struct_ptr_rel"]
+    subB_addr = base + offsets["subB_abs"]
+
+    # struct ptr, resolved once per chapter change (single-indirect is enough in practice;
+    # if needed, you can add double-indirect here)
+    struct_base = 0
+
+    def struct_field(off: int):
+        return lambda: (struct_base + off) if struct_base else 0
+
+    # Fields
+    chapter_field = ScalarField(mem, lambda: chapter_addr, "chapter", chapter_plausible)
+    map_reader  = StringField(mem, struct_field(offsets["map_name_off"]), "map")
+    subA_reader = StringField(mem, struct_field(offsets["subA_off"]), "subA")
+    subB_reader = StringField(mem, lambda: subB_addr, "subB")
+
+    # Bad pointers (while loading) are turned down without a read
+    index = RegionIndex(mem) if hasattr(mem, "regions") else None
+
+    interval = max(0.05, float(interval))
     next_tick = time.monotonic()
 
     while True:
@@ -228,49 +439,120 @@ def main():
             time.sleep(max(0.0, next_tick - now))
         next_tick += interval
 
+        buf = TickBuffer(mem, index=index)
+
         # Read chapter
-        chapter = read_int_auto(pm, chapter_addr)
+        chapter = chapter_field.read(buf)
 
         # Chapter change → log A once (initial), refresh map
-        if chapter not in (-1, 0) and chapter != last_chapter:
-            print(f"[•] Chapter changed -> {chapter}")
-            last_chapter = chapter
-            seen_this_chapter.clear()
-            last_logged_sub = None
-
-            # Map refresh (best-effort)
-            new_map = map_reader.read()
-            if new_map and new_map != last_map:
-                last_map = new_map
-                print(f"[•] Map: {last_map}")
-
-            # Log A (initial subsection) if available
-            subA = subA_reader.read()
-            if subA:
-                ts = datetime.now(UTC).isoformat(timespec="seconds")
-                writer.writerow([ts, chapter, last_map, subA, "A"])
-                csv_file.flush()
-                seen_this_chapter.add(subA)
-                last_logged_sub = subA
-                print(f"[+] {ts} | Chapter {chapter} | {subA} (A)")
-            elif args.debug:
-                print("[dbg] subA empty at chapter start")
+        if log.new_chapter(chapter):
+            # map name and subA sit in the same struct: resolve it once for both
+            struct_base = read_ptr(buf, struct_ptr_rel)
+            log.map_name(map_reader.read(buf))  # best-effort
+            log.subA(chapter, subA_reader.read(buf))
 
         # In-chapter polling of B only (it’s empty on very first load until the first quicksave)
-        subB = subB_reader.read()
+        log.subB(chapter, subB_reader.read(buf))
 
-        if args.debug:
-            print(f"[dbg] chap={chapter} subB='{subB}' map='{last_map}'")
 
-        # First B seen or any subsequent change → log (dedupe within chapter)
-        if subB:
-            if (not seen_this_chapter) or (subB != last_logged_sub and subB not in seen_this_chapter):
-                ts = datetime.now(UTC).isoformat(timespec="seconds")
-                writer.writerow([ts, chapter, last_map, subB, "B"])
-                csv_file.flush()
-                seen_this_chapter.add(subB)
-                last_logged_sub = subB
-                print(f"[+] {ts} | Chapter {chapter} | {subB} (B)")
+def run_from_sampler(reader: "RemoteMemoryReader", log: SubsectionLog) -> None:
+    """Log from the snapshots a sampler_daemon.py publishes, every one of them."""
+    while True:
+        snap = reader.read_snapshot()
+        if snap.changed and snap.attached:
+            chapter = snap.chapter_val
+            if log.new_chapter(chapter):
+                log.map_name(snap.map_name)
+                log.subA(chapter, snap.subA_name)
+            log.subB(chapter, snap.subB_name)
+        time.sleep(max(0.0, reader.next_due() - time.monotonic()))
+
+
+# --------------------- main ---------------------
+def main(mem: Optional[MemoryBackend] = None, argv=None):
+    import argparse
+    import signal
+
+    from csv_sink import ROTATE_MODES
+    from memory_reader import default_offsets
+    from sampler_daemon import RemoteMemoryReader
+    from signatures import resolve_offsets
+
+    ap = argparse.ArgumentParser(description="Log Evil Within subsections (simple A-on-chapter, B-on-change).")
+    ap.add_argument("--interval", type=float, default=0.5, help="Polling interval in seconds (default 0.5).")
+    ap.add_argument("--csv", type=str, default="evil_within_chapter_log.csv", help="Output CSV path.")
+    ap.add_argument("--debug", action="store_true", help="Print debug info each tick.")
+    ap.add_argument("--backend", choices=BACKENDS, default="auto",
+                    help="Memory backend: pymem (Windows), proc (Linux /proc/<pid>/mem), image (dump file).")
+    ap.add_argument("--pid", type=int, default=None, help="Attach to this PID instead of searching by name.")
+    ap.add_argument("--image", type=str, default=None, help="Memory image file for --backend image.")
+    ap.add_argument("--sampler", nargs="?", const="auto", default=None, metavar="ADDRESS",
+                    help="Take snapshots from a running sampler_daemon.py instead of reading the game "
+                         "(optionally at ADDRESS: socket path or host:port).")
+    ap.add_argument("--rotate", choices=ROTATE_MODES, default="none",
+                    help="CSV rotation: none (append to --csv), session (new file per run), size (see --max-bytes).")
+    ap.add_argument("--max-bytes", type=int, default=10 * 1024 * 1024, help="File size for --rotate size.")
+    ap.add_argument("--flush-interval", type=float, default=1.0,
+                    help="Flush buffered rows at most this many seconds after they are logged (default 1.0).")
+    ap.add_argument("--flush-rows", type=int, default=64, help="Flush once this many rows are buffered.")
+    ap.add_argument("--fsync", action="store_true", help="fsync the CSV after every flush.")
+    args = ap.parse_args(argv)
+
+    reader = None
+    if args.sampler:
+        reader = RemoteMemoryReader(args.sampler)
+        source = reader
+        print(f"[+] Subscribing to sampler at {reader.sockaddr}")
+    else:
+        if mem is None:
+            try:
+                mem = open_backend(PROCESS_NAME, args.backend, pid=args.pid, image=args.image)
+            except Exception as e:
+                print(f"[!] Could not open {PROCESS_NAME}: {e}")
+                sys.exit(1)
+            if mem is None:
+                print(f"[!] Could not find process '{PROCESS_NAME}'. Make sure the game is running.")
+                sys.exit(1)
+
+        print(f"[+] Opened {PROCESS_NAME} ({type(mem).__name__})")
+
+        try:
+            base = mem.module_base(PROCESS_NAME)
+        except Exception as e:
+            print(f"[!] Failed to get module base for {PROCESS_NAME}: {e}")
+            sys.exit(1)
+
+        print(f"[+] Module base: 0x{base:016X}")
+        # The timer's full set, so a signature for an offset only the timer
+        # uses (e.g. IGT's) isn't reported as unknown; run_direct ignores those.
+        offsets = resolve_offsets(mem, base, default_offsets())
+        source = mem
+
+    try:
+        sink = open_csv(args.csv, args.rotate, args.max_bytes, args.flush_interval, args.flush_rows, args.fsync)
+    except (OSError, ValueError) as e:
+        print(f"[!] Could not open CSV {args.csv}: {e}")
+        source.close()
+        sys.exit(1)
+    print(f"[+] Logging to: {os.path.abspath(sink.path)}")
+    print("[i] Press Ctrl+C to stop.\n")
+
+    def cleanup(*_):
+        try: sink.close()  # drains queued rows
+        except Exception: pass
+        source.close()
+        print(f"\n[+] Stopped. {sink.rows_written} rows saved to {sink.path}.")
+        sys.exit(0)
+
+    signal.signal(signal.SIGINT, cleanup)
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, cleanup)
+
+    log = SubsectionLog(sink, args.debug)
+    if reader is not None:
+        run_from_sampler(reader, log)
+    else:
+        run_direct(mem, base, log, args.interval, offsets)
 
 
 if __name__ == "__main__":
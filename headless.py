@@ -0,0 +1,77 @@
+# headless.py
+#
+# The timer without a window (main.py --headless): prints DisplayInfo changes
+# to stdout or a file, one line per change, as plain text or JSON lines.
+# Never imports tkinter.
+
+import json
+import signal
+import threading
+import time
+from typing import Optional, TextIO
+
+from config import RENDER_INTERVAL_MS
+from model import TEXT_FIELDS
+from sampler import Sampler
+
+FORMATS = ("text", "jsonl")
+
+
+class HeadlessPrinter:
+    """
+    Polls sampler.latest every RENDER_INTERVAL_MS, like TimerWindow does, and
+    writes the fields that changed since the last line (all of them on the
+    first). `fields` restricts which DisplayInfo *_text fields are watched.
+    """
+    def __init__(self, sampler: Sampler, out: TextIO, fmt: str = "text",
+                 fields: Optional[list] = None) -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"format must be one of {FORMATS}, not {fmt!r}")
+        unknown = set(fields or ()) - set(TEXT_FIELDS)
+        if unknown:
+            raise ValueError(f"unknown field(s) {', '.join(sorted(unknown))} (choose from {', '.join(TEXT_FIELDS)})")
+        self.sampler = sampler
+        self.out = out
+        self.fmt = fmt
+        self.fields = tuple(fields) if fields else TEXT_FIELDS
+        self.shown: dict[str, str] = {}
+        self.lines = 0
+        self._stop = threading.Event()
+
+    def stop(self, *_) -> None:
+        self._stop.set()
+
+    def poll(self) -> None:
+        info = self.sampler.latest
+        if info is None:
+            return
+        delta = {}
+        for f in self.fields:
+            text = getattr(info, f)
+            if self.shown.get(f) != text:
+                delta[f] = text
+        if not delta:
+            return
+        self.shown.update(delta)
+        if self.fmt == "jsonl":
+            line = json.dumps({"t": round(time.time(), 3), **delta}, ensure_ascii=False)
+        else:
+            line = time.strftime("%H:%M:%S ") + " | ".join(f"{f}: {t}" for f, t in delta.items())
+        self.out.write(line + "\n")
+        self.out.flush()
+        self.lines += 1
+
+    def run(self) -> None:
+        """Sample and print until stop() (SIGINT / SIGTERM), then stop the sampler."""
+        signal.signal(signal.SIGINT, self.stop)
+        if hasattr(signal, "SIGTERM"):
+            signal.signal(signal.SIGTERM, self.stop)
+        self.sampler.start()
+        last = None
+        try:
+            while not self._stop.wait(RENDER_INTERVAL_MS / 1000):
+                if self.sampler.latest is not last:
+                    last = self.sampler.latest
+                    self.poll()
+        finally:
+            self.sampler.stop()
@@ -0,0 +1,244 @@
+# history.py
+#
+# Persistent split history (SQLite): one row per closed segment, plus
+# aggregates kept up to date as segments come in, so "best" lookups are a
+# dict get and never a query.
+#
+#   segments  every closed segment: session, chapter, subsection, index,
+#             duration, wall-clock end (indexed on chapter, subsection)
+#   bests     best duration and attempt count per (chapter, subsection)
+#   pbs       personal best per chapter: the fastest attempt that closed
+#             every subsection known for that chapter and ended with the
+#             chapter (dropped when a new subsection turns up)
+#
+# An attempt is the run of segments closed in one chapter between resets
+# (chapter change, or a quickload back to an earlier segment). Only one
+# ended by a chapter change can be a PB: not one abandoned by a quickload,
+# nor one cut off by close(). Sum of best per chapter is the sum of its
+# subsections' bests.
+#
+#   python history.py [split_history.db]     # per-chapter summary
+
+import argparse
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, UTC
+from typing import Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    id          INTEGER PRIMARY KEY,
+    session     TEXT    NOT NULL,
+    chapter     INTEGER,
+    subsection  TEXT    NOT NULL,
+    seg_index   INTEGER,
+    duration_ms INTEGER NOT NULL,
+    ended_at    TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segments_chapter_sub ON segments (chapter, subsection);
+CREATE TABLE IF NOT EXISTS bests (
+    chapter     INTEGER,
+    subsection  TEXT    NOT NULL,
+    best_ms     INTEGER NOT NULL,
+    attempts    INTEGER NOT NULL,
+    PRIMARY KEY (chapter, subsection)
+);
+CREATE TABLE IF NOT EXISTS pbs (
+    chapter     INTEGER PRIMARY KEY,
+    pb_ms       INTEGER NOT NULL,
+    segments    INTEGER NOT NULL,
+    session     TEXT    NOT NULL,
+    achieved_at TEXT    NOT NULL
+);
+"""
+
+_STOP = object()
+
+
+def _is_chapter(chapter: Optional[int]) -> bool:
+    return chapter not in (None, -1, 0)  # -1 / 0: unreadable (loading) or menus
+
+
+class SplitHistory:
+    """
+    add_segment() runs on the tick thread: it updates the in-memory
+    aggregates (best, sum of best, PB) in O(1) and queues the rows; a
+    writer thread commits them in batches (every `flush_interval` seconds
+    or `flush_rows` rows, and on close()).
+
+    `best` maps (chapter, subsection) -> best ms and can be handed to
+    update_timer_state() as-is.
+    """
+    def __init__(self, path: str, flush_interval: float = 2.0, flush_rows: int = 100) -> None:
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_rows = max(1, flush_rows)
+        self.session = time.strftime("%Y%m%d-%H%M%S")
+        self.segments_written = 0
+        self.errors = 0
+
+        self.best: dict[tuple, int] = {}
+        self.attempts: dict[tuple, int] = {}
+        self.sum_of_best: dict[Optional[int], int] = {}
+        self.known: dict[Optional[int], int] = {}   # chapter -> number of subsections seen
+        self.pb: dict[Optional[int], int] = {}
+        self._load()  # on the caller's thread, so a bad path fails loudly up front
+
+        self._attempt_chapter = None
+        self._attempt_subs: set = set()
+        self._attempt_ms = 0
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="split-history", daemon=True)
+        self._thread.start()
+
+    def _load(self) -> None:
+        con = sqlite3.connect(self.path)
+        try:
+            con.executescript(SCHEMA)
+            for chapter, sub, best_ms, attempts in con.execute(
+                    "SELECT chapter, subsection, best_ms, attempts FROM bests"):
+                self.best[(chapter, sub)] = best_ms
+                self.attempts[(chapter, sub)] = attempts
+                self.sum_of_best[chapter] = self.sum_of_best.get(chapter, 0) + best_ms
+                self.known[chapter] = self.known.get(chapter, 0) + 1
+            for chapter, pb_ms, segments in con.execute("SELECT chapter, pb_ms, segments FROM pbs"):
+                if segments >= self.known.get(chapter, 0):  # else it predates a subsection: no PB
+                    self.pb[chapter] = pb_ms
+        finally:
+            con.close()
+
+    # --------------------- tick thread ---------------------
+    def add_segment(self, chapter: Optional[int], subsection: str, seg_index: Optional[int],
+                    duration_ms: int) -> None:
+        now = datetime.now(UTC).isoformat(timespec="seconds")
+        self._queue.put(("segment", (self.session, chapter, subsection, seg_index, duration_ms, now)))
+
+        key = (chapter, subsection)
+        attempts = self.attempts.get(key, 0) + 1
+        self.attempts[key] = attempts
+        best = self.best.get(key)
+        if best is None:
+            self.known[chapter] = self.known.get(chapter, 0) + 1
+            self.sum_of_best[chapter] = self.sum_of_best.get(chapter, 0) + duration_ms
+            best = self.best[key] = duration_ms
+            if self.pb.pop(chapter, None) is not None:
+                self._queue.put(("pb_clear", (chapter,)))  # it didn't cover this subsection
+        elif duration_ms < best:
+            self.sum_of_best[chapter] -= best - duration_ms
+            best = self.best[key] = duration_ms
+        self._queue.put(("best", (chapter, subsection, best, attempts)))
+
+        if chapter != self._attempt_chapter:
+            self.end_attempt(chapter_done=_is_chapter(chapter) and _is_chapter(self._attempt_chapter))
+            self._attempt_chapter = chapter
+        self._attempt_subs.add(subsection)
+        self._attempt_ms += duration_ms
+
+    def chapter_changed(self, chapter: Optional[int]) -> None:
+        """The game is now in `chapter`: if that's another chapter, the attempt in progress is finished."""
+        if _is_chapter(chapter) and chapter != self._attempt_chapter:
+            self.end_attempt(chapter_done=True)
+
+    def end_attempt(self, chapter_done: bool = False) -> None:
+        """
+        Close the current attempt. If it ended with the chapter
+        (`chapter_done`) and covered every known subsection, it becomes the
+        chapter's PB when faster; otherwise (quickload, close()) it is dropped.
+        """
+        chapter = self._attempt_chapter
+        if chapter_done and self._attempt_subs and len(self._attempt_subs) >= self.known.get(chapter, 0):
+            pb = self.pb.get(chapter)
+            if pb is None or self._attempt_ms < pb:
+                self.pb[chapter] = self._attempt_ms
+                now = datetime.now(UTC).isoformat(timespec="seconds")
+                self._queue.put(("pb", (chapter, self._attempt_ms, len(self._attempt_subs), self.session, now)))
+        self._attempt_chapter = None
+        self._attempt_subs = set()
+        self._attempt_ms = 0
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Drop the attempt in progress (the chapter isn't over) and commit everything queued."""
+        if self._thread is None:
+            return
+        self.end_attempt()
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    # --------------------- writer thread ---------------------
+    def _commit(self, con: sqlite3.Connection, batch: list) -> None:
+        segments = [row for kind, row in batch if kind == "segment"]
+        bests = {row[:2]: row for kind, row in batch if kind == "best"}  # newest per key wins
+        pbs = {row[0]: (row if kind == "pb" else None) for kind, row in batch if kind in ("pb", "pb_clear")}
+        with con:
+            con.executemany(
+                "INSERT INTO segments (session, chapter, subsection, seg_index, duration_ms, ended_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)", segments)
+            con.executemany("INSERT OR REPLACE INTO bests VALUES (?, ?, ?, ?)", bests.values())
+            con.executemany("INSERT OR REPLACE INTO pbs VALUES (?, ?, ?, ?, ?)",
+                            [row for row in pbs.values() if row is not None])
+            con.executemany("DELETE FROM pbs WHERE chapter = ?",
+                            [(chapter,) for chapter, row in pbs.items() if row is None])
+        self.segments_written += len(segments)
+
+    def _run(self) -> None:
+        con = sqlite3.connect(self.path)
+        batch = []
+        deadline = None
+        stopping = False
+        while not stopping:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            while item is not None:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            if batch and deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+            if batch and (stopping or len(batch) >= self.flush_rows or time.monotonic() >= deadline):
+                try:
+                    self._commit(con, batch)
+                except sqlite3.Error as e:
+                    self.errors += 1
+                    print(f"[!] Split history write failed ({self.path}): {e}")
+                batch = []
+                deadline = None
+        con.close()
+
+
+def main() -> None:
+    from config import HISTORY_DB
+    from model import format_hhmmss_t
+
+    ap = argparse.ArgumentParser(description="Summarise the split history per chapter.")
+    ap.add_argument("path", nargs="?", default=HISTORY_DB or "split_history.db")
+    args = ap.parse_args()
+    if not os.path.exists(args.path):
+        print(f"[!] No history at {args.path}")
+        return
+
+    con = sqlite3.connect(args.path)
+    rows = con.execute(
+        "SELECT b.chapter, COUNT(*), SUM(b.attempts), SUM(b.best_ms), p.pb_ms FROM bests b "
+        "LEFT JOIN pbs p ON p.chapter = b.chapter GROUP BY b.chapter ORDER BY b.chapter").fetchall()
+    for chapter, subs, attempts, sob, pb in rows:
+        print(f"Chapter {chapter}: {subs} subsections, {attempts} segments, "
+              f"sum of best {format_hhmmss_t(sob)}, PB {format_hhmmss_t(pb)}")
+    con.close()
+
+
+if __name__ == "__main__":
+    main()
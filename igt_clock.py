@@ -0,0 +1,69 @@
+# igt_clock.py
+
+from typing import Optional
+
+_SECOND_NS = 1_000_000_000
+
+
+class IgtClock:
+    """
+    Sub-second IGT from a whole-second counter.
+
+    observe() is called with every IGT read and the monotonic ns it was read
+    at. When IGT steps by exactly +1, the second boundary happened between
+    the previous read and this one. While the game keeps running, boundaries
+    are exactly one second apart, so each new window is intersected with the
+    previous one shifted by a second and the estimate tightens well below
+    the IGT poll period. A window that doesn't overlap (pause, hitch) starts
+    a fresh estimate; any other jump (load, quickload) means the phase is
+    unknown until the next +1 step.
+
+    ms_at() interpolates from the estimated boundary, never past .999. Once
+    the window the next step was due in (hi_ns + 1 s) has passed without
+    it, IGT is stopped (pause, menu): ms_at() holds at the last value it
+    returned until IGT moves, rather than running on to .999 and reporting
+    time that never elapsed.
+    """
+    def __init__(self) -> None:
+        self.igt: Optional[int] = None
+        self.last_read_ns = 0
+        self.lo_ns = 0   # the current second began in [lo_ns, hi_ns]
+        self.hi_ns = 0
+        self.synced = False
+        self.shown: Optional[int] = None  # last ms_at() in this second
+
+    def reset(self) -> None:
+        self.igt = None
+        self.synced = False
+        self.shown = None
+
+    def observe(self, igt: Optional[int], now_ns: int) -> None:
+        if igt is None:
+            self.reset()
+            return
+        if self.igt is not None and igt == self.igt + 1:
+            lo, hi = self.last_read_ns, now_ns
+            if self.synced:
+                lo = max(lo, self.lo_ns + _SECOND_NS)
+                hi = min(hi, self.hi_ns + _SECOND_NS)
+                if lo > hi:  # inconsistent with the old phase: start over
+                    lo, hi = self.last_read_ns, now_ns
+            self.lo_ns, self.hi_ns = lo, hi
+            self.synced = True
+        elif igt != self.igt:
+            self.synced = False
+        if igt != self.igt:
+            self.shown = None
+        self.igt = igt
+        self.last_read_ns = now_ns
+
+    def ms_at(self, now_ns: int) -> Optional[int]:
+        if self.igt is None:
+            return None
+        if not self.synced:
+            return self.igt * 1000
+        if self.last_read_ns > self.hi_ns + _SECOND_NS and self.shown is not None:
+            return self.shown  # the next step is overdue: stopped, hold
+        frac = (now_ns - ((self.lo_ns + self.hi_ns) >> 1)) // 1_000_000
+        self.shown = self.igt * 1000 + min(max(frac, 0), 999)
+        return self.shown
@@ -1,11 +1,107 @@
 # main.py
+#
+#   python main.py                       # Tk window
+#   python main.py --headless            # DisplayInfo changes on stdout
+#   python main.py --headless --format jsonl --output run.jsonl --fields last_segment_text
+#
+# Modules are imported only for the mode and features in use: the headless
+# path never imports tkinter, and history / stats / overlay load on demand.
 
-from ui_tk import TimerWindow
+import argparse
+import sys
 
+from config import HISTORY_DB, OVERLAY_ENABLED, OVERLAY_HOST, OVERLAY_PORT, STATS_PATH, TICK_STATS_PATH
 
-def main() -> None:
-    win = TimerWindow()
-    win.run()
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="In-game time and split tracker for The Evil Within.")
+    ap.add_argument("--headless", action="store_true",
+                    help="No window: print display changes to stdout (or --output).")
+    ap.add_argument("--format", choices=("text", "jsonl"), default="text", help="Headless output format.")
+    ap.add_argument("--output", default=None, help="Headless: append to this file instead of stdout.")
+    ap.add_argument("--fields", default=None,
+                    help="Headless: comma-separated DisplayInfo fields to print (default: all).")
+    ap.add_argument("--history", default=HISTORY_DB,
+                    help=f"Split history database (default {HISTORY_DB}); '' to keep no history.")
+    ap.add_argument("--stats", default=STATS_PATH,
+                    help=f"Split stats file (default {STATS_PATH}); '' to keep no stats.")
+    ap.add_argument("--overlay", action="store_true", default=OVERLAY_ENABLED,
+                    help="Also serve a browser-source overlay for OBS (see overlay.html).")
+    ap.add_argument("--overlay-host", default=OVERLAY_HOST, help=f"Overlay address (default {OVERLAY_HOST}).")
+    ap.add_argument("--overlay-port", type=int, default=OVERLAY_PORT, help=f"Overlay port (default {OVERLAY_PORT}).")
+    ap.add_argument("--tick-stats", nargs="?", const=TICK_STATS_PATH, default=None, metavar="PATH",
+                    help=f"On exit, write per-stage tick timings to PATH (default {TICK_STATS_PATH}).")
+    args = ap.parse_args(argv)
+
+    from controller import TimerController
+    from sampler import Sampler
+
+    history = None
+    if args.history:
+        from history import SplitHistory
+
+        try:
+            history = SplitHistory(args.history)
+        except Exception as e:  # sqlite3.Error / OSError: run without history
+            print(f"[!] Could not open split history {args.history}: {e}")
+    stats = None
+    if args.stats:
+        from split_stats import SplitStats
+
+        try:
+            stats = SplitStats(args.stats)
+        except (OSError, ValueError, KeyError) as e:  # unreadable / corrupt file
+            print(f"[!] Could not load split stats {args.stats}: {e}")
+    sampler = Sampler(TimerController(history=history, stats=stats))
+
+    printer = None
+    out = None
+    if args.headless:
+        from headless import HeadlessPrinter
+
+        try:
+            out = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+            printer = HeadlessPrinter(sampler, out, args.format, args.fields.split(",") if args.fields else None)
+        except (OSError, ValueError) as e:
+            print(f"[!] {e}")
+            sampler.stop()  # closes history / stats
+            sys.exit(1)
+
+    overlay = None
+    if args.overlay:
+        from overlay_server import OverlayServer
+
+        try:
+            overlay = OverlayServer(sampler, args.overlay_host, args.overlay_port)
+        except OSError as e:
+            print(f"[!] Could not start the overlay server: {e}")
+        else:
+            overlay.start()
+            print(f"[+] Overlay at {overlay.url}")
+
+    try:
+        if printer is not None:
+            printer.run()
+            if args.tick_stats:
+                from tick_stats import dump_json
+
+                try:
+                    dump_json(args.tick_stats, tick=sampler.controller.tick_stats)
+                    print(f"[+] Tick stats written to {args.tick_stats}")
+                except OSError as e:
+                    print(f"[!] Could not write tick stats {args.tick_stats}: {e}")
+        else:
+            from ui_tk import TimerWindow
+
+            window = TimerWindow(sampler)
+            window.run()
+            if args.tick_stats:
+                window.dump_tick_stats(args.tick_stats)
+    finally:
+        if overlay is not None:
+            overlay.stop()
+        if out is not None and out is not sys.stdout:
+            out.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,492 @@
+# memory_backend.py
+#
+# Where process memory comes from. Everything above this layer only needs
+#   read(addr, n) -> bytes-like   (raises MemoryReadError if unreadable)
+#   module_base(name) -> int
+#   is_alive() -> bool
+#   close()
+# and, for the signature scanner (signatures.py) only,
+#   module_regions(name) -> [(start, end)]   readable spans of the module image
+#   module_path(name) -> str | None           the module's file on disk, if known
+# and, optionally, for RegionIndex (range checks before pointer reads)
+#   regions() -> [(start, end)]               readable spans of the whole process
+#   region_at(addr) -> (start, end) | None    the readable span holding addr
+#
+#   PymemBackend    Windows, via pymem (ReadProcessMemory)
+#   ProcMemBackend  Linux (game under Proton/Wine), os.pread on /proc/<pid>/mem
+#   ImageBackend    memory-mapped dump file, zero-copy reads for tests/benchmarks
+
+import mmap
+import math
+import os
+import struct
+import sys
+import time
+from bisect import bisect_right
+from typing import Iterable, Optional, Protocol
+
+
+class MemoryReadError(OSError):
+    pass
+
+
+class MemoryBackend(Protocol):
+    def read(self, addr: int, n: int) -> bytes: ...
+    def module_base(self, name: str) -> int: ...
+    def is_alive(self) -> bool: ...
+    def close(self) -> None: ...
+
+
+def find_pid(proc_name: str) -> Optional[int]:
+    import psutil
+
+    for proc in psutil.process_iter(["pid", "name"]):
+        try:
+            if proc.info["name"] and proc.info["name"].lower() == proc_name.lower():
+                return proc.info["pid"]
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return None
+
+
+def _add_span(spans: list, start: int, end: int) -> None:
+    """Append [start, end) to a sorted span list, merging it into the last span if they touch."""
+    if spans and spans[-1][1] == start:
+        spans[-1] = (spans[-1][0], end)
+    else:
+        spans.append((start, end))
+
+
+class RegionIndex:
+    """
+    The target's readable memory as sorted, merged [start, end) spans, so a
+    pointer can be range-checked with one bisect instead of a read that
+    raises. Built from mem.regions() on first use and kept up to date
+    lazily:
+      - a lookup that misses asks mem.region_at() for the span there (one
+        VirtualQueryEx) and adds it; backends without it (/proc maps) get a
+        full rebuild instead, at most once per `refresh_min_s`,
+      - discard(addr) drops the span holding an address whose read failed
+        after all (memory freed since the index was built),
+      - learn(addr) is for the opposite: a read the index turned down was
+        tried anyway (a breaker probe) and worked, so the index is behind
+        (memory mapped again after a loading screen).
+    """
+    def __init__(self, mem: MemoryBackend, refresh_min_s: float = 0.5) -> None:
+        self.mem = mem
+        self.refresh_min_s = refresh_min_s
+        self.point_query = getattr(mem, "region_at", None)
+        self.starts: list[int] = []
+        self.ends: list[int] = []
+        self.built_at = -math.inf
+        self.rebuilds = 0
+        self.queries = 0
+
+    def rebuild(self) -> None:
+        spans: list = []
+        for start, end in sorted(self.mem.regions()):
+            if spans and start <= spans[-1][1]:
+                spans[-1] = (spans[-1][0], max(spans[-1][1], end))
+            else:
+                spans.append((start, end))
+        self.starts = [a for a, _ in spans]
+        self.ends = [b for _, b in spans]
+        self.built_at = time.monotonic()
+        self.rebuilds += 1
+
+    def contains(self, addr: int, n: int) -> bool:
+        """True if [addr, addr + n) is readable as far as the index knows (after a refresh on a miss)."""
+        i = bisect_right(self.starts, addr) - 1
+        if i >= 0 and addr + n <= self.ends[i]:
+            return True
+        if addr <= 0:
+            return False
+        if self.point_query is not None:
+            if self.built_at == -math.inf:
+                self.rebuild()
+                return self._lookup(addr, n)
+            return self._query(addr, n)
+        if time.monotonic() - self.built_at < self.refresh_min_s:
+            return False
+        self.rebuild()
+        return self._lookup(addr, n)
+
+    def _lookup(self, addr: int, n: int) -> bool:
+        i = bisect_right(self.starts, addr) - 1
+        return i >= 0 and addr + n <= self.ends[i]
+
+    def _query(self, addr: int, n: int) -> bool:
+        end = addr + n
+        while True:
+            self.queries += 1
+            span = self.point_query(addr)
+            if span is None:
+                return False
+            self._insert(*span)
+            if span[1] >= end:
+                return True
+            addr = span[1]
+
+    def _insert(self, start: int, end: int) -> None:
+        i = bisect_right(self.starts, start)
+        # merge with the span before (if it touches) and any it now overlaps
+        if i > 0 and self.ends[i - 1] >= start:
+            i -= 1
+            start = self.starts[i]
+            end = max(end, self.ends[i])
+        j = i
+        while j < len(self.starts) and self.starts[j] <= end:
+            end = max(end, self.ends[j])
+            j += 1
+        self.starts[i:j] = [start]
+        self.ends[i:j] = [end]
+
+    def discard(self, addr: int) -> None:
+        i = bisect_right(self.starts, addr) - 1
+        if i >= 0 and addr < self.ends[i]:
+            del self.starts[i]
+            del self.ends[i]
+            self.built_at = min(self.built_at, time.monotonic() - self.refresh_min_s)  # allow a rebuild now
+
+    def learn(self, addr: int) -> None:
+        if self.point_query is not None:
+            self._query(addr, 1)
+        else:
+            self.built_at = min(self.built_at, time.monotonic() - self.refresh_min_s)  # rebuild on the next miss
+
+
+# --------------------- pymem (Windows) ---------------------
+STILL_ACTIVE = 259
+MEM_COMMIT = 0x1000
+PAGE_NOACCESS = 0x01
+PAGE_GUARD = 0x100
+USER_SPACE_END = 0x7FFFFFFF0000
+
+
+def _readable(mbi) -> bool:
+    return mbi.State == MEM_COMMIT and not mbi.Protect & (PAGE_NOACCESS | PAGE_GUARD)
+
+
+class PymemBackend:
+    def __init__(self, pm) -> None:
+        self.pm = pm
+
+    @classmethod
+    def open(cls, pid: int) -> "PymemBackend":
+        import pymem
+
+        pm = pymem.Pymem()
+        pm.open_process_from_id(pid)
+        return cls(pm)
+
+    def read(self, addr: int, n: int) -> bytes:
+        try:
+            return self.pm.read_bytes(addr, n)
+        except Exception as e:
+            raise MemoryReadError(f"Could not read {n} bytes at 0x{addr:X}: {e}") from e
+
+    def _module(self, name: str):
+        import pymem.process
+
+        mod = pymem.process.module_from_name(self.pm.process_handle, name)
+        if mod is None:
+            raise LookupError(f"Module {name} not found")
+        return mod
+
+    def module_base(self, name: str) -> int:
+        return self._module(name).lpBaseOfDll
+
+    def module_regions(self, name: str) -> list[tuple[int, int]]:
+        """Committed, readable regions of the module image (VirtualQueryEx walk)."""
+        import pymem.memory
+
+        mod = self._module(name)
+        addr, end = mod.lpBaseOfDll, mod.lpBaseOfDll + mod.SizeOfImage
+        spans = []
+        while addr < end:
+            mbi = pymem.memory.virtual_query(self.pm.process_handle, addr)
+            size = mbi.RegionSize
+            if not size:
+                break
+            if _readable(mbi):
+                _add_span(spans, addr, min(addr + size, end))
+            addr = mbi.BaseAddress + size
+        return spans
+
+    def regions(self) -> list[tuple[int, int]]:
+        """Every committed, readable region of the process (VirtualQueryEx over user space)."""
+        import pymem.memory
+
+        spans = []
+        addr = 0
+        while addr < USER_SPACE_END:
+            mbi = pymem.memory.virtual_query(self.pm.process_handle, addr)
+            size = mbi.RegionSize
+            if not size:
+                break
+            start = mbi.BaseAddress or 0
+            if _readable(mbi):
+                _add_span(spans, start, start + size)
+            addr = start + size
+        return spans
+
+    def region_at(self, addr: int) -> Optional[tuple[int, int]]:
+        import pymem.memory
+
+        try:
+            mbi = pymem.memory.virtual_query(self.pm.process_handle, addr)
+        except Exception:
+            return None
+        if not mbi.RegionSize or not _readable(mbi):
+            return None
+        start = mbi.BaseAddress or 0
+        return start, start + mbi.RegionSize
+
+    def module_path(self, name: str) -> Optional[str]:
+        return self._module(name).filename
+
+    def is_alive(self) -> bool:
+        # One GetExitCodeProcess call on the handle we already hold (immune to PID reuse).
+        import ctypes
+
+        code = ctypes.c_ulong()
+        if not ctypes.windll.kernel32.GetExitCodeProcess(self.pm.process_handle, ctypes.byref(code)):
+            return False
+        return code.value == STILL_ACTIVE
+
+    def close(self) -> None:
+        try:
+            self.pm.close_process()
+        except Exception:
+            pass
+
+
+# --------------------- /proc/<pid>/mem (Linux, Proton/Wine) ---------------------
+def parse_maps_line(line: str):
+    """Return (start, end, perms, path) for one /proc/<pid>/maps line."""
+    parts = line.split(None, 5)
+    start, end = (int(x, 16) for x in parts[0].split("-"))
+    path = parts[5].strip() if len(parts) > 5 else ""
+    return start, end, parts[1], path
+
+
+def _proc_start_time(pid: int) -> Optional[str]:
+    """
+    Field 22 of /proc/<pid>/stat: tells a live PID apart from a reused one.
+    None if the process is gone or a zombie.
+    """
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # comm (field 2) may contain spaces; everything after its closing paren is space-separated
+    fields = stat[stat.rindex(b")") + 2:].split()
+    if fields[0] in (b"Z", b"X"):
+        return None
+    return fields[19].decode()
+
+
+class ProcMemBackend:
+    def __init__(self, pid: int) -> None:
+        self.pid = pid
+        self.fd = os.open(f"/proc/{pid}/mem", os.O_RDONLY)
+        self.start_time = _proc_start_time(pid)
+
+    @classmethod
+    def open(cls, pid: int) -> "ProcMemBackend":
+        return cls(pid)
+
+    def read(self, addr: int, n: int) -> bytes:
+        try:
+            data = os.pread(self.fd, n, addr)
+        except OSError as e:
+            raise MemoryReadError(f"Could not read {n} bytes at 0x{addr:X}: {e}") from e
+        if len(data) != n:
+            raise MemoryReadError(f"Short read at 0x{addr:X}: {len(data)}/{n} bytes")
+        return data
+
+    def _module_maps(self, name: str) -> list:
+        """(start, end, perms, path) of every mapping of a file whose basename matches `name`."""
+        name = name.lower()
+        with open(f"/proc/{self.pid}/maps") as f:
+            maps = [parse_maps_line(line) for line in f]
+        found = [m for m in maps if m[3] and os.path.basename(m[3].replace("\\", "/")).lower() == name]
+        if not found:
+            raise LookupError(f"Module {name} not mapped in PID {self.pid}")
+        return found
+
+    def module_base(self, name: str) -> int:
+        """Lowest mapping of a file whose basename matches `name` (Wine maps the .exe as a file)."""
+        return min(start for start, _, _, _ in self._module_maps(name))
+
+    def module_regions(self, name: str) -> list[tuple[int, int]]:
+        spans = []
+        for start, end, perms, _ in sorted(self._module_maps(name)):
+            if perms.startswith("r"):
+                _add_span(spans, start, end)
+        return spans
+
+    def module_path(self, name: str) -> Optional[str]:
+        return self._module_maps(name)[0][3]
+
+    def regions(self) -> list[tuple[int, int]]:
+        """Every readable mapping of the process, from /proc/<pid>/maps."""
+        spans = []
+        with open(f"/proc/{self.pid}/maps") as f:
+            for line in f:
+                start, end, perms, _ = parse_maps_line(line)
+                if perms.startswith("r"):
+                    _add_span(spans, start, end)
+        return spans
+
+    def is_alive(self) -> bool:
+        return self.start_time is not None and _proc_start_time(self.pid) == self.start_time
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+# --------------------- dump file image ---------------------
+# Layout (little-endian):
+#   b"EWIMAGE1", u32 module_count, u32 region_count
+#   module_count x (u16 name_len, name utf-8, u64 base)
+#   region_count x (u64 addr, u64 size, u64 file_offset)
+#   region bytes
+IMAGE_MAGIC = b"EWIMAGE1"
+_HDR = struct.Struct("<8sII")
+_MOD = struct.Struct("<H")
+_U64 = struct.Struct("<Q")
+_REGION = struct.Struct("<QQQ")
+
+
+def write_image(path: str, regions: Iterable[tuple[int, bytes]], modules: dict[str, int]) -> None:
+    regions = sorted(regions)
+    mods = [(name.encode("utf-8"), base) for name, base in modules.items()]
+    offset = _HDR.size + sum(_MOD.size + len(n) + _U64.size for n, _ in mods) + _REGION.size * len(regions)
+    with open(path, "wb") as f:
+        f.write(_HDR.pack(IMAGE_MAGIC, len(mods), len(regions)))
+        for name, base in mods:
+            f.write(_MOD.pack(len(name)) + name + _U64.pack(base))
+        for addr, data in regions:
+            f.write(_REGION.pack(addr, len(data), offset))
+            offset += len(data)
+        for _, data in regions:
+            f.write(data)
+
+
+def dump_image(mem: MemoryBackend, path: str, spans: Iterable[tuple[int, int]], modules: dict[str, int]) -> None:
+    """Capture the given (addr, size) spans of a live process into an image file."""
+    regions = []
+    for addr, size in spans:
+        try:
+            regions.append((addr, bytes(mem.read(addr, size))))
+        except MemoryReadError:
+            pass
+    write_image(path, regions, modules)
+
+
+class ImageBackend:
+    """Reads served straight out of an mmap'ed image; read() returns memoryview slices."""
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.mm)
+
+        magic, n_mods, n_regions = _HDR.unpack_from(self.mm, 0)
+        if magic != IMAGE_MAGIC:
+            raise ValueError(f"{path} is not a memory image")
+        pos = _HDR.size
+        self.modules: dict[str, int] = {}
+        for _ in range(n_mods):
+            (name_len,) = _MOD.unpack_from(self.mm, pos)
+            pos += _MOD.size
+            name = bytes(self.mm[pos:pos + name_len]).decode("utf-8")
+            pos += name_len
+            (self.modules[name.lower()],) = _U64.unpack_from(self.mm, pos)
+            pos += _U64.size
+        self.table = []  # sorted [(addr, end, file_offset)]
+        for _ in range(n_regions):
+            addr, size, off = _REGION.unpack_from(self.mm, pos)
+            pos += _REGION.size
+            self.table.append((addr, addr + size, off))
+        self.starts = [r[0] for r in self.table]
+
+    @classmethod
+    def open(cls, path: str) -> "ImageBackend":
+        return cls(path)
+
+    def read(self, addr: int, n: int):
+        i = bisect_right(self.starts, addr) - 1
+        if i >= 0:
+            start, end, off = self.table[i]
+            if addr + n <= end:
+                off += addr - start
+                return self.view[off:off + n]
+        raise MemoryReadError(f"Could not read {n} bytes at 0x{addr:X}: not in image")
+
+    def module_base(self, name: str) -> int:
+        try:
+            return self.modules[name.lower()]
+        except KeyError:
+            raise LookupError(f"Module {name} not in image") from None
+
+    def module_regions(self, name: str) -> list[tuple[int, int]]:
+        """Every region in the image from the module base on (a dump holds no other layout)."""
+        base = self.module_base(name)
+        spans = []
+        for start, end, _ in self.table:
+            if end > base:
+                _add_span(spans, max(start, base), end)
+        return spans
+
+    def module_path(self, name: str) -> Optional[str]:
+        return None
+
+    def regions(self) -> list[tuple[int, int]]:
+        spans = []
+        for start, end, _ in self.table:
+            _add_span(spans, start, end)
+        return spans
+
+    def is_alive(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        self.view.release()
+        try:
+            self.mm.close()
+        except BufferError:
+            pass  # slices handed out by read() are still alive
+
+
+# --------------------- factory ---------------------
+BACKENDS = ("auto", "pymem", "proc", "image")
+
+
+def open_backend(proc_name: str, kind: str = "auto", pid: Optional[int] = None,
+                 image: Optional[str] = None) -> Optional[MemoryBackend]:
+    """
+    Open a backend for `proc_name` (or an explicit pid / image path).
+    Returns None if the process isn't running.
+    """
+    if kind == "image" or (kind == "auto" and image):
+        if not image:
+            raise ValueError("image backend needs a path")
+        return ImageBackend.open(image)
+
+    if pid is None:
+        pid = find_pid(proc_name)
+        if pid is None:
+            return None
+
+    if kind == "auto":
+        kind = "pymem" if sys.platform == "win32" else "proc"
+    if kind == "pymem":
+        return PymemBackend.open(pid)
+    if kind == "proc":
+        return ProcMemBackend.open(pid)
+    raise ValueError(f"Unknown memory backend {kind!r} (choose from {', '.join(BACKENDS)})")
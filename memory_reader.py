@@ -1,146 +1,541 @@
 # memory_reader.py
 
-from typing import Optional
+import time
+from typing import TYPE_CHECKING, Optional
 
-import psutil
-import pymem
-import pymem.process
+from evil_within_subsection_logger_v2 import (
+    OFFSETS,
+    ScalarField,
+    StringField,
+    TickBuffer,
+    chapter_plausible,
+    read_i64,
+    read_ptr,
+)
+from memory_backend import MemoryBackend, MemoryReadError, RegionIndex, open_backend
+from process_watcher import ProcessWatcher
+from igt_clock import IgtClock
+from read_errors import CircuitBreaker, ErrorReporter
+from config import (
+    PROC_NAME,
+    MEMORY_BACKEND,
+    ATTACH_RETRY_MIN_S,
+    ATTACH_RETRY_MAX_S,
+    LIVENESS_CHECK_MS,
+    FIELD_PERIODS_MS,
+    FIELD_COALESCE_MS,
+    BASE_OFFSET,
+    POINTER_OFFSETS,
+    IGT_CHAIN_REWALK_MS,
+    IGT_MAX_SECONDS,
+    BREAKER_THRESHOLD,
+    BREAKER_PROBE_MIN_MS,
+    BREAKER_PROBE_MAX_MS,
+    ERROR_REPORT_INTERVAL_S,
+    REGION_INDEX,
+    REGION_REFRESH_MS,
+)
+from model import (
+    GameSnapshot,
+    CH_ALL,
+    CH_CHAPTER,
+    CH_IGT,
+    CH_MAP,
+    CH_SUBA,
+    CH_SUBB,
+)
 
-from evil_within_subsection_logger_v2 import OFFSETS, StringField, read_int_auto, read_ptr
-from config import PROC_NAME, BASE_OFFSET, POINTER_OFFSETS
-from model import GameSnapshot
+if TYPE_CHECKING:
+    from tick_stats import TickStats
 
 
-def get_module_base(pm: pymem.Pymem, module_name: str) -> int:
-    mod = pymem.process.module_from_name(pm.process_handle, module_name)
-    return mod.lpBaseOfDll
+def default_offsets() -> dict:
+    """The hard-coded offsets, keyed as config.SIGNATURES names them."""
+    chain = {f"igt_ptr{i}_off": off for i, off in enumerate(POINTER_OFFSETS)}
+    return {"igt_base": BASE_OFFSET, **chain, **OFFSETS}
 
 
-def resolve_pointer_chain(pm: pymem.Pymem, base_addr: int, base_offset: int, ptr_offsets) -> int:
+def pointer_offsets(offsets: dict) -> tuple:
+    """The IGT chain's POINTER_OFFSETS, as resolved in `offsets`."""
+    return tuple(offsets[f"igt_ptr{i}_off"] for i in range(len(POINTER_OFFSETS)))
+
+
+def resolve_pointer_chain(mem: MemoryBackend, base_addr: int, base_offset: int, ptr_offsets) -> int:
     addr = base_addr + base_offset
-    addr = pm.read_longlong(addr)  # first pointer
+    addr = read_i64(mem, addr)  # first pointer
     for off in ptr_offsets[:-1]:
-        addr = pm.read_longlong(addr + off)
+        addr = read_i64(mem, addr + off)
     return addr + ptr_offsets[-1]
 
 
+def igt_plausible(v: int) -> bool:
+    return 0 <= v <= IGT_MAX_SECONDS
+
+
+class CachedPointerChain:
+    """
+    Keeps the address a pointer chain resolved to, so the steady state costs
+    a single read of the target int instead of walking the chain every tick.
+
+    The chain is walked again when:
+      - nothing is cached yet, or invalidate() was called (chapter change,
+        loading screen),
+      - the cached read fails or the value fails the `plausible` guard,
+      - the value went backwards (a quickload may have rebuilt the object
+        the chain ends in; the old address can still hold a stale count),
+      - `rewalk_ms` after the last walk, as a backstop for moves the guard
+        can't see, however slowly the field is polled.
+
+    The int itself is a ScalarField at the resolved address (always a
+    direct 32-bit read there), which applies the guard.
+    """
+    def __init__(self, base_offset: int, ptr_offsets, plausible, rewalk_ms: int) -> None:
+        self.base_offset = base_offset
+        self.ptr_offsets = ptr_offsets
+        self.plausible = plausible
+        self.rewalk_after = rewalk_ms / 1000
+        self.addr: Optional[int] = None
+        self.walked_at = 0.0
+        self.last: Optional[int] = None
+        self.target = ScalarField(None, lambda: self.addr or 0, "IGT", plausible, modes=(("direct", 4),))
+
+    def invalidate(self) -> None:
+        self.addr = None
+
+    def read_int(self, mem: MemoryBackend, base_addr: int, now: float) -> int:
+        """The int at the end of the chain; `now` is time.monotonic()."""
+        if self.addr is not None and now - self.walked_at < self.rewalk_after:
+            v = self.target.read(mem)
+            if v is not None and (self.last is None or v >= self.last):
+                self.last = v
+                return v
+
+        # Cold, stale or suspicious: re-walk (raises if the chain is broken).
+        self.addr = None
+        self.last = None
+        addr = resolve_pointer_chain(mem, base_addr, self.base_offset, self.ptr_offsets)
+        self.addr = addr
+        self.walked_at = now
+        v = self.target.read(mem)
+        if v is None:
+            raise MemoryReadError(f"No plausible IGT at 0x{addr:X}")
+        self.last = v
+        return v
+
+
+# Decode order inside a batch: chapter first (a change drops the cached IGT
+# address and triggers subA/map), then IGT (going backwards triggers subA).
+FIELD_PRIORITY = ("chapter", "igt", "subB", "subA", "map")
+# What power save still reads. subB too: it drives splits, and the most
+# common split (a door or load) happens while IGT is frozen.
+LIGHT_FIELDS = frozenset(("chapter", "igt", "subB"))
+
+
+class FieldScheduler:
+    """
+    Per-field polling periods. Fields with a period of None are event-driven:
+    they are only read after trigger() (e.g. map name on a chapter change).
+    due() also pulls in fields due within `coalesce_ms`, so fields with
+    nearby deadlines share one wakeup and one read batch.
+    """
+    def __init__(self, periods_ms: dict, coalesce_ms: float) -> None:
+        self.periods = {f: (p / 1000 if p else None) for f, p in periods_ms.items()}
+        self.coalesce = coalesce_ms / 1000
+        self.next_at = {f: 0.0 for f in periods_ms}  # everything is due on the first tick
+
+    @property
+    def min_period_ms(self) -> int:
+        return int(min(p for p in self.periods.values() if p) * 1000)
+
+    def trigger(self, field: str) -> None:
+        self.next_at[field] = 0.0
+
+    def reset(self) -> None:
+        for f in self.next_at:
+            self.next_at[f] = 0.0
+
+    def due(self, now: float) -> set:
+        horizon = now + self.coalesce
+        return {f for f, t in self.next_at.items() if t is not None and t <= horizon}
+
+    def mark_read(self, fields, now: float) -> None:
+        for f in fields:
+            p = self.periods[f]
+            if not p:
+                self.next_at[f] = None
+                continue
+            # Advance from the deadline, not from `now`, so fields keep their
+            # phase and keep sharing wakeups; restart from now if we fell behind.
+            t = self.next_at[f]
+            t = t + p if t else now + p
+            self.next_at[f] = t if t > now else now + p
+
+    def next_due(self) -> float:
+        pending = [t for t in self.next_at.values() if t is not None]
+        return min(pending) if pending else float("inf")
+
+
 class MemoryReader:
-    def __init__(self) -> None:
-        self.pm: Optional[pymem.Pymem] = None
+    """
+    Reads GameSnapshots from the game. Pass a backend to read from it directly
+    (a dump image, a fake, a specific PID); otherwise the reader attaches to
+    PROC_NAME itself using MEMORY_BACKEND, with a ProcessWatcher doing the
+    process scans in the background. An attached process is checked for
+    liveness every LIVENESS_CHECK_MS (and whenever a whole tick fails); when
+    it has exited its handle is closed and the watcher starts looking again.
+
+    Fields are polled on their own periods (FIELD_PERIODS_MS): each call to
+    read_snapshot() reads only the fields that are due, in one read batch,
+    and repeats the last value of the others.
+
+    IGT is whole seconds in memory; an IgtClock fed with the exact read times
+    interpolates it to milliseconds (GameSnapshot.igt_ms).
+
+    A field whose reads keep failing (BREAKER_THRESHOLD in a row, e.g. a
+    pointer that is invalid while loading) is skipped and only probed with
+    backoff until it reads again; read errors go to an ErrorReporter, which
+    prints each field's at most once per ERROR_REPORT_INTERVAL_S. Probes
+    read past the region index, so a field is back as soon as its memory
+    is, not only once the index has been rebuilt.
+
+    read_snapshot() refills and returns the same GameSnapshot every call, so
+    a caller that keeps one across calls must copy it. With `timings` set,
+    each stage of it (attach, the batch read, each field) is timed into it.
+    """
+    power_save = True  # light reads are cheaper: TimerController may use them while idle
+
+    def __init__(self, mem: Optional[MemoryBackend] = None) -> None:
+        self.mem: Optional[MemoryBackend] = None
+        self.region_index: Optional[RegionIndex] = None
+        self.watcher: Optional[ProcessWatcher] = None
+        self.auto_attach = mem is None  # an injected backend is never replaced
+        self.next_liveness_check = 0.0
         self.base_addr: Optional[int] = None
         self.chapter_addr: Optional[int] = None
         self.struct_ptr_rel: Optional[int] = None
+        self.subB_addr: Optional[int] = None
+        self.struct_base = 0  # struct pointer, re-read whenever subA/map are read
+        self.chapter_field: Optional[ScalarField] = None
         self.subA_reader: Optional[StringField] = None
         self.subB_reader: Optional[StringField] = None
+        self.map_reader: Optional[StringField] = None
+        self.scheduler = FieldScheduler(FIELD_PERIODS_MS, FIELD_COALESCE_MS)
+        self.igt_chain = CachedPointerChain(
+            BASE_OFFSET, POINTER_OFFSETS, igt_plausible, IGT_CHAIN_REWALK_MS
+        )
+        self.igt_clock = IgtClock()
+        self.timings: Optional["TickStats"] = None
+        self.breakers = {
+            f: CircuitBreaker(BREAKER_THRESHOLD, BREAKER_PROBE_MIN_MS / 1000, BREAKER_PROBE_MAX_MS / 1000)
+            for f in FIELD_PRIORITY
+        }
+        self.errors = ErrorReporter(ERROR_REPORT_INTERVAL_S)
+        # One snapshot object, refilled by every read_snapshot() call.
+        self.snap = GameSnapshot(attached=False, igt_seconds=None, chapter_val=None, sub_name="")
+        self._reset_values()
+
+        if mem is not None:
+            self.attach_to(mem, mem.module_base(PROC_NAME))
+
+    def attach_to(self, mem: MemoryBackend, base: int, offsets: Optional[dict] = None) -> None:
+        """
+        Bind to an opened backend whose module base is already known, using
+        `offsets` (as from resolve_offsets()) or the hard-coded ones.
+        """
+        if offsets is None:
+            offsets = default_offsets()
+        self.mem = mem
+        self.region_index = (RegionIndex(mem, REGION_REFRESH_MS / 1000)
+                             if REGION_INDEX and hasattr(mem, "regions") else None)
+        self.base_addr = base
+        self.chapter_addr = base + offsets["chapter_rel"]
+        self.struct_ptr_rel = base + offsets["struct_ptr_rel"]
+        self.subB_addr = base + offsets["subB_abs"]
+        self.struct_base = 0
+        chapter_addr = self.chapter_addr
+        self.chapter_field = ScalarField(mem, lambda: chapter_addr, "chapter", chapter_plausible)
+
+        # StringField(mem, addr_func, name); .read() takes an optional TickBuffer.
+        subA_off, map_off = offsets["subA_off"], offsets["map_name_off"]
+        self.subA_reader = StringField(
+            mem,
+            lambda: (self.struct_base + subA_off) if self.struct_base else 0,
+            "subA",
+        )
+        self.map_reader = StringField(
+            mem,
+            lambda: (self.struct_base + map_off) if self.struct_base else 0,
+            "map",
+        )
+        subB_addr = self.subB_addr
+        self.subB_reader = StringField(mem, lambda: subB_addr, "subB")
+        self.igt_chain.base_offset = offsets["igt_base"]
+        self.igt_chain.ptr_offsets = pointer_offsets(offsets)
+        self.igt_chain.invalidate()
+        self.scheduler.reset()
+        self._reset_values()
+
+    def _reset_values(self) -> None:
+        # last value read per field; fields not due this batch repeat these
+        self.last_chapter_val: Optional[int] = None
+        self.igt_seconds: Optional[int] = None
+        self.chapter_val: Optional[int] = None
+        self.subA_name = ""
+        self.subB_name = ""
+        self.map_name = ""
+        self.igt_clock.reset()
+        for b in self.breakers.values():
+            b.success()
+        self.fresh = True  # next snapshot reports every field as changed
+
+    def detach(self) -> None:
+        self.mem = None
+        self.region_index = None
+        self.base_addr = None
+        self.chapter_addr = None
+        self.struct_ptr_rel = None
+        self.subB_addr = None
+        self.struct_base = 0
+        self.chapter_field = None
+        self.subA_reader = None
+        self.subB_reader = None
+        self.map_reader = None
+
+    def close(self) -> None:
+        self.errors.flush(time.monotonic(), force=True)
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+        if self.mem is not None:
+            self.mem.close()
+            self.detach()
+
+    def _check_alive(self, force: bool = False) -> bool:
+        """Cheap liveness check (throttled unless forced); tears down if the process is gone."""
+        now = time.monotonic()
+        if not force and now < self.next_liveness_check:
+            return True
+        self.next_liveness_check = now + LIVENESS_CHECK_MS / 1000
+        try:
+            alive = self.mem.is_alive()
+        except Exception:
+            alive = False
+        if alive:
+            return True
+
+        print("[-] EvilWithin.exe exited")
+        self.mem.close()
+        self.detach()
+        if self.watcher is not None:
+            self.watcher.resume()
+        return False
 
     def attach_if_needed(self) -> None:
-        """Attach to EvilWithin.exe if we aren't already."""
-        if self.pm is not None:
+        """Attach to EvilWithin.exe if we aren't already (never scans processes itself)."""
+        if self.mem is not None:
+            self._check_alive()
+            return
+        if not self.auto_attach:
             return
 
+        if self.watcher is None:
+            self.watcher = ProcessWatcher(PROC_NAME, ATTACH_RETRY_MIN_S, ATTACH_RETRY_MAX_S)
+            self.watcher.start()
+        pid = self.watcher.pid
+        if pid is None:
+            # not running (or not found yet)
+            return
+
+        mem = None
         try:
-            # find process
-            for proc in psutil.process_iter(["name"]):
-                name = proc.info.get("name")
-                if name and name.lower() == PROC_NAME.lower():
-                    break
-            else:
-                # not running
+            mem = open_backend(PROC_NAME, MEMORY_BACKEND, pid=pid)
+            if mem is None:
                 return
 
-            pm_local = pymem.Pymem(PROC_NAME)
-            base = get_module_base(pm_local, PROC_NAME)
-
-            chapter_addr_local = base + OFFSETS["chapter_rel"]
-            struct_ptr_rel_local = base + OFFSETS["struct_ptr_rel"]
-            subB_addr = base + OFFSETS["subB_abs"]
-
-            def struct_ptr() -> int:
-                return read_ptr(pm_local, struct_ptr_rel_local)
-
-            # StringField here matches how you used it in timer002.py:
-            # StringField(pm, addr_func, name) and .read() takes NO args.
-            subA_reader_local = StringField(
-                pm_local,
-                lambda: (struct_ptr() + OFFSETS["subA_off"]) if struct_ptr() else 0,
-                "subA",
-            )
-            subB_reader_local = StringField(pm_local, lambda: subB_addr, "subB")
-
-            self.pm = pm_local
-            self.base_addr = base
-            self.chapter_addr = chapter_addr_local
-            self.struct_ptr_rel = struct_ptr_rel_local
-            self.subA_reader = subA_reader_local
-            self.subB_reader = subB_reader_local
-
-            print("[+] Attached to EvilWithin.exe")
+            base = mem.module_base(PROC_NAME)
+            from signatures import resolve_offsets  # only once there's a game to scan
+
+            self.attach_to(mem, base, resolve_offsets(mem, base, default_offsets()))
+
+            print(f"[+] Attached to EvilWithin.exe (PID {pid})")
             print(f"[+] Module base: 0x{base:016X}")
 
         except Exception as e:
             print(f"[!] Failed to attach: {e}")
-            self.pm = None
-            self.base_addr = None
-            self.chapter_addr = None
-            self.struct_ptr_rel = None
-            self.subA_reader = None
-            self.subB_reader = None
-
-    def read_snapshot(self) -> GameSnapshot:
-        """Return a GameSnapshot with IGT, chapter and subsection name."""
-        self.attach_if_needed()
-        if not self.pm or not self.base_addr:
-            return GameSnapshot(attached=False, igt_seconds=None, chapter_val=None, sub_name="")
+            if mem is not None:
+                mem.close()
+            self.detach()
+            self.watcher.resume(retry=True)
 
-        igt_seconds: Optional[int] = None
-        chapter_val: Optional[int] = None
-        sub_name = ""
+    def _read_struct_fields(self, mem: TickBuffer, fields, now: float) -> None:
+        """subA and map name share one struct: resolve it once for both."""
+        self.struct_base = read_ptr(mem, self.struct_ptr_rel)
+        readers = [(f, r) for f, r in (("subA", self.subA_reader), ("map", self.map_reader)) if f in fields]
+        for f, r in readers:
+            try:
+                value = (r.read(mem) or "").strip()
+                self._read_done(f, r.error, now)
+            except Exception as e:
+                self._read_done(f, e, now)
+                value = ""
+            if f == "subA":
+                self.subA_name = value
+            else:
+                self.map_name = value
 
-        # --- IGT ---
-        try:
-            addr = resolve_pointer_chain(self.pm, self.base_addr, BASE_OFFSET, POINTER_OFFSETS)
-            igt_seconds = self.pm.read_int(addr)
-        except Exception as e:
-            print(f"[!] Error reading IGT: {e}")
+    def _trigger(self, fields: set, field: str, light: bool) -> None:
+        """Read `field` in this batch, or on the next full read if this one is light."""
+        if light:
+            self.scheduler.trigger(field)
+        else:
+            fields.add(field)
 
-        # --- Chapter ---
-        try:
-            chapter_val = read_int_auto(self.pm, self.chapter_addr) if self.chapter_addr else None
-        except Exception as e:
-            print(f"[!] Error reading chapter: {e}")
+    @property
+    def min_period_ms(self) -> int:
+        return self.scheduler.min_period_ms
+
+    def next_due(self) -> float:
+        """time.monotonic() at which the next field is due."""
+        return self.scheduler.next_due()
+
+    def read_snapshot(self, light: bool = False) -> GameSnapshot:
+        """
+        Return a GameSnapshot with IGT, chapter and subsection names.
+        Reads the fields that are due (or just LIGHT_FIELDS if light=True)
+        and repeats the last value of everything else. The returned object
+        is reused by the next call.
+        """
+        t = time.perf_counter_ns()
+        self.attach_if_needed()
+        t = self._lap("attach", t)
+        if self.mem is None or not self.base_addr:
+            return self._detached_snapshot()
+
+        now_ns = time.monotonic_ns()
+        now = now_ns / 1e9
+        due = set(LIGHT_FIELDS) if light else self.scheduler.due(now)
+        breakers = self.breakers
+        fields = {f for f in due if breakers[f].allow(now)}  # skip fields whose breaker is open
+        # A probe reads past the region index: it may not have caught up yet.
+        mem = TickBuffer(self.mem, index=self.region_index, probe=any(breakers[f].open for f in fields))
+        t = self._lap("read:batch", t)
 
-        # --- Subsections: read raw A and B, then choose a display name ---
-        subA_name = ""
-        subB_name = ""
-        sub_name = ""
+        # --- Chapter (first, so a level change can drop the cached IGT address) ---
+        if "chapter" in fields and self.chapter_field is not None:
+            v = self.chapter_field.read(mem)
+            self.chapter_val = v if v is not None else -1
+            self._read_done("chapter", self.chapter_field.error, now)
 
-        # Read B (absolute)
-        if self.subB_reader is not None:
+            # A failed read shows as -1 but isn't a new chapter: re-reading
+            # subA/map every tick until it reads again would only fail too.
+            if v is not None and v != self.last_chapter_val:
+                self.igt_chain.invalidate()
+                self.last_chapter_val = v
+                self._trigger(fields, "subA", light)  # new level: re-read its names
+                self._trigger(fields, "map", light)
+            if v == -1:
+                self.igt_chain.invalidate()  # loading: don't carry an address cached mid-load out of it
+            t = self._lap("read:chapter", t)
+
+        # --- IGT ---
+        if "igt" in fields:
+            prev_igt = self.igt_seconds
+            self.igt_seconds = None
             try:
-                subB_name = (self.subB_reader.read() or "").strip()
+                self.igt_seconds = self.igt_chain.read_int(mem, self.base_addr, now)
+                self._read_done("igt", None, now)
             except Exception as e:
-                print(f"[!] Error reading subB: {e}")
-                subB_name = ""
+                self._read_done("igt", e, now)
+            self.igt_clock.observe(self.igt_seconds, now_ns)
+            if prev_igt is not None and self.igt_seconds is not None and self.igt_seconds < prev_igt:
+                self._trigger(fields, "subA", light)  # quickload: subA tells which save was loaded
+            t = self._lap("read:igt", t)
 
-        # Read A (struct-relative)
-        if self.subA_reader is not None:
+        # --- Subsections: B (absolute), then A / map (struct-relative) ---
+        if "subB" in fields and self.subB_reader is not None:
             try:
-                subA_name = (self.subA_reader.read() or "").strip()
+                self.subB_name = (self.subB_reader.read(mem) or "").strip()
+                self._read_done("subB", self.subB_reader.error, now)
             except Exception as e:
-                print(f"[!] Error reading subA: {e}")
-                subA_name = ""
+                self._read_done("subB", e, now)
+                self.subB_name = ""
+            t = self._lap("read:subB", t)
+
+        if ("subA" in fields or "map" in fields) and self.subA_reader is not None:
+            self._read_struct_fields(mem, fields, now)
+            self._lap("read:struct", t)
+
+        self.scheduler.mark_read(fields | due, now)
+        self.errors.flush(now)
 
+        # Nothing readable at all: the game may have just exited.
+        if ("chapter" in fields and "igt" in fields and self.igt_seconds is None and self.chapter_val in (None, -1)
+                and not (self.subA_name or self.subB_name)):
+            if not self._check_alive(force=True):
+                return self._detached_snapshot()
+
+        return self._fill_snapshot(now_ns)
+
+    def _read_done(self, field: str, error: Optional[Exception], now: float) -> None:
+        """Feed a read's outcome to the field's breaker, and an error to the reporter."""
+        b = self.breakers[field]
+        if error is None:
+            if b.failures:
+                was_open = b.open
+                n = b.success()
+                if was_open:
+                    self.errors.report(f"{field}:closed", f"{field} readable again after {n} failed reads", now, "[+]")
+            return
+        self.errors.report(field, f"Error reading {field}: {error}", now)
+        if b.failure(now):
+            self.errors.report(f"{field}:open", f"{field}: {BREAKER_THRESHOLD} failed reads in a row, "
+                               f"probing it every {BREAKER_PROBE_MIN_MS}-{BREAKER_PROBE_MAX_MS} ms", now, "[-]")
+
+    def _lap(self, stage: str, t: int) -> int:
+        """Record the time since `t` as `stage` (if timing) and return now."""
+        now = time.perf_counter_ns()
+        if self.timings is not None:
+            self.timings.add(stage, now - t)
+        return now
+
+    def _fill_snapshot(self, now_ns: int) -> GameSnapshot:
+        """Write this batch's values (and what changed since last time) into the reused snapshot."""
+        snap = self.snap
+        if self.fresh or not snap.attached:
+            changed = CH_ALL
+            self.fresh = False
+        else:
+            changed = 0
+            if snap.igt_seconds != self.igt_seconds:
+                changed |= CH_IGT
+            if snap.chapter_val != self.chapter_val:
+                changed |= CH_CHAPTER
+            if snap.subA_name != self.subA_name:
+                changed |= CH_SUBA
+            if snap.subB_name != self.subB_name:
+                changed |= CH_SUBB
+            if snap.map_name != self.map_name:
+                changed |= CH_MAP
+
+        snap.attached = True
+        snap.igt_seconds = self.igt_seconds
+        snap.chapter_val = self.chapter_val
         # For display / backward compat: prefer B, then A
-        if subB_name:
-            sub_name = subB_name
-        elif subA_name:
-            sub_name = subA_name
-
-        return GameSnapshot(
-            attached=True,
-            igt_seconds=igt_seconds,
-            chapter_val=chapter_val,
-            sub_name=sub_name,
-            subA_name=subA_name,
-            subB_name=subB_name,
-        )
+        snap.sub_name = self.subB_name or self.subA_name
+        snap.subA_name = self.subA_name
+        snap.subB_name = self.subB_name
+        snap.map_name = self.map_name
+        snap.igt_ms = self.igt_clock.ms_at(now_ns)
+        snap.changed = changed
+        return snap
+
+    def _detached_snapshot(self) -> GameSnapshot:
+        snap = self.snap
+        snap.changed = CH_ALL if snap.attached or self.fresh else 0
+        self.fresh = False
+        snap.attached = False
+        snap.igt_seconds = None
+        snap.chapter_val = None
+        snap.sub_name = snap.subA_name = snap.subB_name = snap.map_name = ""
+        snap.igt_ms = None
+        return snap
@@ -1,9 +1,16 @@
 # model.py
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
+# Formatted times are memoized: a tick mostly formats the same few values
+# (or values one tenth apart) again, and a cache hit returns the same str
+# object, so unchanged label text costs neither formatting nor allocation.
+FORMAT_CACHE_SIZE = 1024
 
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
 def format_hhmmss(total_seconds: Optional[int]) -> str:
     if total_seconds is None:
         return "--:--:--"
@@ -15,7 +22,55 @@ def format_hhmmss(total_seconds: Optional[int]) -> str:
     return f"{h:02d}:{m:02d}:{s:02d}"
 
 
-@dataclass
+def format_hhmmss_t(total_ms: Optional[int]) -> str:
+    """HH:MM:SS.t (tenths, truncated) from milliseconds."""
+    if total_ms is None:
+        return "--:--:--.-"
+    return _format_tenths(total_ms // 100 if total_ms > 0 else 0)
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def _format_tenths(tenths: int) -> str:
+    return f"{format_hhmmss(tenths // 10)}.{tenths % 10}"
+
+
+def format_delta_t(delta_ms: Optional[int]) -> str:
+    """+M:SS.t / -M:SS.t (H:MM:SS.t past an hour) from a signed ms difference; "--" if unknown."""
+    if delta_ms is None:
+        return "--"
+    return _format_delta_tenths(delta_ms // 100 if delta_ms >= 0 else -(-delta_ms // 100))
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def _format_delta_tenths(tenths: int) -> str:
+    sign = "-" if tenths < 0 else "+"
+    t = abs(tenths)
+    h, rest = divmod(t // 10, 3600)
+    m, sec = divmod(rest, 60)
+    if h:
+        return f"{sign}{h}:{m:02d}:{sec:02d}.{t % 10}"
+    return f"{sign}{m}:{sec:02d}.{t % 10}"
+
+
+def format_mss_t(total_ms) -> str:
+    """M:SS.t (H:MM:SS.t past an hour) from milliseconds; "--" if unknown."""
+    if total_ms is None:
+        return "--"
+    return _format_delta_tenths(int(total_ms) // 100 if total_ms > 0 else 0)[1:]
+
+
+# GameSnapshot.changed bits: which values differ from the previous snapshot
+CH_IGT = 0x01          # whole IGT seconds
+CH_CHAPTER = 0x02
+CH_SUBA = 0x04
+CH_SUBB = 0x08
+CH_MAP = 0x10
+CH_ATTACHED = 0x20
+CH_ALL = 0x3F
+CH_SUBSECTION = CH_CHAPTER | CH_SUBA | CH_SUBB
+
+
+@dataclass(slots=True)
 class GameSnapshot:
     attached: bool
     igt_seconds: Optional[int]
@@ -23,9 +78,12 @@ class GameSnapshot:
     sub_name: str          # for display (B if non-empty, else A)
     subA_name: str = ""    # NEW: raw subA text
     subB_name: str = ""    # NEW: raw subB text
+    map_name: str = ""     # map name (read on chapter change)
+    igt_ms: Optional[int] = None  # IGT interpolated to ms (see igt_clock.py); None = whole seconds only
+    changed: int = CH_ALL  # CH_* bits; producers that don't track changes leave all set
 
 
-@dataclass
+@dataclass(slots=True)
 class TimerState:
     # chapter / subsections
     current_chapter: Optional[int] = None
@@ -38,77 +96,168 @@ class TimerState:
 
     # last segment info
     last_sub_index: Optional[int] = None
-    last_sub_duration: Optional[int] = None
+    last_sub_duration_ms: Optional[int] = None
+    splits_closed: int = 0                  # bumped every time a segment is closed
+    restarts: int = 0                       # bumped on a quickload back to an earlier segment
 
-    # timings
-    last_split_igt: Optional[int] = None
-    first_sub_igt: Optional[int] = None
-    session_start_igt: Optional[int] = None
-    last_seen_igt: Optional[int] = None
+    # timings (IGT in ms)
+    last_split_ms: Optional[int] = None
+    first_sub_ms: Optional[int] = None
+    session_start_ms: Optional[int] = None
+    last_seen_igt: Optional[int] = None     # whole seconds, for quickload detection
 
     # NEW: subB-based logic
     last_subB_name: str = ""                # last non-empty B we saw
     seen_nonblank_subB_this_chapter: bool = False
 
-
-@dataclass
+    def split(self, new_name: str, igt_ms: Optional[int]) -> None:
+        """Close the current segment at igt_ms and start the next one, named new_name."""
+        # Close previous segment
+        if igt_ms is not None and self.last_split_ms is not None:
+            seg = igt_ms - self.last_split_ms
+            if seg < 0:
+                seg = 0
+            self.last_sub_duration_ms = seg
+            self.last_sub_index = self.current_sub_index
+            self.splits_closed += 1
+
+        # Move to next segment
+        self.seg_counter += 1
+        self.current_sub_index = self.seg_counter
+        self.current_sub_name = new_name
+        if igt_ms is not None:
+            self.last_split_ms = igt_ms
+
+
+def closed_segment(state: TimerState, splits_closed: int, restarts: int) -> bool:
+    """
+    Did the update that moved `state` on from these counters close a real
+    segment? Not on a quickload back to an earlier segment (what it closes
+    is the abandoned one, cut to 0 ms), and never a 0 ms one.
+    """
+    return (state.splits_closed != splits_closed and state.restarts == restarts
+            and bool(state.last_sub_duration_ms))
+
+
+@dataclass(slots=True)
 class DisplayInfo:
+    # Never mutated once handed out: update_timer_state() returns the previous
+    # object as-is while none of the texts change (raw values included, so
+    # those are as of the last text change), and a new one when any does.
+
+    # formatted once here; the UI shows these as-is
     time_text: str
     chapter_text: str
     current_segment_text: str
     last_segment_text: str
     since_first_text: str
     status_text: str
-
-
-def update_timer_state(state: TimerState, snap: GameSnapshot) -> tuple[TimerState, DisplayInfo]:
+    vs_best_text: str = "--"                # current split vs the best for its subsection
+    stats_text: str = ""                    # summary of the current subsection's past splits
+
+    # raw values behind the text (None = unknown)
+    igt_ms: Optional[int] = None
+    chapter_val: Optional[int] = None
+    current_split_ms: Optional[int] = None
+    last_split_ms: Optional[int] = None
+    total_split_ms: Optional[int] = None
+    vs_best_ms: Optional[int] = None
+
+    def changed_text(self, prev: Optional["DisplayInfo"]) -> list[str]:
+        """Names of the *_text fields that differ from prev (all of them if prev is None)."""
+        if prev is None:
+            return list(TEXT_FIELDS)
+        return [f for f in TEXT_FIELDS if getattr(self, f) != getattr(prev, f)]
+
+
+TEXT_FIELDS = (
+    "time_text",
+    "chapter_text",
+    "current_segment_text",
+    "last_segment_text",
+    "since_first_text",
+    "status_text",
+    "vs_best_text",
+    "stats_text",
+)
+
+
+DETACHED_INFO = DisplayInfo(
+    time_text="--:--:--.-",
+    chapter_text="--",
+    current_segment_text="--:--:--.-",
+    last_segment_text="--:--:--.-",
+    since_first_text="Total Split Time: --:--:--.-",
+    status_text="Not attached (EvilWithin.exe not running)",
+)
+
+
+@lru_cache(maxsize=64)
+def _since_first_text(total_text: str) -> str:
+    return "Total Split Time: " + total_text
+
+
+@lru_cache(maxsize=64)
+def _chapter_text(chapter: Optional[int]) -> str:
+    return f"{chapter}" if chapter is not None else "--"
+
+
+def update_timer_state(state: TimerState, snap: GameSnapshot, prev: Optional[DisplayInfo] = None,
+                       status_text: str = "", bests: Optional[dict] = None,
+                       summaries: Optional[dict] = None) -> tuple[TimerState, DisplayInfo]:
+    """
+    Advance `state` (in place) by one snapshot. Returns the state and the
+    DisplayInfo to show: `prev` itself if none of its texts would change.
+    `bests` maps (chapter, subsection) -> best segment ms (SplitHistory.best),
+    for the "vs best" text; `summaries` maps the same keys to a stats line
+    (SplitStats.text).
+    """
     s = state
 
     # Not attached → no state changes
     if not snap.attached:
-        return s, DisplayInfo(
-            time_text="--:--:--",
-            chapter_text="--",
-            current_segment_text="Current Split: --:--:--",
-            last_segment_text="Previous Split: --:--:--",
-            since_first_text="Total Split Time: --:--:--",
-            status_text="Not attached (EvilWithin.exe not running)",
-        )
+        return s, DETACHED_INFO
 
     igt = snap.igt_seconds
+    if snap.igt_ms is not None:
+        igt_ms = snap.igt_ms
+    else:
+        igt_ms = igt * 1000 if igt is not None else None
     chap = snap.chapter_val
     sub_name = snap.sub_name or ""
     subA_name = getattr(snap, "subA_name", "") or ""
     subB_name = getattr(snap, "subB_name", "") or ""
 
     # Time label
-    time_text = format_hhmmss(igt) if igt is not None else "--:--:--"
+    time_text = format_hhmmss_t(igt_ms)
 
     # --- Quickload / restart detection: IGT going backwards ---
-    if igt is not None and s.last_seen_igt is not None and igt + 1 < s.last_seen_igt:
+    quickloaded = igt is not None and s.last_seen_igt is not None and igt + 1 < s.last_seen_igt
+    if quickloaded:
         # We just quickloaded.
 
         # If we haven't actually started a run yet, treat this as the start of segment 1.
-        if s.current_sub_index is None and s.first_sub_igt is None:
+        if s.current_sub_index is None and s.first_sub_ms is None:
             s.seg_counter = 1
             s.current_sub_index = 1
             if igt is not None and igt > 0:       # <<< guard here
-                if s.session_start_igt is None:
-                    s.session_start_igt = igt
-                s.first_sub_igt = igt
-                s.last_split_igt = igt
+                if s.session_start_ms is None:
+                    s.session_start_ms = igt_ms
+                s.first_sub_ms = igt_ms
+                s.last_split_ms = igt_ms
         else:
             # Mid-run quickload: classify based on subA vs subB.
 
             if subB_name and subA_name == subB_name:
                 # Case 1: Reloaded the segment we're already on.
                 s.had_real_name = False
-                # DO NOT touch current_sub_index, seg_counter, last_sub_index, last_sub_duration
+                # DO NOT touch current_sub_index, seg_counter, last_sub_index, last_sub_duration_ms
                 if igt is not None and igt > 0:   # <<< guard here
-                    s.last_split_igt = igt        # restart timing from this IGT
+                    s.last_split_ms = igt_ms      # restart timing from this IGT
 
             else:
                 # Case 2: Reloaded an earlier segment (subA != subB, or B blank).
+                s.restarts += 1
                 s.seg_counter = 1
                 s.current_sub_index = 1
                 s.current_sub_name = ""
@@ -116,21 +265,21 @@ def update_timer_state(state: TimerState, snap: GameSnapshot) -> tuple[TimerStat
 
                 # Fresh run timing from this point
                 if igt is not None and igt > 0:   # <<< guard here
-                    s.first_sub_igt = igt
-                    s.last_split_igt = igt
+                    s.first_sub_ms = igt_ms
+                    s.last_split_ms = igt_ms
 
                 # Clear previous segment info...
                 s.last_sub_index = None
-                s.last_sub_duration = None
+                s.last_sub_duration_ms = None
                 s.last_subB_name = ""
                 s.seen_nonblank_subB_this_chapter = False
 
     if igt is not None:
         s.last_seen_igt = igt
 
-    # session_start_igt: first valid IGT we see
-    if s.session_start_igt is None and igt is not None and igt > 0:  # <<< add igt > 0
-        s.session_start_igt = igt
+    # session_start_ms: first valid IGT we see
+    if s.session_start_ms is None and igt is not None and igt > 0:  # <<< add igt > 0
+        s.session_start_ms = igt_ms
 
     # --- Chapter change handling ---
     if chap is not None and chap != s.current_chapter:
@@ -143,18 +292,26 @@ def update_timer_state(state: TimerState, snap: GameSnapshot) -> tuple[TimerStat
         s.seen_nonblank_subB_this_chapter = False
 
     # Chapter label text
-    chapter_text = f"{s.current_chapter}" if s.current_chapter is not None else "--"
+    chapter_text = _chapter_text(s.current_chapter)
 
     # --- Auto-start first segment when we have chapter + IGT but no index yet ---
     if s.current_chapter is not None and s.current_sub_index is None and igt is not None and igt > 0:  # <<< add igt > 0
         s.seg_counter = 1
         s.current_sub_index = 1
-        s.last_split_igt = igt
-        if s.first_sub_igt is None:
-            s.first_sub_igt = igt
+        s.last_split_ms = igt_ms
+        if s.first_sub_ms is None:
+            s.first_sub_ms = igt_ms
 
     # --- Subsection naming + B-driven split detection ---
-    if s.current_sub_index is not None:
+    # Skipped on quiet ticks: nothing subsection-related changed, the segment
+    # is already named and B is already accounted for, so it would be a no-op.
+    quiet = (
+        not snap.changed & CH_SUBSECTION
+        and not quickloaded
+        and s.had_real_name
+        and (not subB_name or (s.seen_nonblank_subB_this_chapter and subB_name == s.last_subB_name))
+    )
+    if s.current_sub_index is not None and not quiet:
         # 1) Name the current segment if we don't have a name yet.
         #    For segment 1: B is blank, so this will use A.
         if not s.had_real_name:
@@ -169,24 +326,6 @@ def update_timer_state(state: TimerState, snap: GameSnapshot) -> tuple[TimerStat
                 s.current_sub_name = sub_name
                 s.had_real_name = True
 
-        # Helper for splitting
-        def do_split(new_name: str):
-            nonlocal igt
-            # Close previous segment
-            if igt is not None and s.last_split_igt is not None:
-                seg = igt - s.last_split_igt
-                if seg < 0:
-                    seg = 0
-                s.last_sub_duration = seg
-                s.last_sub_index = s.current_sub_index
-
-            # Move to next segment
-            s.seg_counter += 1
-            s.current_sub_index = s.seg_counter
-            s.current_sub_name = new_name
-            if igt is not None:
-                s.last_split_igt = igt
-
         # 2) B-based rules:
         #    - While subB == ""  → segment 1.
         #    - First time subB becomes non-empty → segment 1 -> 2.
@@ -200,62 +339,82 @@ def update_timer_state(state: TimerState, snap: GameSnapshot) -> tuple[TimerStat
                 # first non-empty B marks the boundary 1 -> 2.
                 if (
                     s.had_real_name
-                    and s.last_split_igt is not None
-                    and igt is not None
-                    and igt >= s.last_split_igt
+                    and s.last_split_ms is not None
+                    and igt_ms is not None
+                    and igt_ms >= s.last_split_ms
                 ):
-                    do_split(subB_name)
+                    s.split(subB_name, igt_ms)
 
             # Subsequent B changes (segment 2,3,4,...) → split whenever B changes
             elif s.last_subB_name and subB_name != s.last_subB_name:
-                if s.last_split_igt is not None and igt is not None and igt >= s.last_split_igt:
-                    do_split(subB_name)
+                if s.last_split_ms is not None and igt_ms is not None and igt_ms >= s.last_split_ms:
+                    s.split(subB_name, igt_ms)
 
         # Remember B for next tick
         if subB_name:
             s.last_subB_name = subB_name
 
-    # Ensure last_split_igt is set once we have an index & IGT
-    if s.current_sub_index is not None and s.last_split_igt is None and igt is not None and igt > 0:  # <<< add igt > 0
-        s.last_split_igt = igt
-        if s.first_sub_igt is None:
-            s.first_sub_igt = igt
+    # Ensure last_split_ms is set once we have an index & IGT
+    if s.current_sub_index is not None and s.last_split_ms is None and igt is not None and igt > 0:  # <<< add igt > 0
+        s.last_split_ms = igt_ms
+        if s.first_sub_ms is None:
+            s.first_sub_ms = igt_ms
 
     # --- Elapsed in current segment ---
     current_sub_elapsed = None
-    if s.current_sub_index is not None and igt is not None and s.last_split_igt is not None:
-        current_sub_elapsed = igt - s.last_split_igt
+    if s.current_sub_index is not None and igt_ms is not None and s.last_split_ms is not None:
+        current_sub_elapsed = igt_ms - s.last_split_ms
         if current_sub_elapsed < 0:
             current_sub_elapsed = 0
 
     # --- Run time since first segment ---
-    origin = s.first_sub_igt if s.first_sub_igt is not None else s.session_start_igt
+    origin = s.first_sub_ms if s.first_sub_ms is not None else s.session_start_ms
     run_since_first = None
-    if origin is not None and igt is not None:
-        run_since_first = igt - origin
+    if origin is not None and igt_ms is not None:
+        run_since_first = igt_ms - origin
         if run_since_first < 0:
             run_since_first = 0
 
     # --- Build display strings (no numeric segment labels) ---
     if s.current_sub_index is not None:
         # We only care about the time for "Current"
-        current_segment_text = (
-            f"{format_hhmmss(current_sub_elapsed)}"
-        )
+        current_segment_text = format_hhmmss_t(current_sub_elapsed)
     else:
-        current_segment_text = "--:--:--"
+        current_segment_text = "--:--:--.-"
 
-    if s.last_sub_duration is not None:
+    if s.last_sub_duration_ms is not None:
         # "Previous" just shows the last completed segment's time
-        last_segment_text = (
-            f"{format_hhmmss(s.last_sub_duration)}"
-        )
+        last_segment_text = format_hhmmss_t(s.last_sub_duration_ms)
     else:
-        last_segment_text = "--:--:--"
-
-    since_first_text = "Total Split Time: " + format_hhmmss(run_since_first)
-
-    status_text = ""
+        last_segment_text = "--:--:--.-"
+
+    since_first_text = _since_first_text(format_hhmmss_t(run_since_first))
+
+    vs_best = None
+    if bests and current_sub_elapsed is not None and s.had_real_name:
+        best = bests.get((s.current_chapter, s.current_sub_name))
+        if best is not None:
+            vs_best = current_sub_elapsed - best
+    vs_best_text = format_delta_t(vs_best)
+
+    stats_text = ""
+    if summaries and s.had_real_name:
+        stats_text = summaries.get((s.current_chapter, s.current_sub_name), "")
+
+    # Cached formatters hand back the same str objects, so on a tick where
+    # nothing visible changed these are mostly identity checks.
+    if (
+        prev is not None
+        and prev.time_text == time_text
+        and prev.chapter_text == chapter_text
+        and prev.current_segment_text == current_segment_text
+        and prev.last_segment_text == last_segment_text
+        and prev.since_first_text == since_first_text
+        and prev.status_text == status_text
+        and prev.vs_best_text == vs_best_text
+        and prev.stats_text == stats_text
+    ):
+        return s, prev
 
     info = DisplayInfo(
         time_text=time_text,
@@ -264,6 +423,14 @@ def update_timer_state(state: TimerState, snap: GameSnapshot) -> tuple[TimerStat
         last_segment_text=last_segment_text,
         since_first_text=since_first_text,
         status_text=status_text,
+        vs_best_text=vs_best_text,
+        stats_text=stats_text,
+        igt_ms=igt_ms,
+        chapter_val=s.current_chapter,
+        current_split_ms=current_sub_elapsed,
+        last_split_ms=s.last_sub_duration_ms,
+        total_split_ms=run_since_first,
+        vs_best_ms=vs_best,
     )
     return s, info
 
@@ -0,0 +1,164 @@
+# overlay_server.py
+#
+# Optional local HTTP server for an OBS browser source: serves overlay.html
+# and pushes the DisplayInfo texts to it over Server-Sent Events, sending each
+# client only the fields that changed since the last thing it was sent.
+#
+#   GET /         the bundled overlay (overlay.html)
+#   GET /events   text/event-stream; each event is a JSON object
+#                 {field: text} of changed DisplayInfo *_text fields (all of
+#                 them on connect). Comment lines keep idle streams open.
+
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from config import RENDER_INTERVAL_MS
+from model import DisplayInfo
+from sampler import Sampler
+
+OVERLAY_HTML = os.path.join(os.path.dirname(os.path.abspath(__file__)), "overlay.html")
+KEEPALIVE_S = 15.0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "EvilWithinOverlay/1"
+    overlay: "OverlayServer"
+
+    def do_GET(self) -> None:
+        path = self.path.split("?", 1)[0]
+        if path in ("/", "/overlay.html"):
+            self._send_page()
+        elif path == "/events":
+            self._stream()
+        else:
+            self.send_error(404)
+
+    def _send_page(self) -> None:
+        try:
+            with open(OVERLAY_HTML, "rb") as f:
+                body = f.read()
+        except OSError:
+            self.send_error(404, "overlay.html missing")
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+
+        overlay = self.overlay
+        overlay.client_joined()
+        shown: dict[str, str] = {}
+        version = -1
+        try:
+            while not overlay.stopping:
+                version, texts = overlay.wait(version, KEEPALIVE_S)
+                # Diff against what this client has, not against the previous
+                # push: a client that fell behind gets one merged delta.
+                delta = {f: t for f, t in texts.items() if shown.get(f) != t}
+                if delta:
+                    self.wfile.write(b"data: " + json.dumps(delta, ensure_ascii=False).encode() + b"\n\n")
+                    shown.update(delta)
+                else:
+                    self.wfile.write(b": keepalive\n\n")
+                self.wfile.flush()
+        except OSError:
+            pass  # browser source closed / reloaded
+        finally:
+            overlay.client_left()
+
+    def log_message(self, format, *args) -> None:
+        pass  # one line per request would flood the console on reconnects
+
+
+class OverlayServer:
+    """
+    Watches sampler.latest on its own thread (at the UI's RENDER_INTERVAL_MS)
+    and wakes the per-client stream threads when a text changes. Clients
+    share one copy of the current texts and a version number; nothing is
+    queued per client, so a slow browser never holds up the others.
+    """
+    def __init__(self, sampler: Sampler, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.sampler = sampler
+        self.texts: dict[str, str] = {}
+        self.version = 0
+        self.clients = 0
+        self.pushes = 0
+        self.stopping = False
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        handler = type("Handler", (_Handler,), {"overlay": self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> None:
+        for target, name in ((self.httpd.serve_forever, "overlay-http"), (self._watch, "overlay-watch")):
+            t = threading.Thread(target=target, name=name, daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self) -> None:
+        self.stopping = True
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        for t in self._threads:
+            t.join(timeout=2.0)
+        self._threads = []
+
+    def client_joined(self) -> None:
+        with self._cond:
+            self.clients += 1
+        print(f"[+] Overlay client connected ({self.clients} total)")
+
+    def client_left(self) -> None:
+        with self._cond:
+            self.clients -= 1
+        print(f"[-] Overlay client disconnected ({self.clients} left)")
+
+    def wait(self, version: int, timeout: float) -> tuple[int, dict[str, str]]:
+        """Block until the texts move past `version` (or timeout); returns (version, texts)."""
+        with self._cond:
+            if self.version == version and not self.stopping:
+                self._cond.wait(timeout)
+            return self.version, self.texts
+
+    def publish(self, info: DisplayInfo, prev: Optional[DisplayInfo]) -> None:
+        fields = info.changed_text(prev)
+        if not fields:
+            return
+        texts = dict(self.texts)
+        for f in fields:
+            texts[f] = getattr(info, f)
+        with self._cond:
+            self.texts = texts  # replaced, never mutated: waiters diff a stable copy
+            self.version += 1
+            self.pushes += 1
+            self._cond.notify_all()
+
+    def _watch(self) -> None:
+        last = None
+        while not self._stop.wait(RENDER_INTERVAL_MS / 1000):
+            info = self.sampler.latest
+            if info is None or info is last:
+                continue
+            self.publish(info, last)
+            last = info
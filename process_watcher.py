@@ -0,0 +1,80 @@
+# process_watcher.py
+
+import threading
+from typing import Callable, Optional
+
+from memory_backend import find_pid
+
+
+class ProcessWatcher:
+    """
+    Looks for a process by name on a background thread, so the caller's
+    thread never pays for a process scan.
+
+    Scans back off exponentially from min_delay to max_delay while the
+    process is missing. Once found, `pid` is set and the thread sleeps
+    until resume() is called (the process exited, or attaching failed).
+    """
+    def __init__(self, proc_name: str, min_delay: float, max_delay: float,
+                 finder: Callable[[str], Optional[int]] = find_pid) -> None:
+        self.proc_name = proc_name
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.finder = finder
+        self.pid: Optional[int] = None
+        self.delay = min_delay
+        self._retry = False
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="process-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def resume(self, retry: bool = False) -> None:
+        """
+        Forget the current PID and start scanning again: at once after an
+        exit, or after the current backoff delay if attaching to it failed.
+        """
+        self._retry = retry
+        if not retry:
+            self.delay = self.min_delay
+        self.pid = None
+        self._wake.set()
+
+    def _backoff(self) -> None:
+        self._wake.wait(self.delay)
+        self._wake.clear()
+        self.delay = min(self.max_delay, self.delay * 2)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self.pid is not None:
+                # Found: idle until the owner asks us to look again.
+                self._wake.wait()
+                self._wake.clear()
+                if self._retry:
+                    self._retry = False
+                    self._backoff()
+                continue
+
+            try:
+                pid = self.finder(self.proc_name)
+            except Exception as e:
+                print(f"[!] Process scan failed: {e}")
+                pid = None
+
+            if pid is not None:
+                self.pid = pid
+                continue
+
+            self._backoff()
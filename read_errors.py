@@ -0,0 +1,115 @@
+# read_errors.py
+#
+# Keeps failed reads cheap and the console quiet while pointers are invalid
+# (loading screens, level transitions):
+#
+#   CircuitBreaker  per field: after `threshold` failures in a row the field
+#                   is skipped, then probed with exponential backoff; the
+#                   first successful probe closes it again
+#   ErrorReporter   counts errors per key and prints at most one line per
+#                   key per interval: the first at once, later ones as
+#                   "<last message> (xN in Ts)"
+
+import math
+from dataclasses import dataclass
+
+
+class CircuitBreaker:
+    __slots__ = ("threshold", "probe_min", "probe_max", "failures", "open", "backoff", "next_probe")
+
+    def __init__(self, threshold: int, probe_min_s: float, probe_max_s: float) -> None:
+        self.threshold = threshold
+        self.probe_min = probe_min_s
+        self.probe_max = probe_max_s
+        self.failures = 0      # in a row
+        self.open = False
+        self.backoff = probe_min_s
+        self.next_probe = 0.0
+
+    def allow(self, now: float) -> bool:
+        """Read the field now? Always while closed; once per backoff while open."""
+        return not self.open or now >= self.next_probe
+
+    def success(self) -> int:
+        """Close the breaker; returns how many failures in a row this ended."""
+        n = self.failures
+        self.failures = 0
+        self.open = False
+        self.backoff = self.probe_min
+        return n
+
+    def failure(self, now: float) -> bool:
+        """Count a failure; True if it just opened the breaker."""
+        self.failures += 1
+        if self.open:
+            self.backoff = min(self.backoff * 2, self.probe_max)  # failed probe
+            self.next_probe = now + self.backoff
+            return False
+        if self.failures >= self.threshold:
+            self.open = True
+            self.backoff = self.probe_min
+            self.next_probe = now + self.backoff
+            return True
+        return False
+
+
+@dataclass(slots=True)
+class ErrorRecord:
+    key: str
+    message: str = ""             # the latest
+    count: int = 0                # all time
+    pending: int = 0              # not printed yet
+    pending_since: float = 0.0
+    last_at: float = 0.0
+    printed_at: float = -math.inf
+
+
+class ErrorReporter:
+    """
+    report() is cheap enough to call on every failed read: it only prints
+    when the key hasn't printed for `interval_s`. flush() (call it once a
+    tick; it returns at once until something can be due) prints the counts
+    held back for keys that have gone quiet.
+    """
+    def __init__(self, interval_s: float) -> None:
+        self.interval = interval_s
+        self.records: dict[str, ErrorRecord] = {}
+        self.next_flush = math.inf
+
+    def report(self, key: str, message: str, now: float, tag: str = "[!]") -> None:
+        r = self.records.get(key)
+        if r is None:
+            r = self.records[key] = ErrorRecord(key)
+        if not r.pending:
+            r.pending_since = now
+        r.message = f"{tag} {message}"
+        r.count += 1
+        r.pending += 1
+        r.last_at = now
+        if now - r.printed_at >= self.interval:
+            self._emit(r, now)
+        else:
+            self.next_flush = min(self.next_flush, r.printed_at + self.interval)
+
+    def flush(self, now: float, force: bool = False) -> None:
+        if now < self.next_flush and not force:
+            return
+        self.next_flush = math.inf
+        for r in self.records.values():
+            if not r.pending:
+                continue
+            if force or now - r.printed_at >= self.interval:
+                self._emit(r, now)
+            else:
+                self.next_flush = min(self.next_flush, r.printed_at + self.interval)
+
+    def _emit(self, r: ErrorRecord, now: float) -> None:
+        if r.pending == 1:
+            print(r.message)
+        else:
+            print(f"{r.message} (x{r.pending} in {now - r.pending_since:.0f}s)")
+        r.pending = 0
+        r.printed_at = now
+
+    def to_json(self) -> dict:
+        return {k: {"count": r.count, "last": r.message} for k, r in sorted(self.records.items())}
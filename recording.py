@@ -0,0 +1,257 @@
+# recording.py
+#
+# Compact append-only recording of the GameSnapshot stream.
+#
+# File layout:
+#   header:  b"EWREC001" + u64 start time (unix ms)
+#   records: one flags byte, then the fields its bits announce
+#
+#   flags bit  meaning                              payload
+#   0x01       attached
+#   0x02       igt is None
+#   0x04       chapter is None
+#   0x08       igt changed                          zigzag varint delta
+#   0x10       chapter changed                      zigzag varint delta
+#   0x20       names changed                        mask byte (1=sub_name 2=subA 4=subB 8=map) + varint id per set bit
+#   0x40       igt has a sub-second part            varint ms (igt_ms - igt * 1000)
+#   always     ms since previous record             varint (right after flags)
+#
+#   0x80 as flags byte: string definition -> varint length + utf-8 bytes; gets the next id (from 1)
+#
+# A steady tick costs 2 bytes (4 with a sub-second IGT), one more when the IGT
+# second ticks over. Id 0 is "".
+# A truncated final record (crash mid-write) is ignored by the reader.
+
+import struct
+import time
+from typing import BinaryIO, Iterator, Optional
+
+from model import GameSnapshot, CH_ALL, CH_CHAPTER, CH_IGT, CH_MAP, CH_SUBA, CH_SUBB
+
+MAGIC = b"EWREC001"
+_HEADER = struct.Struct("<8sQ")
+HEADER_SIZE = _HEADER.size
+
+F_ATTACHED = 0x01
+F_IGT_NONE = 0x02
+F_CHAPTER_NONE = 0x04
+F_IGT = 0x08
+F_CHAPTER = 0x10
+F_NAMES = 0x20
+F_IGT_MS = 0x40
+F_STRING = 0x80
+
+_NAME_FIELDS = ("sub_name", "subA_name", "subB_name", "map_name")
+_NAME_CHANGED = (0, CH_SUBA, CH_SUBB, CH_MAP)
+_STATE_FLAGS = F_ATTACHED | F_IGT_NONE | F_CHAPTER_NONE
+
+
+def _zigzag(v: int) -> int:
+    return (v << 1) if v >= 0 else ((-v << 1) - 1)
+
+
+def _unzigzag(v: int) -> int:
+    return (v >> 1) if not v & 1 else -((v + 1) >> 1)
+
+
+def _varint(v: int, out: bytearray) -> None:
+    while v > 0x7F:
+        out.append((v & 0x7F) | 0x80)
+        v >>= 7
+    out.append(v)
+
+
+class SnapshotRecorder:
+    def __init__(self, f: BinaryIO, start_unix_ms: Optional[int] = None) -> None:
+        self.f = f
+        if start_unix_ms is None:
+            start_unix_ms = int(time.time() * 1000)
+        f.write(_HEADER.pack(MAGIC, start_unix_ms))
+        self.ids: dict[str, int] = {"": 0}
+        self.last_t_ms: Optional[int] = None
+        self.last_igt = 0
+        self.last_chapter = 0
+        self.last_names = [""] * len(_NAME_FIELDS)
+
+    @classmethod
+    def open(cls, path: str) -> "SnapshotRecorder":
+        return cls(open(path, "wb"))
+
+    def _intern(self, s: str, out: bytearray) -> int:
+        sid = self.ids.get(s)
+        if sid is None:
+            sid = self.ids[s] = len(self.ids)
+            raw = s.encode("utf-8")
+            out.append(F_STRING)
+            _varint(len(raw), out)
+            out += raw
+        return sid
+
+    def write(self, snap: GameSnapshot, t_ms: Optional[int] = None) -> None:
+        if t_ms is None:
+            t_ms = time.monotonic_ns() // 1_000_000
+        dt = 0 if self.last_t_ms is None else max(0, t_ms - self.last_t_ms)
+        self.last_t_ms = t_ms
+
+        out = bytearray()
+        flags = F_ATTACHED if snap.attached else 0
+        body = bytearray()
+        _varint(dt, body)
+
+        if snap.igt_seconds is None:
+            flags |= F_IGT_NONE
+        elif snap.igt_seconds != self.last_igt:
+            flags |= F_IGT
+            _varint(_zigzag(snap.igt_seconds - self.last_igt), body)
+            self.last_igt = snap.igt_seconds
+        if snap.igt_seconds is not None and snap.igt_ms is not None:
+            frac = snap.igt_ms - snap.igt_seconds * 1000
+            if frac:
+                flags |= F_IGT_MS
+                _varint(frac, body)
+
+        if snap.chapter_val is None:
+            flags |= F_CHAPTER_NONE
+        elif snap.chapter_val != self.last_chapter:
+            flags |= F_CHAPTER
+            _varint(_zigzag(snap.chapter_val - self.last_chapter), body)
+            self.last_chapter = snap.chapter_val
+
+        mask = 0
+        ids = bytearray()
+        for i, field in enumerate(_NAME_FIELDS):
+            name = getattr(snap, field)
+            if name != self.last_names[i]:
+                mask |= 1 << i
+                _varint(self._intern(name, out), ids)
+                self.last_names[i] = name
+        if mask:
+            flags |= F_NAMES
+            body.append(mask)
+            body += ids
+
+        out.append(flags)
+        out += body
+        self.f.write(out)
+
+    def flush(self) -> None:
+        self.f.flush()
+
+    def close(self) -> None:
+        self.f.close()
+
+
+def parse_header(data: bytes) -> int:
+    """Start time (unix ms) from a stream's header; ValueError if it isn't one."""
+    magic, start_unix_ms = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("not a snapshot recording")
+    return start_unix_ms
+
+
+class SnapshotDecoder:
+    """
+    Incremental decoder for the record stream that follows the header, for
+    recordings read whole and for live streams (sampler_daemon.py) alike.
+    feed() yields every complete record in the data so far and keeps an
+    incomplete trailing record until more data arrives.
+    """
+    def __init__(self) -> None:
+        self.pending = b""
+        self.strings = [""]
+        self.t_ms = 0
+        self.igt = 0
+        self.chapter = 0
+        self.names = [""] * len(_NAME_FIELDS)
+        self.prev_state = None
+
+    def feed(self, data: bytes) -> Iterator[tuple[int, GameSnapshot]]:
+        if self.pending:
+            data = self.pending + data
+        n = len(data)
+        pos = start = 0
+        strings = self.strings
+        names = self.names
+
+        def varint() -> int:
+            nonlocal pos
+            v = shift = 0
+            while True:
+                b = data[pos]
+                pos += 1
+                v |= (b & 0x7F) << shift
+                if b < 0x80:
+                    return v
+                shift += 7
+
+        try:
+            while pos < n:
+                start = pos
+                flags = data[pos]
+                pos += 1
+                if flags == F_STRING:
+                    length = varint()
+                    if pos + length > n:
+                        raise IndexError
+                    strings.append(bytes(data[pos:pos + length]).decode("utf-8"))
+                    pos += length
+                    continue
+
+                # Decode into locals; state only changes once the record is complete.
+                t_ms = self.t_ms + varint()
+                igt = self.igt
+                chapter = self.chapter
+                changed = 0
+                if flags & F_IGT:
+                    igt += _unzigzag(varint())
+                    changed |= CH_IGT
+                frac = varint() if flags & F_IGT_MS else 0
+                if flags & F_CHAPTER:
+                    chapter += _unzigzag(varint())
+                    changed |= CH_CHAPTER
+                if flags & F_NAMES:
+                    mask = data[pos]
+                    pos += 1
+                    new_names = names.copy()
+                    for i in range(len(_NAME_FIELDS)):
+                        if mask & (1 << i):
+                            new_names[i] = strings[varint()]
+                            changed |= _NAME_CHANGED[i]
+                    names = self.names = new_names
+                if flags & _STATE_FLAGS != self.prev_state:  # (re)attached or a value appeared/vanished
+                    changed = CH_ALL
+                    self.prev_state = flags & _STATE_FLAGS
+                self.t_ms, self.igt, self.chapter = t_ms, igt, chapter
+                start = pos
+
+                yield t_ms, GameSnapshot(
+                    attached=bool(flags & F_ATTACHED),
+                    igt_seconds=None if flags & F_IGT_NONE else igt,
+                    chapter_val=None if flags & F_CHAPTER_NONE else chapter,
+                    sub_name=names[0],
+                    subA_name=names[1],
+                    subB_name=names[2],
+                    map_name=names[3],
+                    igt_ms=None if flags & F_IGT_NONE else igt * 1000 + frac,
+                    changed=changed,
+                )
+            start = pos
+        except IndexError:
+            pass  # incomplete record: wait for the rest
+        self.pending = bytes(data[start:])
+
+
+class SnapshotReader:
+    """Iterates (t_ms, GameSnapshot) from a recording; t_ms counts from the first record."""
+    def __init__(self, data: bytes) -> None:
+        self.start_unix_ms = parse_header(data)
+        self.data = data
+
+    @classmethod
+    def open(cls, path: str) -> "SnapshotReader":
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def __iter__(self) -> Iterator[tuple[int, GameSnapshot]]:
+        # A truncated final record (crash mid-write) just stays pending.
+        return SnapshotDecoder().feed(memoryview(self.data)[_HEADER.size:])
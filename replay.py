@@ -0,0 +1,67 @@
+# replay.py
+#
+# Feed recorded snapshot streams through update_timer_state as fast as possible:
+# no Tk, no game process. Usage:
+#   python replay.py session-*.ewrec            # per-file summary + throughput
+#   python replay.py --json session-*.ewrec     # splits as JSON, to diff between commits
+
+import argparse
+import json
+import time
+from dataclasses import dataclass, field
+
+from model import TimerState, closed_segment, update_timer_state
+from recording import SnapshotReader
+
+
+@dataclass
+class ReplayResult:
+    path: str
+    ticks: int = 0
+    duration_ms: int = 0                        # recorded wall time covered
+    splits: list = field(default_factory=list)  # [(chapter, index, name, ms)], as history.py records them
+    state: TimerState = field(default_factory=TimerState)
+
+
+def replay(path: str) -> ReplayResult:
+    res = ReplayResult(path)
+    s = res.state
+    for t_ms, snap in SnapshotReader.open(path):
+        # Like TimerController.tick: a split belongs to the chapter and
+        # subsection it ran in, i.e. as they were before this update.
+        closed, restarts, name, chapter = s.splits_closed, s.restarts, s.current_sub_name, s.current_chapter
+        s, _ = update_timer_state(s, snap)
+        res.ticks += 1
+        res.duration_ms = t_ms
+        if closed_segment(s, closed, restarts):
+            res.splits.append((chapter, s.last_sub_index, name, s.last_sub_duration_ms))
+    res.state = s
+    return res
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Replay snapshot recordings through the split logic.")
+    ap.add_argument("paths", nargs="+", help="Recording files (.ewrec).")
+    ap.add_argument("--json", action="store_true", help="Print the splits of every file as JSON.")
+    args = ap.parse_args()
+
+    results = []
+    ticks = 0
+    t0 = time.perf_counter()
+    for path in args.paths:
+        res = replay(path)
+        results.append(res)
+        ticks += res.ticks
+    dt = time.perf_counter() - t0
+
+    if args.json:
+        print(json.dumps({r.path: r.splits for r in results}, indent=1))
+        return
+
+    for r in results:
+        print(f"{r.path}: {r.ticks} ticks, {r.duration_ms / 1000:.0f}s recorded, {len(r.splits)} splits")
+    print(f"[i] {ticks} ticks in {dt:.3f}s ({ticks / dt if dt else 0:,.0f} ticks/s)")
+
+
+if __name__ == "__main__":
+    main()
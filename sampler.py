@@ -0,0 +1,52 @@
+# sampler.py
+
+import threading
+from typing import Optional
+
+from controller import TimerController
+from model import DisplayInfo
+
+
+class Sampler:
+    """
+    Owns a TimerController (and with it the MemoryReader and TimerState) and
+    ticks it on a dedicated thread whenever controller.next_poll_delay() says
+    so, so memory reads never wait on Tk and Tk never waits on memory reads.
+
+    The newest DisplayInfo is published through a single slot: `latest` is
+    replaced wholesale (an atomic attribute store), never mutated, so readers
+    on other threads just take whatever is there on their own cadence. While
+    nothing visible changes the controller hands back the same object, so
+    `latest is last_seen` means there is nothing new to render.
+    """
+    def __init__(self, controller: TimerController) -> None:
+        self.controller = controller
+        self.latest: Optional[DisplayInfo] = None
+        self.ticks = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and close the controller (on the caller's thread, after the join)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self.controller.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.latest = self.controller.tick()
+            except Exception as e:
+                print(f"[!] Sampler tick failed: {e}")
+            self.ticks += 1
+
+            # Sleep until the controller's next deadline; if we fell behind (slow
+            # read, attach, ...) go straight on rather than bursting missed ticks.
+            self._stop.wait(max(0.0, self.controller.next_poll_delay()))
@@ -0,0 +1,330 @@
+# sampler_daemon.py
+#
+# One process owns the game attach and the memory reads, and publishes every
+# snapshot to any number of local subscribers (the timer UI, the subsection
+# logger, ...), so running several tools at once doesn't multiply the
+# cross-process reads. Subscribers use RemoteMemoryReader in place of a
+# MemoryReader.
+#
+# Transport: a Unix socket, or TCP on localhost where AF_UNIX isn't available
+# (Windows). Each subscriber gets its own stream in the recording format
+# (recording.py): header, then one record per snapshot.
+#
+#   python sampler_daemon.py                    # default address
+#   python sampler_daemon.py --address HOST:PORT
+
+import argparse
+import collections
+import os
+import select
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import time
+from typing import Optional
+
+from config import ATTACH_RETRY_MIN_S, ATTACH_RETRY_MAX_S, FIELD_PERIODS_MS
+from model import GameSnapshot, CH_ALL
+from recording import HEADER_SIZE, SnapshotDecoder, SnapshotRecorder, parse_header
+
+if hasattr(socket, "AF_UNIX"):
+    DEFAULT_ADDRESS = os.path.join(tempfile.gettempdir(), "evilwithin-sampler.sock")
+else:
+    DEFAULT_ADDRESS = "127.0.0.1:47611"
+
+MAX_BACKLOG = 1 << 20  # bytes queued for one subscriber before it is dropped as stuck
+
+
+def parse_address(address: Optional[str]) -> tuple:
+    """(family, sockaddr) for a Unix socket path or "host:port" ("auto"/None = default)."""
+    if not address or address == "auto":
+        address = DEFAULT_ADDRESS
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and host and os.sep not in host:
+        return socket.AF_INET, (host, int(port))
+    if not hasattr(socket, "AF_UNIX"):
+        raise ValueError(f"Unix sockets aren't available here; use host:port, not {address!r}")
+    return socket.AF_UNIX, address
+
+
+class _Outbox:
+    """File-like sink for a SnapshotRecorder: collects the bytes to send."""
+    def __init__(self) -> None:
+        self.buf = bytearray()
+
+    def write(self, data) -> None:
+        self.buf += data
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class _Subscriber:
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.outbox = _Outbox()
+        self.recorder = SnapshotRecorder(self.outbox)  # header goes out first
+
+    def send(self) -> None:
+        buf = self.outbox.buf
+        if buf:
+            sent = self.sock.send(buf)
+            del buf[:sent]
+
+
+class SnapshotServer:
+    """
+    Publishes snapshots from `source` (anything with sample() -> GameSnapshot
+    and next_poll_delay() -> seconds, e.g. a TimerController) to every
+    connected subscriber. Runs on one thread: select() waits for the next
+    sample, new connections and sockets ready for the bytes they're owed.
+    """
+    def __init__(self, source, address: Optional[str] = None) -> None:
+        self.source = source
+        self.family, self.sockaddr = parse_address(address)
+        self.subscribers: dict[socket.socket, _Subscriber] = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self.listener = self._listen()
+
+    def _listen(self) -> socket.socket:
+        if self.family == getattr(socket, "AF_UNIX", None) and os.path.exists(self.sockaddr):
+            probe = socket.socket(self.family, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.sockaddr)
+                raise OSError(f"a sampler is already running at {self.sockaddr}")
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.unlink(self.sockaddr)  # stale socket from a crashed run
+            finally:
+                probe.close()
+        sock = socket.socket(self.family, socket.SOCK_STREAM)
+        if self.family == socket.AF_INET:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(self.sockaddr)
+        sock.listen()
+        sock.setblocking(False)
+        return sock
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def close(self) -> None:
+        for sub in list(self.subscribers.values()):
+            self._drop(sub)
+        self.listener.close()
+        if self.family == getattr(socket, "AF_UNIX", None):
+            try:
+                os.unlink(self.sockaddr)
+            except OSError:
+                pass
+
+    def _drop(self, sub: _Subscriber, why: str = "") -> None:
+        self.subscribers.pop(sub.sock, None)
+        sub.sock.close()
+        if why:
+            print(f"[-] Subscriber dropped: {why}")
+
+    def _accept(self) -> None:
+        try:
+            sock, _ = self.listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        sub = self.subscribers[sock] = _Subscriber(sock)
+        print(f"[+] Subscriber connected ({len(self.subscribers)} total)")
+        self._send(sub)
+
+    def _send(self, sub: _Subscriber) -> None:
+        try:
+            sub.send()
+        except BlockingIOError:
+            pass
+        except OSError as e:
+            self._drop(sub, str(e))
+            return
+        if len(sub.outbox.buf) > MAX_BACKLOG:
+            self._drop(sub, "not keeping up")
+
+    def publish(self, snap: GameSnapshot) -> None:
+        self.samples += 1
+        for sub in list(self.subscribers.values()):
+            sub.recorder.write(snap)
+            self._send(sub)
+
+    def serve_forever(self) -> None:
+        next_sample = time.monotonic()
+        while not self._stop.is_set():
+            timeout = max(0.0, next_sample - time.monotonic())
+            socks = list(self.subscribers)
+            writable = [s for s, sub in self.subscribers.items() if sub.outbox.buf]
+            readable, writable, _ = select.select([self.listener] + socks, writable, [], timeout)
+
+            for sock in readable:
+                if sock is self.listener:
+                    self._accept()
+                    continue
+                sub = self.subscribers.get(sock)
+                if sub is None:
+                    continue
+                try:
+                    if not sock.recv(4096):  # subscribers never send: data-less read = hung up
+                        self._drop(sub)
+                        print(f"[-] Subscriber disconnected ({len(self.subscribers)} left)")
+                except OSError as e:
+                    self._drop(sub, str(e))
+            for sock in writable:
+                sub = self.subscribers.get(sock)
+                if sub is not None:
+                    self._send(sub)
+
+            if time.monotonic() >= next_sample:
+                try:
+                    self.publish(self.source.sample())
+                except Exception as e:
+                    print(f"[!] Sample failed: {e}")
+                next_sample = time.monotonic() + max(0.0, self.source.next_poll_delay())
+
+
+def _detached() -> GameSnapshot:
+    return GameSnapshot(attached=False, igt_seconds=None, chapter_val=None, sub_name="")
+
+
+class RemoteMemoryReader:
+    """
+    Stand-in for MemoryReader that is fed by a sampler daemon instead of
+    reading the game. A background thread (re)connects with backoff and
+    decodes snapshots into a queue; read_snapshot() hands them out in order,
+    one per call, so no change between two reads is ever skipped. With the
+    queue empty it repeats the last snapshot with nothing marked changed.
+    While the daemon is unreachable it reports "not attached".
+    """
+    power_save = False  # the daemon already does the power saving
+
+    def __init__(self, address: Optional[str] = None, max_queued: int = 4096) -> None:
+        self.family, self.sockaddr = parse_address(address)
+        self.min_period_ms = min(p for p in FIELD_PERIODS_MS.values() if p)
+        self.queue: collections.deque = collections.deque(maxlen=max_queued)
+        self.last = _detached()
+        self.last_arrival = 0.0
+        self.connected = False
+        self._sock: Optional[socket.socket] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampler-client", daemon=True)
+        self._thread.start()
+
+    def read_snapshot(self, light: bool = False) -> GameSnapshot:
+        try:
+            self.last = self.queue.popleft()
+        except IndexError:
+            self.last.changed = 0
+        return self.last
+
+    def next_due(self) -> float:
+        """time.monotonic() of the next expected snapshot (now, if one is queued)."""
+        now = time.monotonic()
+        if self.queue:
+            return now
+        due = self.last_arrival + self.min_period_ms / 1000
+        return due if due > now else now + self.min_period_ms / 1000
+
+    def close(self) -> None:
+        self._stop.set()
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        delay = ATTACH_RETRY_MIN_S
+        while not self._stop.is_set():
+            sock = socket.socket(self.family, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.sockaddr)
+            except OSError:
+                sock.close()
+                self._stop.wait(delay)
+                delay = min(ATTACH_RETRY_MAX_S, delay * 2)
+                continue
+
+            delay = ATTACH_RETRY_MIN_S
+            self._sock = sock
+            self.connected = True
+            print(f"[+] Connected to sampler at {self.sockaddr}")
+            try:
+                self._receive(sock)
+            except OSError:
+                pass
+            finally:
+                self._sock = None
+                self.connected = False
+                sock.close()
+            if not self._stop.is_set():
+                print("[-] Sampler connection lost")
+                snap = _detached()
+                snap.changed = CH_ALL
+                self.queue.append(snap)
+
+    def _receive(self, sock: socket.socket) -> None:
+        header = b""
+        while len(header) < HEADER_SIZE:
+            chunk = sock.recv(HEADER_SIZE - len(header))
+            if not chunk:
+                return
+            header += chunk
+        try:
+            parse_header(header)
+        except ValueError:
+            print(f"[!] {self.sockaddr} is not a sampler")
+            return
+
+        decoder = SnapshotDecoder()
+        while not self._stop.is_set():
+            chunk = sock.recv(65536)
+            if not chunk:
+                return
+            for _, snap in decoder.feed(chunk):
+                self.queue.append(snap)
+            self.last_arrival = time.monotonic()
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Read the game once and publish snapshots to local subscribers.")
+    ap.add_argument("--address", default=None, help=f"Unix socket path or host:port (default {DEFAULT_ADDRESS}).")
+    args = ap.parse_args(argv)
+
+    from controller import TimerController
+    from memory_reader import MemoryReader
+
+    controller = TimerController(MemoryReader())
+    try:
+        server = SnapshotServer(controller, args.address)
+    except OSError as e:
+        print(f"[!] Could not listen: {e}")
+        sys.exit(1)
+    print(f"[+] Publishing snapshots at {server.sockaddr}")
+    print("[i] Press Ctrl+C to stop.\n")
+
+    def cleanup(*_):
+        server.stop()
+
+    signal.signal(signal.SIGINT, cleanup)
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, cleanup)
+    try:
+        server.serve_forever()
+    finally:
+        server.close()
+        controller.close()
+        print(f"\n[+] Stopped after {server.samples} samples.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+# signatures.py
+#
+# Locate the game's offsets by byte pattern (array-of-bytes signatures)
+# instead of trusting the numbers hard-coded for one build. Configured in
+# config.SIGNATURES; any offset without a signature, or whose signature isn't
+# found, keeps its built-in value.
+#
+# Scans read the module's readable regions in large chunks (overlapping by
+# one pattern length, so a match straddling a chunk edge is still found),
+# optionally on a thread pool. Results are cached on disk per executable
+# (size + SHA-256), so only the first launch of a build pays for the scan.
+#
+#   python signatures.py --image dump.ewimg     # scan a dump, print what was found
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+from config import PROC_NAME, SCAN_CHUNK_BYTES, SCAN_WORKERS, SIGNATURE_CACHE, SIGNATURES
+from memory_backend import MemoryBackend, MemoryReadError
+
+_I32 = struct.Struct("<i")
+_U32 = struct.Struct("<I")
+
+
+@dataclass(frozen=True)
+class Signature:
+    """
+    pattern  hex bytes, "??" for any byte: "48 8B 05 ?? ?? ?? ?? 48 85 C0"
+    kind     "rip":   the match holds a RIP-relative disp32 at `at`; the value
+                      is (match + end + disp) - module base, i.e. a module-
+                      relative offset like BASE_OFFSET or OFFSETS["chapter_rel"]
+             "imm32": the value is the u32 at match + `at` (e.g. a struct
+                      field offset like OFFSETS["subA_off"])
+             "imm8":  the value is the u8 at match + `at` (a field offset
+                      encoded as disp8, like the 0x68 in POINTER_OFFSETS)
+    at       offset of the disp32 / imm32 / imm8 in the match
+    end      "rip" only: offset of the next instruction (disp is relative to it)
+    """
+    pattern: str
+    kind: str = "rip"
+    at: int = 0
+    end: int = 0
+
+    def compile(self) -> re.Pattern:
+        out = []
+        for tok in self.pattern.split():
+            if tok in ("?", "??"):
+                out.append(b".")
+            else:
+                out.append(re.escape(bytes((int(tok, 16),))))
+        return re.compile(b"".join(out), re.DOTALL)
+
+    @property
+    def size(self) -> int:
+        return len(self.pattern.split())
+
+    def value(self, mem: MemoryBackend, match: int, base: int) -> int:
+        if self.kind == "rip":
+            (disp,) = _I32.unpack(bytes(mem.read(match + self.at, 4)))
+            return match + self.end + disp - base
+        if self.kind == "imm32":
+            (imm,) = _U32.unpack(bytes(mem.read(match + self.at, 4)))
+            return imm
+        if self.kind == "imm8":
+            return bytes(mem.read(match + self.at, 1))[0]
+        raise ValueError(f"Unknown signature kind {self.kind!r}")
+
+
+def load_signatures(specs: dict) -> dict[str, Signature]:
+    """config.SIGNATURES entries (name: (pattern, kind, at, end) or a dict) as Signatures."""
+    sigs = {}
+    for name, spec in specs.items():
+        sigs[name] = Signature(**spec) if isinstance(spec, dict) else Signature(*spec)
+    return sigs
+
+
+# --------------------- scanning ---------------------
+def _chunks(regions, chunk_size: int, overlap: int):
+    """(start, owned_end, read_end): each chunk owns matches starting before owned_end."""
+    for start, end in regions:
+        for s in range(start, end, chunk_size):
+            owned = min(s + chunk_size, end)
+            yield s, owned, min(owned + overlap, end)
+
+
+def scan(mem: MemoryBackend, regions, patterns: dict[str, re.Pattern], overlap: int,
+         chunk_size: int = SCAN_CHUNK_BYTES, workers: int = SCAN_WORKERS) -> dict[str, list[int]]:
+    """Addresses of every match of each pattern within `regions`, ascending."""
+    def scan_chunk(chunk) -> dict:
+        start, owned, read_end = chunk
+        try:
+            data = mem.read(start, read_end - start)
+        except MemoryReadError:
+            return {}  # the region went away under us
+        hits = {}
+        limit = owned - start
+        for name, rx in patterns.items():
+            for m in rx.finditer(data):
+                if m.start() >= limit:
+                    break  # in the overlap: the next chunk owns it
+                hits.setdefault(name, []).append(start + m.start())
+        return hits
+
+    chunks = list(_chunks(regions, chunk_size, overlap))
+    if workers > 1 and len(chunks) > 1:
+        # Reads release the GIL; the regex search doesn't, so this mostly
+        # overlaps cross-process reads with matching.
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sig-scan") as pool:
+            results = list(pool.map(scan_chunk, chunks))
+    else:
+        results = [scan_chunk(c) for c in chunks]
+
+    found: dict[str, list[int]] = {}
+    for hits in results:  # chunks are in address order
+        for name, addrs in hits.items():
+            found.setdefault(name, []).extend(addrs)
+    return found
+
+
+def scan_module(mem: MemoryBackend, name: str, base: int, sigs: dict[str, Signature],
+                chunk_size: int = SCAN_CHUNK_BYTES, workers: int = SCAN_WORKERS) -> dict[str, int]:
+    """Values of the signatures found in module `name`; ambiguous ones take the first match."""
+    patterns = {n: sig.compile() for n, sig in sigs.items()}
+    overlap = max(sig.size for sig in sigs.values()) - 1
+    found = scan(mem, mem.module_regions(name), patterns, overlap, chunk_size, workers)
+    values = {}
+    for n, sig in sigs.items():
+        addrs = found.get(n)
+        if not addrs:
+            continue
+        if len(addrs) > 1:
+            print(f"[!] Signature {n} matched {len(addrs)} times; using the first (0x{addrs[0]:X})")
+        try:
+            values[n] = sig.value(mem, addrs[0], base)
+        except MemoryReadError:
+            pass
+    return values
+
+
+# --------------------- cache ---------------------
+def file_fingerprint(path: str, known: dict) -> Optional[str]:
+    """
+    "<size>:<sha256>" of a file. `known` remembers path -> [size, mtime_ns,
+    fingerprint] so an unchanged file isn't hashed again.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    memo = known.get(path)
+    if memo and memo[0] == st.st_size and memo[1] == st.st_mtime_ns:
+        return memo[2]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    fp = f"{st.st_size}:{h.hexdigest()}"
+    known[path] = [st.st_size, st.st_mtime_ns, fp]
+    return fp
+
+
+def image_fingerprint(mem: MemoryBackend, regions, base: int) -> str:
+    """Without the file: mapped size + SHA-256 of the PE headers (build timestamp, checksum)."""
+    size = sum(end - start for start, end in regions)
+    return f"mem{size}:{hashlib.sha256(bytes(mem.read(base, 0x1000))).hexdigest()}"
+
+
+def _signatures_digest(sigs: dict[str, Signature]) -> str:
+    raw = json.dumps({n: [s.pattern, s.kind, s.at, s.end] for n, s in sorted(sigs.items())})
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def _load_cache(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {"files": {}, "builds": {}}
+    cache.setdefault("files", {})
+    cache.setdefault("builds", {})
+    return cache
+
+
+def _save_cache(path: str, cache: dict) -> None:
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=1)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[!] Could not save the signature cache {path}: {e}")
+
+
+def resolve_offsets(mem: MemoryBackend, base: int, defaults: dict, name: str = PROC_NAME,
+                    specs: dict = SIGNATURES, cache_path: Optional[str] = SIGNATURE_CACHE) -> dict:
+    """
+    `defaults` with every offset that has a signature replaced by what the
+    signature finds in this build (cached per executable). Never raises for
+    a missing or unscannable signature: those keep their default.
+    """
+    offsets = dict(defaults)
+    if not specs:
+        return offsets
+    sigs = {n: s for n, s in load_signatures(specs).items() if n in defaults}
+    for n in specs.keys() - sigs.keys():
+        print(f"[!] Signature {n} doesn't name a known offset; ignored")
+    if not sigs:
+        return offsets
+
+    try:
+        regions = mem.module_regions(name)
+        path = mem.module_path(name)
+    except (AttributeError, LookupError, OSError) as e:
+        print(f"[!] Can't scan {name} for signatures ({e}); using built-in offsets")
+        return offsets
+
+    cache = _load_cache(cache_path) if cache_path else {"files": {}, "builds": {}}
+    fp = (path and file_fingerprint(path, cache["files"])) or image_fingerprint(mem, regions, base)
+    digest = _signatures_digest(sigs)
+    entry = cache["builds"].get(fp)
+    if entry is not None and entry.get("signatures") == digest:
+        offsets.update(entry["offsets"])
+        return offsets
+
+    t0 = time.perf_counter()
+    found = scan_module(mem, name, base, sigs)
+    dt = time.perf_counter() - t0
+    size = sum(end - start for start, end in regions)
+    print(f"[+] Signature scan: {len(found)}/{len(sigs)} found in {size / 1e6:.0f} MB, {dt:.2f}s")
+    for n in sigs.keys() - found.keys():
+        print(f"[!] Signature {n} not found; using the built-in offset 0x{defaults[n]:X}")
+    offsets.update(found)
+
+    if cache_path:
+        cache["builds"][fp] = {"signatures": digest, "offsets": found}
+        _save_cache(cache_path, cache)
+    return offsets
+
+
+def main() -> None:
+    from memory_backend import BACKENDS, open_backend
+    from memory_reader import default_offsets
+
+    ap = argparse.ArgumentParser(description="Scan the game (or a dump) for config.SIGNATURES.")
+    ap.add_argument("--backend", choices=BACKENDS, default="auto")
+    ap.add_argument("--pid", type=int, default=None)
+    ap.add_argument("--image", type=str, default=None, help="Memory image file for --backend image.")
+    ap.add_argument("--no-cache", action="store_true", help="Always scan, and don't update the cache.")
+    args = ap.parse_args()
+
+    mem = open_backend(PROC_NAME, args.backend, pid=args.pid, image=args.image)
+    if mem is None:
+        print(f"[!] Could not find process '{PROC_NAME}'.")
+        return
+    try:
+        base = mem.module_base(PROC_NAME)
+        defaults = default_offsets()
+        offsets = resolve_offsets(mem, base, defaults, cache_path=None if args.no_cache else SIGNATURE_CACHE)
+        for n, v in offsets.items():
+            note = "" if v == defaults[n] else f"  (built-in 0x{defaults[n]:X})"
+            print(f"{n:<16} 0x{v:X}{note}")
+    finally:
+        mem.close()
+
+
+if __name__ == "__main__":
+    main()
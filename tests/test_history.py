@@ -0,0 +1,70 @@
+# tests/test_history.py
+#
+# SplitHistory's aggregates: best, sum of best and when an attempt is a PB.
+
+from history import SplitHistory
+
+
+def run(h: SplitHistory, chapter: int, segments: dict) -> None:
+    for i, (sub, ms) in enumerate(segments.items(), 1):
+        h.add_segment(chapter, sub, i, ms)
+
+
+def test_best_and_sum_of_best(tmp_path):
+    h = SplitHistory(str(tmp_path / "h.db"))
+    run(h, 1, {"A": 10000, "B": 20000})
+    run(h, 1, {"A": 12000, "B": 15000})
+    assert h.best == {(1, "A"): 10000, (1, "B"): 15000}
+    assert h.sum_of_best == {1: 25000}
+    assert h.attempts == {(1, "A"): 2, (1, "B"): 2}
+    h.close()
+
+
+def test_partial_first_attempt_doesnt_block_a_full_run(tmp_path):
+    h = SplitHistory(str(tmp_path / "h.db"))
+    run(h, 1, {"A": 10000})
+    h.chapter_changed(2)
+    assert h.pb == {1: 10000}            # all of chapter 1 known so far
+
+    run(h, 1, {"A": 10000, "B": 20000, "C": 30000})
+    assert 1 not in h.pb                 # B and C weren't in it
+    h.chapter_changed(2)
+    assert h.pb == {1: 60000}
+    assert h.sum_of_best == {1: 60000}
+    h.close()
+
+    reopened = SplitHistory(str(tmp_path / "h.db"))
+    assert reopened.pb == {1: 60000}
+    reopened.close()
+
+
+def test_only_a_chapter_change_finishes_an_attempt(tmp_path):
+    h = SplitHistory(str(tmp_path / "h.db"))
+    run(h, 1, {"A": 10000, "B": 20000})
+    h.chapter_changed(-1)                # loading screen: chapter unreadable
+    h.chapter_changed(1)
+    assert h.pb == {}
+    h.close()                            # mid-chapter: not a finished attempt
+    assert h.pb == {}
+
+    reopened = SplitHistory(str(tmp_path / "h.db"))
+    assert reopened.pb == {}
+    run(reopened, 1, {"A": 9000, "B": 19000})
+    reopened.end_attempt()               # abandoned (quickload)
+    assert reopened.pb == {}
+    reopened.close()
+
+
+def test_stale_pb_on_disk_is_dropped(tmp_path):
+    path = str(tmp_path / "h.db")
+    h = SplitHistory(path)
+    run(h, 1, {"A": 10000})
+    h.chapter_changed(2)
+    h.close()
+
+    h = SplitHistory(path)
+    run(h, 1, {"A": 10000, "B": 5000})
+    h.close()                            # B is known now; the A-only PB is gone, on disk too
+    reopened = SplitHistory(path)
+    assert reopened.pb == {}
+    reopened.close()
@@ -0,0 +1,59 @@
+# tests/test_igt_chain.py
+#
+# CachedPointerChain: one read per IGT in the steady state, and a re-walk
+# whenever the cached address may have gone stale.
+
+from benchmarks.fake_memory import FakeGame
+from config import BASE_OFFSET, IGT_CHAIN_REWALK_MS, POINTER_OFFSETS
+from memory_reader import CachedPointerChain, MemoryReader, igt_plausible
+
+
+
+def move_igt(game: FakeGame) -> int:
+    """Rebuild IGT's object 0x100 further on (same page), as a reload might; the old address."""
+    old = game.igt_addr
+    game.move_igt(old - POINTER_OFFSETS[-1] + 0x100)
+    return old
+
+
+def chain() -> CachedPointerChain:
+    return CachedPointerChain(BASE_OFFSET, POINTER_OFFSETS, igt_plausible, IGT_CHAIN_REWALK_MS)
+
+
+def test_rewalks_after_rewalk_ms_not_before():
+    game = FakeGame()
+    game.set_igt(100)
+    c = chain()
+    assert c.read_int(game.mem, game.base, 0.0) == 100
+
+    move_igt(game)                       # the guard can't see this: old address still says 100
+    game.set_igt(101)
+    game.mem.reads = 0
+    assert c.read_int(game.mem, game.base, IGT_CHAIN_REWALK_MS / 1000 - 0.1) == 100
+    assert game.mem.reads == 1
+    assert c.read_int(game.mem, game.base, IGT_CHAIN_REWALK_MS / 1000) == 101
+
+
+def test_igt_going_backwards_rewalks():
+    game = FakeGame()
+    game.set_igt(900)
+    c = chain()
+    assert c.read_int(game.mem, game.base, 0.0) == 900
+
+    old = move_igt(game)                 # quickload: new object, old one reused for something smaller
+    game.set_igt(880)
+    game.mem.write(old, (3).to_bytes(4, "little"))
+    assert c.read_int(game.mem, game.base, 0.1) == 880
+
+
+def test_loading_screen_drops_the_cached_address():
+    game = FakeGame()
+    game.set_igt(100)
+    reader = MemoryReader(game.mem)
+    assert reader.read_snapshot(light=True).igt_seconds == 100
+
+    game.set_chapter(-1)
+    reader.read_snapshot(light=True)
+    move_igt(game)                       # rebuilt during the load, still loading
+    game.set_igt(120)
+    assert reader.read_snapshot(light=True).igt_seconds == 120
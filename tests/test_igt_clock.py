@@ -0,0 +1,63 @@
+# tests/test_igt_clock.py
+#
+# IgtClock: milliseconds from a whole-second IGT, read about every 100 ms.
+
+from igt_clock import IgtClock
+
+MS = 1_000_000
+POLL = 97    # not a divisor of 1000, so read times drift across the second, as jitter makes them
+PHASE = 370  # game time at t=0 is 600.370 s
+
+
+def game_ms(t_ms: int, paused_at: int = None, resumed_at: int = None) -> int:
+    if paused_at is not None and t_ms > paused_at:
+        t_ms = paused_at if resumed_at is None or t_ms < resumed_at else t_ms - (resumed_at - paused_at)
+    return 600_000 + PHASE + t_ms
+
+
+def run(clock: IgtClock, start: int, end: int, **pause) -> list:
+    """Read IGT every POLL ms over [start, end); (t_ms, shown, true) per read."""
+    out = []
+    for t in range(start, end, POLL):
+        true = game_ms(t, **pause)
+        clock.observe(true // 1000, t * MS)
+        out.append((t, clock.ms_at(t * MS), true))
+    return out
+
+
+def test_unsynced_until_a_step_and_none_without_igt():
+    clock = IgtClock()
+    assert clock.ms_at(0) is None
+    clock.observe(600, 0)
+    assert clock.ms_at(50 * MS) == 600_000
+    clock.observe(None, 100 * MS)
+    assert clock.ms_at(100 * MS) is None
+
+
+def test_interpolates_within_the_poll_period_then_tightens():
+    reads = run(IgtClock(), 0, 5000)
+    synced = [(t, shown, true) for t, shown, true in reads if t > 700]
+    assert all(abs(shown - true) <= 100 for _, shown, true in synced)
+    assert all(abs(shown - true) <= 60 for t, shown, true in synced if t > 2000)
+
+
+def test_quickload_forgets_the_phase():
+    clock = IgtClock()
+    run(clock, 0, 3000)
+    clock.observe(570, 3000 * MS)        # back 30 s
+    assert not clock.synced
+    assert clock.ms_at(3050 * MS) == 570_000
+
+
+def test_pause_holds_at_the_last_value_shown():
+    clock = IgtClock()
+    reads = run(clock, 0, 8000, paused_at=4250, resumed_at=7000)  # phase known to ~30 ms by then
+    shown_while_paused = [shown for t, shown, _ in reads if 4250 < t < 7000]
+    frozen = game_ms(4250)
+    assert max(shown_while_paused) < (frozen // 1000 + 1) * 1000   # never into a second that didn't happen
+    held = shown_while_paused[-1]
+    assert shown_while_paused[-20:] == [held] * 20                  # held...
+    assert held % 1000 < 999                                        # ...not run on to .999
+    assert all(b >= a for a, b in zip(shown_while_paused, shown_while_paused[1:]))  # never backwards
+    after = [shown for t, shown, _ in reads if t > 7100]
+    assert after[-1] > held                                         # moves again once IGT does
@@ -0,0 +1,35 @@
+# tests/test_power_save.py
+#
+# A split made while IGT is frozen (a door, a load) must not wait for IGT to
+# move again: power save keeps reading subB, and the split is timed at the
+# frozen IGT.
+
+import controller
+from benchmarks.fake_memory import FakeGame
+from controller import MODE_ACTIVE, MODE_IDLE, TimerController
+from memory_reader import MemoryReader
+
+
+def test_split_while_igt_is_frozen_is_seen_in_power_save(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(controller.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(controller.time, "monotonic_ns", lambda: int(now[0] * 1e9))
+    game = FakeGame()
+    game.set_igt(100)
+    game.set_subA("A")
+    ctl = TimerController(reader=MemoryReader(game.mem))
+    try:
+        for _ in range(40):              # IGT stops at 101 (a loading screen)
+            if now[0] < 2:
+                game.set_igt(100 + int(now[0]))
+            ctl.tick()
+            now[0] += 0.1
+        assert ctl.mode == MODE_IDLE
+
+        game.set_subB("B1")              # the split, IGT still frozen
+        ctl.tick()
+        assert ctl.mode == MODE_ACTIVE
+        assert ctl.state.current_sub_name == "B1"
+        assert ctl.state.last_sub_duration_ms <= 2999
+    finally:
+        ctl.close()
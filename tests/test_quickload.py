@@ -0,0 +1,57 @@
+# tests/test_quickload.py
+#
+# A quickload back to an earlier checkpoint must not record a split for the
+# subsection the player abandoned, nor end the abandoned attempt as a PB.
+#
+#   python -m pytest tests
+
+from controller import TimerController
+from history import SplitHistory
+from model import GameSnapshot
+from split_stats import SplitStats
+
+
+class ScriptedReader:
+    """Hands TimerController the snapshots it is given, one per tick."""
+    power_save = False
+    min_period_ms = 100
+
+    def __init__(self) -> None:
+        self.snap = None
+
+    def read_snapshot(self, light: bool = False) -> GameSnapshot:
+        return self.snap
+
+    def next_due(self) -> float:
+        return 0.0
+
+    def close(self) -> None:
+        pass
+
+
+def play(ctl: TimerController, igt: int, subA: str, subB: str, chapter: int = 1) -> None:
+    ctl.reader.snap = GameSnapshot(attached=True, igt_seconds=igt, chapter_val=chapter,
+                                   sub_name=subB or subA, subA_name=subA, subB_name=subB)
+    ctl.tick()
+
+
+def test_quickload_to_earlier_checkpoint_keeps_best_and_pb(tmp_path):
+    history = SplitHistory(str(tmp_path / "history.db"))
+    stats = SplitStats(str(tmp_path / "stats.json"))
+    ctl = TimerController(reader=ScriptedReader(), history=history, stats=stats)
+
+    play(ctl, 100, "A", "")
+    play(ctl, 110, "A", "B1")    # A: 10 s
+    play(ctl, 130, "A", "B2")    # B1: 20 s
+    play(ctl, 140, "A", "B2")
+    best, pb, sob = dict(history.best), dict(history.pb), dict(history.sum_of_best)
+    assert best == {(1, "A"): 10000, (1, "B1"): 20000}
+
+    play(ctl, 112, "A", "B1")    # quickload back to the B1 checkpoint, B2 never finished
+    play(ctl, 113, "A", "B1")
+    assert history.best == best
+    assert history.sum_of_best == sob
+    assert (1, "B2") not in stats.stats
+
+    ctl.close()                  # ends the attempt in progress
+    assert history.pb == pb == {}
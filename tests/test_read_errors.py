@@ -0,0 +1,61 @@
+# tests/test_read_errors.py
+#
+# CircuitBreaker: skip a field that keeps failing, probe it with capped
+# backoff, and take it back on the first good read. ErrorReporter: one line
+# per key per interval, with the count of what it held back.
+
+from read_errors import CircuitBreaker, ErrorReporter
+
+
+def breaker() -> CircuitBreaker:
+    return CircuitBreaker(threshold=3, probe_min_s=0.1, probe_max_s=0.25)
+
+
+def test_opens_after_threshold_failures_in_a_row():
+    b = breaker()
+    assert not b.failure(0.0)
+    assert not b.failure(0.1)
+    b.success()                       # the run is broken: count starts over
+    assert not b.failure(0.2)
+    assert not b.failure(0.3)
+    assert b.allow(0.35)
+    assert b.failure(0.4)             # third in a row: open
+    assert b.open
+    assert not b.allow(0.45)
+    assert b.allow(0.5)               # probe_min later
+
+
+def test_backoff_doubles_up_to_the_cap():
+    b = breaker()
+    for t in (0.0, 0.0, 0.0):
+        b.failure(t)
+    now, gaps = 0.0, []
+    for _ in range(4):                # failed probes
+        now = b.next_probe
+        assert b.allow(now)
+        assert not b.failure(now)
+        gaps.append(round(b.next_probe - now, 3))
+    assert gaps == [0.2, 0.25, 0.25, 0.25]
+
+
+def test_first_good_probe_closes_it():
+    b = breaker()
+    for t in (0.0, 0.0, 0.0, 0.1, 0.3):
+        b.failure(t)
+    assert b.success() == 5
+    assert not b.open and b.allow(0.31)
+    for t in (1.0, 1.0, 1.0):         # opens again from the minimum backoff
+        b.failure(t)
+    assert b.next_probe == 1.1
+
+
+def test_reporter_prints_once_per_interval(capsys):
+    r = ErrorReporter(interval_s=10)
+    r.report("igt", "IGT unreadable", 0.0)
+    for t in (1.0, 2.0, 3.0):
+        r.report("igt", "IGT unreadable", t)
+    r.flush(5.0)
+    assert capsys.readouterr().out == "[!] IGT unreadable\n"
+    r.flush(10.0)
+    assert capsys.readouterr().out == "[!] IGT unreadable (x3 in 9s)\n"
+    assert r.to_json() == {"igt": {"count": 4, "last": "[!] IGT unreadable"}}
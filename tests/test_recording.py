@@ -0,0 +1,89 @@
+# tests/test_recording.py
+#
+# The .ewrec codec: zigzag varint deltas and interned strings must decode to
+# exactly the snapshots written, however the stream is split up.
+
+import io
+
+from model import GameSnapshot
+from recording import SnapshotDecoder, SnapshotReader, SnapshotRecorder, _unzigzag, _varint, _zigzag
+
+FIELDS = ("attached", "igt_seconds", "chapter_val", "sub_name", "subA_name", "subB_name", "map_name", "igt_ms")
+
+
+def snap(igt, chapter=3, subA="CH03_Start", subB="", igt_ms=None, attached=True) -> GameSnapshot:
+    if igt_ms is None and igt is not None:
+        igt_ms = igt * 1000  # what the reader gives for whole seconds
+    return GameSnapshot(attached=attached, igt_seconds=igt, chapter_val=chapter, sub_name=subB or subA,
+                        subA_name=subA, subB_name=subB, map_name="Village", igt_ms=igt_ms)
+
+
+SESSION = [
+    snap(600),
+    snap(600, igt_ms=600250),
+    snap(601, subB="CH03_Village_Church"),
+    snap(575, subB="CH03_Start"),               # quickload: IGT goes back
+    snap(None, chapter=None, subA="", subB=""), # loading
+    snap(2_000_000, chapter=-1),                # large and negative deltas
+    snap(2_000_001, subB="Ünïcode_房間"),
+    snap(2_000_001, subB="CH03_Village_Church"),  # a name seen before: no new string
+    snap(0, chapter=0, subA="", attached=False),
+]
+
+
+def record(snaps) -> bytes:
+    buf = io.BytesIO()
+    rec = SnapshotRecorder(buf, start_unix_ms=1_700_000_000_000)
+    for i, s in enumerate(snaps):
+        rec.write(s, t_ms=1000 + i * 100)
+    return buf.getvalue()
+
+
+def fields(s: GameSnapshot) -> tuple:
+    return tuple(getattr(s, f) for f in FIELDS)
+
+
+def test_zigzag_and_varint():
+    for v in (0, 1, -1, 63, -64, 64, 2 ** 31 - 1, -2 ** 31, 2 ** 40):
+        assert _unzigzag(_zigzag(v)) == v
+        assert _zigzag(v) >= 0
+    out = bytearray()
+    _varint(300, out)
+    assert out == b"\xac\x02"
+    out = bytearray()
+    _varint(127, out)
+    assert out == b"\x7f"
+
+
+def test_round_trip():
+    reader = SnapshotReader(record(SESSION))
+    assert reader.start_unix_ms == 1_700_000_000_000
+    decoded = list(reader)
+    assert [fields(s) for _, s in decoded] == [fields(s) for s in SESSION]
+    assert [t for t, _ in decoded] == [i * 100 for i in range(len(SESSION))]
+
+
+def test_strings_are_interned_once():
+    data = record(SESSION)
+    assert data.count(b"CH03_Village_Church") == 1
+    assert data.count("Ünïcode_房間".encode()) == 1
+
+
+def test_steady_tick_is_two_bytes():
+    head = record(SESSION[:1])
+    assert len(record(SESSION[:1] * 2)) - len(head) == 2
+
+
+def test_split_stream_decodes_the_same():
+    body = record(SESSION)[16:]
+    dec = SnapshotDecoder()
+    out = []
+    for i in range(len(body)):            # byte by byte, as a socket might deliver it
+        out.extend(dec.feed(body[i:i + 1]))
+    assert [fields(s) for _, s in out] == [fields(s) for s in SESSION]
+
+
+def test_truncated_record_is_ignored():
+    data = record(SESSION)
+    decoded = list(SnapshotReader(data[:-1]))
+    assert [fields(s) for _, s in decoded] == [fields(s) for s in SESSION[:-1]]
@@ -0,0 +1,85 @@
+# tests/test_region_index.py
+#
+# RegionIndex keeps the target's readable spans; MemoryReader uses it to turn
+# down bad pointers without a read, and must not mistake an unreadable field
+# for a new value.
+
+import time
+
+from benchmarks.fake_memory import FakeGame, FakeProcess
+from memory_backend import RegionIndex
+from memory_reader import MemoryReader
+
+PAGE = 0x1000
+
+
+class PointQueryProcess(FakeProcess):
+    """FakeProcess with region_at(), like the pymem backend's VirtualQueryEx."""
+    def __init__(self) -> None:
+        super().__init__()
+        self.queried = 0
+
+    def region_at(self, addr: int):
+        self.queried += 1
+        page = addr - addr % PAGE
+        return (page, page + PAGE) if page in self.pages else None
+
+
+def test_spans_merge_and_bound_reads():
+    mem = FakeProcess()
+    mem.map(0x10000, 2 * PAGE)
+    mem.map(0x40000, PAGE)
+    index = RegionIndex(mem)
+    assert index.contains(0x10000, 2 * PAGE)     # two adjacent pages, one span
+    assert index.contains(0x40FF0, 0x10)
+    assert not index.contains(0x40FF0, 0x11)     # runs off the end
+    assert not index.contains(0x30000, 4)
+    assert not index.contains(0, 8)
+    assert index.starts == [0x10000, 0x40000]
+
+
+def test_miss_asks_region_at_and_remembers():
+    mem = PointQueryProcess()
+    mem.map(0x10000, PAGE)
+    index = RegionIndex(mem)
+    assert index.contains(0x10000, 8)
+    mem.map(0x11000, PAGE)                       # mapped after the index was built
+    assert index.contains(0x11000, 8)
+    assert mem.queried == 1
+    assert index.contains(0x10FF0, 0x20)         # merged with the page before it
+    assert mem.queried == 1
+    assert not index.contains(0x50000, 8)
+
+
+def test_discard_and_learn():
+    mem = FakeProcess()
+    mem.map(0x10000, PAGE)
+    index = RegionIndex(mem, refresh_min_s=60)
+    assert index.contains(0x10000, 8)
+    mem.pages.clear()
+    index.discard(0x10008)                       # a read there failed after all
+    assert not index.contains(0x10000, 8)
+
+    mem.map(0x20000, PAGE)
+    assert not index.contains(0x20000, 8)        # rebuilt too recently to look again
+    index.learn(0x20000)                         # a probe read it anyway
+    assert index.contains(0x20000, 8)
+
+
+def test_unreadable_chapter_is_not_a_chapter_change(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(time, "monotonic_ns", lambda: int(now[0] * 1e9))
+    game = FakeGame()
+    game.set_map("CH01_Asylum")
+    reader = MemoryReader(game.mem)
+    reader.read_snapshot()
+    assert reader.scheduler.next_at["map"] is None   # read; next only on a chapter change
+
+    chapter = game.base + game.offsets["chapter_rel"]
+    page = game.mem.pages.pop(chapter - chapter % PAGE)
+    assert reader.read_snapshot(light=True).chapter_val == -1
+    game.mem.pages[chapter - chapter % PAGE] = page
+    now[0] += 1                                  # past the index's rebuild limit
+    assert reader.read_snapshot(light=True).chapter_val == 1
+    assert reader.scheduler.next_at["map"] is None
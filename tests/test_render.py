@@ -0,0 +1,36 @@
+# tests/test_render.py
+#
+# TimerWindow's LabelRenderer, without a display: only labels whose text
+# changed are touched.
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+from model import TEXT_FIELDS, DisplayInfo  # noqa: E402
+from ui_tk import LabelRenderer  # noqa: E402
+
+
+class Label:
+    def __init__(self) -> None:
+        self.text = None
+        self.updates = 0
+
+    def config(self, text: str) -> None:
+        self.text = text
+        self.updates += 1
+
+
+def info(**texts) -> DisplayInfo:
+    return DisplayInfo(**{f: texts.get(f, "") for f in TEXT_FIELDS})
+
+
+def test_only_changed_labels_are_updated():
+    labels = {f: Label() for f in TEXT_FIELDS}
+    r = LabelRenderer(labels)
+    r.render(info(time_text="00:10:00.0", chapter_text="3"))
+    assert r.widget_updates == len(TEXT_FIELDS)
+    r.render(info(time_text="00:10:00.1", chapter_text="3"))
+    assert r.widget_updates == len(TEXT_FIELDS) + 1
+    assert labels["time_text"].text == "00:10:00.1"
+    assert labels["chapter_text"].updates == 1
@@ -0,0 +1,37 @@
+# tests/test_scalar_field.py
+#
+# ScalarField answers what read_int_auto would, without re-deciding the
+# layout on every read.
+
+from benchmarks.fake_memory import FakeProcess
+from evil_within_subsection_logger_v2 import ScalarField, chapter_plausible, read_int_auto
+
+ADDR = 0x140001000
+
+
+def field(mem: FakeProcess) -> ScalarField:
+    return ScalarField(mem, lambda: ADDR, "chapter", chapter_plausible)
+
+
+def test_zero_reads_as_minus_one_like_read_int_auto():
+    mem = FakeProcess()
+    mem.write(ADDR, bytes(8))
+    assert field(mem).read() == read_int_auto(mem, ADDR) == -1
+
+
+def test_layout_is_cached_once_a_value_proves_it():
+    mem = FakeProcess()
+    mem.write(ADDR, (3).to_bytes(8, "little"))
+    f = field(mem)
+    assert f.read() == 3
+    mem.write(ADDR, (4).to_bytes(8, "little"))
+    mem.reads = 0
+    assert f.read() == 4
+    assert mem.reads == 1                # direct layout: one read
+    assert read_int_auto(mem, ADDR) == 4
+
+
+def test_unreadable_address():
+    f = field(FakeProcess())
+    assert f.read() is None
+    assert f.error is not None
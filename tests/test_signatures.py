@@ -0,0 +1,85 @@
+# tests/test_signatures.py
+#
+# The chunked AOB scan must find a match wherever it sits relative to the
+# chunk edges, exactly once, and decode each signature kind's value.
+
+import pytest
+
+from benchmarks.fake_memory import FakeProcess
+from signatures import Signature, resolve_offsets, scan, scan_module
+
+BASE = 0x140000000
+SIZE = 0x400
+CHUNK = 64
+RIP = Signature("48 8B 05 ?? ?? ?? ?? 48 85 C0", "rip", at=3, end=7)
+
+
+class FakeModule(FakeProcess):
+    """A FakeProcess holding one module, as the backends describe it to the scanner."""
+    def __init__(self, code: bytes) -> None:
+        super().__init__()
+        self.write(BASE, code)
+        self.modules["game.exe"] = BASE
+
+    def module_regions(self, name: str):
+        return [(BASE, BASE + SIZE)]
+
+    def module_path(self, name: str):
+        return None
+
+
+def code_with(at: int, insn: bytes) -> bytes:
+    code = bytearray(b"\xCC" * SIZE)
+    code[at:at + len(insn)] = insn
+    return bytes(code)
+
+
+def rip_insn(disp: int) -> bytes:
+    return b"\x48\x8B\x05" + disp.to_bytes(4, "little", signed=True) + b"\x48\x85\xC0"
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_match_found_once_wherever_it_straddles_a_chunk(workers):
+    rx = {"p": RIP.compile()}
+    for at in range(CHUNK - RIP.size - 1, CHUNK + 2):   # before, across and just past the first edge
+        mem = FakeModule(code_with(at, rip_insn(0)))
+        found = scan(mem, [(BASE, BASE + SIZE)], rx, overlap=RIP.size - 1, chunk_size=CHUNK, workers=workers)
+        assert found == {"p": [BASE + at]}, at
+
+
+def test_matches_in_every_chunk_come_back_in_order():
+    code = bytearray(b"\xCC" * SIZE)
+    spots = [0, CHUNK - 3, 3 * CHUNK - 5, SIZE - RIP.size]
+    for at in spots:
+        code[at:at + RIP.size] = rip_insn(0)
+    mem = FakeModule(bytes(code))
+    found = scan(mem, [(BASE, BASE + SIZE)], {"p": RIP.compile()}, RIP.size - 1, CHUNK, workers=4)
+    assert found["p"] == [BASE + at for at in spots]
+
+
+def test_signature_kinds():
+    code = bytearray(b"\xCC" * SIZE)
+    code[0x100:0x10A] = rip_insn(0x1000)
+    code[0x200:0x208] = b"\x48\x8D\x8E" + (0x218).to_bytes(4, "little") + b"\x90"  # lea rcx, [rsi+0x218]
+    code[0x300:0x305] = b"\x48\x8B\x40\x68\x90"                                   # mov rax, [rax+0x68]
+    mem = FakeModule(bytes(code))
+    sigs = {
+        "rip": RIP,
+        "imm32": Signature("48 8D 8E ?? ?? ?? ?? 90", "imm32", at=3),
+        "imm8": Signature("48 8B 40 ?? 90", "imm8", at=3),
+    }
+    values = scan_module(mem, "game.exe", BASE, sigs, chunk_size=CHUNK, workers=1)
+    assert values == {"rip": 0x100 + 7 + 0x1000, "imm32": 0x218, "imm8": 0x68}
+
+
+def test_resolved_offsets_are_cached_per_build(tmp_path):
+    cache = str(tmp_path / "sigs.json")
+    mem = FakeModule(code_with(0x100, rip_insn(0x1000)))
+    specs = {"chapter_rel": {"pattern": RIP.pattern, "kind": "rip", "at": 3, "end": 7}}
+    defaults = {"chapter_rel": 0x9C8B828, "subA_off": 0x218}
+
+    first = resolve_offsets(mem, BASE, defaults, "game.exe", specs, cache)
+    assert first == {"chapter_rel": 0x100 + 7 + 0x1000, "subA_off": 0x218}
+    mem.reads = 0
+    assert resolve_offsets(mem, BASE, defaults, "game.exe", specs, cache) == first
+    assert mem.reads == 1                                # the fingerprint only, no scan
@@ -0,0 +1,87 @@
+# tests/test_split_stats.py
+#
+# The streaming stats behind the per-subsection line: KLL quantiles within
+# their error bound in O(k) space, Welford moments exact, both mergeable,
+# and sessions that combine on disk instead of overwriting each other.
+
+import random
+import statistics
+
+import pytest
+
+from split_stats import KllSketch, SplitStats, Welford
+
+N = 20000
+
+
+def rank_error(sorted_xs: list, q: float, value) -> float:
+    lo = sum(1 for x in sorted_xs if x < value)
+    hi = sum(1 for x in sorted_xs if x <= value)
+    target = q * len(sorted_xs)
+    return 0.0 if lo <= target <= hi else min(abs(lo - target), abs(hi - target)) / len(sorted_xs)
+
+
+def sketch(xs, seed: int = 1) -> KllSketch:
+    sk = KllSketch()
+    sk._rng.seed(seed)
+    for x in xs:
+        sk.add(x)
+    return sk
+
+
+def test_kll_quantiles_within_bound():
+    rng = random.Random(7)
+    xs = [int(rng.lognormvariate(11, 0.3)) for _ in range(N)]  # split-like: ~60 s, long right tail
+    sk = sketch(xs)
+    ordered = sorted(xs)
+    for q, v in zip((0.1, 0.5, 0.9), sk.quantiles((0.1, 0.5, 0.9))):
+        assert rank_error(ordered, q, v) <= 0.03
+    assert sk.n == N
+    assert sum(map(len, sk.levels)) <= 3 * sk.k    # constant memory, not N
+
+
+def test_kll_merge_and_json_round_trip():
+    rng = random.Random(3)
+    xs = [rng.randrange(100000) for _ in range(N)]
+    a, b = sketch(xs[:N // 2], 1), sketch(xs[N // 2:], 2)
+    a.merge(b)
+    assert a.n == N
+    ordered = sorted(xs)
+    assert rank_error(ordered, 0.5, a.quantiles((0.5,))[0]) <= 0.03
+
+    back = KllSketch.from_json(a.to_json())
+    assert back.n == a.n and back.levels == a.levels
+    assert KllSketch().quantiles((0.5,)) == [None]
+
+
+def test_welford_matches_statistics_and_merges():
+    rng = random.Random(5)
+    xs = [rng.gauss(60000, 4000) for _ in range(1000)]
+    whole, left, right = Welford(), Welford(), Welford()
+    for i, x in enumerate(xs):
+        whole.add(x)
+        (left if i < 300 else right).add(x)
+    assert whole.mean == pytest.approx(statistics.fmean(xs))
+    assert whole.stdev == pytest.approx(statistics.stdev(xs))
+
+    left.merge(right)
+    assert left.count == whole.count
+    assert left.mean == pytest.approx(whole.mean)
+    assert left.m2 == pytest.approx(whole.m2)
+    left.merge(Welford())
+    assert left.count == whole.count
+
+
+def test_sessions_combine_on_disk(tmp_path):
+    path = str(tmp_path / "stats.json")
+    one, two = SplitStats(path), SplitStats(path)   # two timers open at once
+    one.add(1, "A", 10000)
+    two.add(1, "A", 20000)
+    two.add(1, "B", 5000)
+    one.close()
+    two.close()
+
+    st = SplitStats(path).stats
+    assert st[(1, "A")].moments.count == 2
+    assert st[(1, "A")].moments.mean == 15000
+    assert list(st[(1, "B")].recent) == [5000]
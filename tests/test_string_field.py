@@ -0,0 +1,39 @@
+# tests/test_string_field.py
+#
+# The game writes a shorter name as the name plus one NUL, over whatever the
+# buffer held before: StringField must read the new name, never the old
+# one's leftover bytes in some other layout.
+
+from benchmarks.fake_memory import FakeProcess
+from evil_within_subsection_logger_v2 import StringField
+
+FIELD = 0x140002000
+TEXT = 0x20000000
+
+
+def c_name(mem: FakeProcess, name: str) -> None:
+    mem.write(TEXT, name.encode() + b"\x00")
+
+
+def test_empty_name_over_a_longer_one_reads_empty():
+    mem = FakeProcess()
+    mem.write(FIELD, TEXT.to_bytes(8, "little"))
+    f = StringField(mem, lambda: FIELD, "subB")
+    c_name(mem, "CH01_Room3")
+    assert f.read() == "CH01_Room3"
+    c_name(mem, "")                      # "\0H01_Room3\0": not UTF-16 "䠀㄰剟潯㍭"
+    assert f.read() == ""
+    assert f.error is None
+    c_name(mem, "CH02_Room1")
+    assert f.read() == "CH02_Room1"
+    assert f.mode == ("ptr", "c")
+
+
+def test_shorter_names_never_show_leftovers():
+    mem = FakeProcess()
+    mem.write(FIELD, TEXT.to_bytes(8, "little"))
+    f = StringField(mem, lambda: FIELD, "subB")
+    for name in ("CH03_Village_Church", "", "CH03_Gate", "", "X", "CH03_Village_Barn", "CH03_Mill"):
+        c_name(mem, name)
+        assert f.read() == name
+
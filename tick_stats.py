@@ -0,0 +1,205 @@
+# tick_stats.py
+#
+# Always-on, low-overhead timing of the tick and render paths, and an
+# on-demand cProfile capture.
+#
+#   Histogram     fixed log-spaced buckets (4 per power of two): O(1) add,
+#                 constant memory, p50 / p99 within one bucket (~19%)
+#   TickStats     one Histogram per stage + overruns of a time budget
+#   TickProfiler  cProfile for N seconds on the thread that calls step(),
+#                 written to a .pstats file (python -m pstats <file>)
+#
+# A capture can be started from the window (F9) or at startup by setting
+# EW_PROFILE=<seconds>.
+
+import json
+import os
+import time
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:  # imported when a capture starts
+    import cProfile
+
+SUB_BUCKETS = 4           # per power of two
+MAX_EXP = 40              # 2**40 ns ~ 18 minutes; slower lands in the last bucket
+N_BUCKETS = (MAX_EXP + 1) * SUB_BUCKETS
+PROFILE_ENV = "EW_PROFILE"
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * N_BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def bucket(ns: int) -> int:
+        e = ns.bit_length() - 1                       # 2**e <= ns < 2**(e+1)
+        if e < 2:
+            return ns if ns > 0 else 0
+        if e < MAX_EXP:
+            return (e << 2) | ((ns >> (e - 2)) & 3)   # the next two bits pick the sub-bucket
+        return N_BUCKETS - 1
+
+    @staticmethod
+    def upper(i: int) -> int:
+        """Exclusive upper bound (ns) of bucket i."""
+        if i < 2 * SUB_BUCKETS:  # 0..3 hold 0..3 ns exactly; 4..7 are never used
+            return i + 1
+        e, sub = divmod(i, SUB_BUCKETS)
+        return (1 << e) + ((sub + 1) << (e - 2))
+
+    def add(self, ns: int) -> None:
+        e = ns.bit_length() - 1  # bucket(), inlined: this runs several times per tick
+        if 2 <= e < MAX_EXP:
+            self.counts[(e << 2) | ((ns >> (e - 2)) & 3)] += 1
+        else:
+            self.counts[self.bucket(ns)] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, q: float) -> int:
+        """Upper bound of the bucket holding the q-quantile (never above max); 0 if empty."""
+        if not self.count:
+            return 0
+        target = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if c and seen >= target:
+                return min(self.upper(i), self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_us": round(self.total / self.count / 1000, 1) if self.count else 0,
+            "p50_us": round(self.percentile(0.5) / 1000, 1),
+            "p99_us": round(self.percentile(0.99) / 1000, 1),
+            "max_us": round(self.max / 1000, 1),
+        }
+
+
+class TickStats:
+    """
+    Stage timings for one thread's loop. Callers time with
+    time.perf_counter_ns() and add(stage, ns); tick_done(ns) records the
+    whole iteration and counts it as an overrun if it took longer than
+    `budget_ms`.
+    """
+    def __init__(self, budget_ms: float) -> None:
+        self.budget_ns = int(budget_ms * 1_000_000)
+        self.stages: dict[str, Histogram] = {}
+        self.total = Histogram()
+        self.overruns = 0
+        self.started = time.time()
+
+    def add(self, stage: str, ns: int) -> None:
+        h = self.stages.get(stage)
+        if h is None:
+            h = self.stages[stage] = Histogram()
+        h.add(ns)
+
+    def tick_done(self, ns: int) -> None:
+        self.total.add(ns)
+        if ns > self.budget_ns:
+            self.overruns += 1
+
+    def reset(self) -> None:
+        self.stages = {}
+        self.total = Histogram()
+        self.overruns = 0
+        self.started = time.time()
+
+    def status_text(self, name: str = "tick") -> str:
+        t = self.total
+        if not t.count:
+            return ""
+        return (f"{name} p50 {t.percentile(0.5) / 1e6:.2f} / p99 {t.percentile(0.99) / 1e6:.2f} / "
+                f"max {t.max / 1e6:.1f} ms, {self.overruns} over")
+
+    def to_json(self) -> dict:
+        return {
+            "since": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "budget_ms": self.budget_ns / 1e6,
+            "overruns": self.overruns,
+            "total": self.total.summary(),
+            "stages": {name: h.summary() for name, h in sorted(self.stages.items())},
+        }
+
+
+def dump_json(path: str, **sections: TickStats) -> None:
+    """Write each named TickStats' summary to one JSON file."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({name: s.to_json() for name, s in sections.items()}, f, indent=1)
+
+
+def profile_seconds_from_env() -> float:
+    try:
+        return max(0.0, float(os.environ.get(PROFILE_ENV, "0") or 0))
+    except ValueError:
+        return 0.0
+
+
+class TickProfiler:
+    """
+    cProfile (before Python 3.12) only sees the thread it is enabled on, so
+    request() (from any thread) just asks; the profiled loop calls step()
+    every iteration, which starts the capture there and, after `seconds`,
+    stops it and writes <directory>/<name>-YYYYmmdd-HHMMSS.pstats. One
+    capture runs at a time.
+    """
+    def __init__(self, name: str, directory: str = ".") -> None:
+        self.name = name
+        self.directory = directory
+        self.requested: Optional[float] = None
+        self.profile: Optional["cProfile.Profile"] = None
+        self.until = 0.0
+        self.last_path: Optional[str] = None
+
+    def request(self, seconds: float) -> None:
+        if seconds > 0:
+            self.requested = seconds
+
+    @property
+    def running(self) -> bool:
+        return self.profile is not None
+
+    def step(self) -> None:
+        if self.profile is None:
+            if self.requested is None:
+                return
+            import cProfile
+
+            seconds, self.requested = self.requested, None
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError as e:  # 3.12+: another profiler is already active
+                print(f"[!] Could not start profiling: {e}")
+                return
+            self.profile = profile
+            self.until = time.monotonic() + seconds
+            print(f"[i] Profiling {self.name} for {seconds:g}s")
+        elif time.monotonic() >= self.until:
+            self.stop()
+
+    def stop(self) -> None:
+        """End a running capture now and write it out (on the profiled thread)."""
+        profile, self.profile = self.profile, None
+        if profile is None:
+            return
+        profile.disable()
+        path = os.path.join(self.directory, time.strftime(f"{self.name}-%Y%m%d-%H%M%S.pstats"))
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            profile.dump_stats(path)
+            self.last_path = path
+            print(f"[+] Profile written to {path}")
+        except OSError as e:
+            print(f"[!] Could not write profile {path}: {e}")
@@ -1,6 +1,8 @@
 # ui_tk.py
 
+import time
 import tkinter as tk
+from typing import Optional
 
 from config import (
     BG_COLOR,
@@ -8,19 +10,74 @@ from config import (
     FONT_TIME,
     FONT_TITLE,
     FONT_MONO,
-    READ_INTERVAL_MS,
+    RENDER_INTERVAL_MS,
+    SHOW_RENDER_STATS,
+    SHOW_TICK_STATS,
+    TICK_STATS_PATH,
+    PROFILE_SECONDS,
 )
 from controller import TimerController
+from sampler import Sampler
+from tick_stats import TickStats, dump_json
+
+
+class LabelRenderer:
+    """
+    The window's change-aware rendering, without Tk: `labels` maps each
+    DisplayInfo text field to the label showing it (anything with
+    config(text=...)), and render() only updates labels whose text changed.
+    It counts those updates (widget updates per minute) and times each
+    render, so it can be measured without a display (benchmarks/tick.py).
+    """
+    def __init__(self, labels: dict, tick_stats: Optional[TickStats] = None) -> None:
+        self.labels = labels
+        self.tick_stats = tick_stats  # the sampler's, for SHOW_TICK_STATS
+        self.shown: dict[str, str] = {}
+        self.widget_updates = 0
+        self.widget_updates_per_min = 0
+        self.stats_window_start = time.monotonic()
+        self.render_stats = TickStats(RENDER_INTERVAL_MS)
+
+    def render(self, info) -> None:
+        t0 = time.perf_counter_ns()
+        for field, label in self.labels.items():
+            text = getattr(info, field)
+            if field == "status_text":
+                if SHOW_RENDER_STATS:
+                    text = f"{text}  [{self.widget_updates_per_min} widget updates/min]".lstrip()
+                if SHOW_TICK_STATS and self.tick_stats is not None:
+                    text = f"{text}  [{self.tick_stats.status_text()}]".lstrip()
+            if self.shown.get(field) != text:
+                label.config(text=text)
+                self.shown[field] = text
+                self.widget_updates += 1
+
+        self.render_stats.tick_done(time.perf_counter_ns() - t0)
+        self._roll_render_stats()
+
+    def _roll_render_stats(self) -> None:
+        now = time.monotonic()
+        if now - self.stats_window_start >= 60.0:
+            self.widget_updates_per_min = round(self.widget_updates * 60.0 / (now - self.stats_window_start))
+            self.widget_updates = 0
+            self.stats_window_start = now
 
 
 class TimerWindow:
-    def __init__(self) -> None:
+    def __init__(self, sampler: Optional[Sampler] = None) -> None:
         # --- Window setup ---
         self.root = tk.Tk()
         self.root.title("In-Game Time (The Evil Within)")
         self.root.configure(bg=BG_COLOR)
 
-        self.controller = TimerController()
+        # Memory sampling runs on its own thread; the UI only renders the newest result.
+        self.sampler = sampler if sampler is not None else Sampler(TimerController())
+        self.last_info = None
+
+        # F8 writes the render timings with the sampler's tick timings,
+        # F9 profiles the sampler ticks for PROFILE_SECONDS.
+        self.root.bind("<F8>", lambda _e: self.dump_tick_stats())
+        self.root.bind("<F9>", lambda _e: self.sampler.controller.profiler.request(PROFILE_SECONDS))
 
         # 2 columns: [label] [value]
         self.root.columnconfigure(0, weight=0)
@@ -28,8 +85,9 @@ class TimerWindow:
 
         self._build_widgets()
 
-        # Start polling
-        self.root.after(READ_INTERVAL_MS, self.poll)
+        # Start sampling + rendering
+        self.sampler.start()
+        self.root.after(RENDER_INTERVAL_MS, self.poll)
 
     def _build_widgets(self) -> None:
         # Row 0: IGT
@@ -43,7 +101,7 @@ class TimerWindow:
 
         self.label_time = tk.Label(
             self.root,
-            text="--:--:--",
+            text="--:--:--.-",
             bg=BG_COLOR,
             fg=FG_COLOR,
             font=FONT_TIME,
@@ -79,43 +137,72 @@ class TimerWindow:
 
         self.label_current_value = tk.Label(
             self.root,
-            text="--:--:--",
+            text="--:--:--.-",
             bg=BG_COLOR,
             fg=FG_COLOR,
             font=FONT_MONO,
         )
         self.label_current_value.grid(row=2, column=1, padx=(0, 10), pady=2, sticky="w")
 
-        # Row 3: Previous segment
+        # Row 3: Current segment vs the best for its subsection
         tk.Label(
             self.root,
-            text="Previous Split:",
+            text="vs Best:",
             bg=BG_COLOR,
             fg=FG_COLOR,
             font=FONT_MONO,
         ).grid(row=3, column=0, padx=(10, 4), pady=2, sticky="w")
 
+        self.label_vs_best = tk.Label(
+            self.root,
+            text="--",
+            bg=BG_COLOR,
+            fg=FG_COLOR,
+            font=FONT_MONO,
+        )
+        self.label_vs_best.grid(row=3, column=1, padx=(0, 10), pady=2, sticky="w")
+
+        # Row 4: Previous segment
+        tk.Label(
+            self.root,
+            text="Previous Split:",
+            bg=BG_COLOR,
+            fg=FG_COLOR,
+            font=FONT_MONO,
+        ).grid(row=4, column=0, padx=(10, 4), pady=2, sticky="w")
+
         self.label_last_value = tk.Label(
             self.root,
-            text="--:--:--",
+            text="--:--:--.-",
             bg=BG_COLOR,
             fg=FG_COLOR,
             font=FONT_MONO,
         )
-        self.label_last_value.grid(row=3, column=1, padx=(0, 10), pady=2, sticky="w")
+        self.label_last_value.grid(row=4, column=1, padx=(0, 10), pady=2, sticky="w")
 
-        # Row 4: Since first
+        # Row 5: Since first
         self.label_run_since_first = tk.Label(
             self.root,
-            text="Since first segment: --:--:--",
+            text="Since first segment: --:--:--.-",
             bg=BG_COLOR,
             fg=FG_COLOR,
             font=FONT_MONO,
         )
-        self.label_run_since_first.grid(row=4, column=0, columnspan=2,
+        self.label_run_since_first.grid(row=5, column=0, columnspan=2,
                                         padx=10, pady=(4, 10), sticky="w")
 
-        # Row 5: status
+        # Row 6: stats for the current subsection
+        self.label_stats = tk.Label(
+            self.root,
+            text="",
+            bg=BG_COLOR,
+            fg=FG_COLOR,
+            font=FONT_MONO,
+        )
+        self.label_stats.grid(row=6, column=0, columnspan=2,
+                              padx=10, pady=(0, 4), sticky="w")
+
+        # Row 7: status
         self.label_status = tk.Label(
             self.root,
             text="",
@@ -123,33 +210,37 @@ class TimerWindow:
             fg=FG_COLOR,
             font=FONT_MONO,
         )
-        self.label_status.grid(row=5, column=0, columnspan=2,
+        self.label_status.grid(row=7, column=0, columnspan=2,
                                padx=10, pady=(0, 10), sticky="w")
 
+        # DisplayInfo text field -> the label that shows it
+        self.renderer = LabelRenderer({
+            "time_text": self.label_time,
+            "chapter_text": self.label_chapter,
+            "current_segment_text": self.label_current_value,
+            "vs_best_text": self.label_vs_best,
+            "last_segment_text": self.label_last_value,
+            "since_first_text": self.label_run_since_first,
+            "stats_text": self.label_stats,
+            "status_text": self.label_status,
+        }, self.sampler.controller.tick_stats)
+
     def poll(self) -> None:
-        info = self.controller.tick()
-
-        self.label_time.config(text=info.time_text)
-        self.label_chapter.config(text=info.chapter_text)
-        self.label_run_since_first.config(text=info.since_first_text)
-        self.label_status.config(text=info.status_text)
-
-        # Split the "Current:" / "Previous:" lines into label + value
-        current_text = info.current_segment_text
-        if current_text.startswith("Current:"):
-            current_value = current_text[len("Current:"):].lstrip()
-        else:
-            current_value = current_text
-        self.label_current_value.config(text=current_value)
-
-        last_text = info.last_segment_text
-        if last_text.startswith("Previous:"):
-            last_value = last_text[len("Previous:"):].lstrip()
-        else:
-            last_value = last_text
-        self.label_last_value.config(text=last_value)
-
-        self.root.after(READ_INTERVAL_MS, self.poll)
+        info = self.sampler.latest
+        if info is not None and info is not self.last_info:  # else nothing new since the last render
+            self.last_info = info
+            self.renderer.render(info)
+        self.root.after(RENDER_INTERVAL_MS, self.poll)
+
+    def dump_tick_stats(self, path: str = TICK_STATS_PATH) -> None:
+        try:
+            dump_json(path, tick=self.sampler.controller.tick_stats, render=self.renderer.render_stats)
+            print(f"[+] Tick stats written to {path}")
+        except OSError as e:
+            print(f"[!] Could not write tick stats {path}: {e}")
 
     def run(self) -> None:
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.sampler.stop()